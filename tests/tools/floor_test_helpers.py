@@ -0,0 +1,40 @@
+"""Helpers shared by the floor tool tests."""
+
+import io
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools import floor1_maze_generator
+from tools.floor_reachability import walkable_mask_from_walls
+
+FLOOR1_GENERATOR_OUTPUTS = ("Floor1F.json", "Floor2F.json", "Floor3F.json")
+
+
+def mask_of(builder):
+    return walkable_mask_from_walls(builder.walls, builder.width, builder.height)
+
+
+def run_floor1_generator(tmp, *flags, defs_dir=None):
+    """Run the Floor 1-3 generator into ``tmp`` without the cache and return its stdout.
+
+    The FloorDefinition .tres files in ``defs_dir`` are updated too; without one they are left alone.
+    """
+    argv = ["floor1_maze_generator.py", "--no-cache"]
+    if defs_dir is None:
+        argv.append("--skip-floor-defs")
+    for number, name in enumerate(FLOOR1_GENERATOR_OUTPUTS, start=1):
+        argv += [f"--floor{number}-output", str(Path(tmp) / name)]
+        if defs_dir is not None:
+            argv += [f"--floor{number}-def", str(Path(defs_dir) / name.replace(".json", ".tres"))]
+    stdout = io.StringIO()
+    with patch.object(sys, "argv", argv + list(flags)), redirect_stdout(stdout):
+        status = floor1_maze_generator.main()
+    if status != 0:
+        raise AssertionError(f"floor1_maze_generator exited with {status}:\n{stdout.getvalue()}")
+    return stdout.getvalue()
@@ -1,9 +1,10 @@
 import json
 import io
+import shutil
 import tempfile
 import unittest
 from collections import deque
-from contextlib import redirect_stdout
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 import sys
 from unittest.mock import patch
@@ -47,12 +48,21 @@ from tools.floor1_maze_generator import (
     FLOOR3_WIDTH,
     GRID_HEIGHT,
     GRID_WIDTH,
+    FLOOR1_SUPPLEMENTAL_ENEMY_PREFIX,
+    FloorBuildError,
+    FLOOR1_SUPPLEMENTAL_ENEMY_TYPES,
+    ManhattanBuckets,
     build_floor1_model,
+    build_floor1_walls,
     build_floor2_model,
     build_floor3_model,
+    build_floor_models,
+    build_supplemental_enemy_patrols,
     main,
     update_floor_definition,
+    update_floor_definitions,
     validate_model,
+    walkable_from_walls,
 )
 
 ENEMY_DENSITY_MULTIPLIER = 3
@@ -320,6 +330,115 @@ def floor_definition_source():
     )
 
 
+def reference_supplemental_positions(base_enemies, walkable, occupied, multiplier):
+    target_count = len(base_enemies) * (multiplier - 1)
+    occupied = set(occupied)
+    selected = []
+    candidates = [
+        position
+        for position in sorted(walkable, key=lambda pos: ((pos[0] * 73 + pos[1] * 37) % 997, pos[1], pos[0]))
+        if position not in occupied and neighbor_count(walkable, position) >= 2
+    ]
+    for min_distance in (4, 3, 2, 1):
+        for position in candidates:
+            if len(selected) == target_count:
+                break
+            if position in occupied:
+                continue
+            if any(abs(position[0] - x) + abs(position[1] - y) < min_distance for x, y in selected):
+                continue
+            occupied.add(position)
+            selected.append(position)
+    return selected
+
+
+class SupplementalEnemyPatrolTest(unittest.TestCase):
+    def test_manhattan_buckets_match_a_linear_scan(self):
+        buckets = ManhattanBuckets(4)
+        stored = [(3, 3), (7, 0), (12, 9), (0, 15)]
+        for position in stored:
+            buckets.add(position)
+
+        for x in range(-2, 18):
+            for y in range(-2, 18):
+                for min_distance in (1, 2, 3, 4):
+                    expected = any(abs(x - sx) + abs(y - sy) < min_distance for sx, sy in stored)
+                    self.assertEqual(buckets.any_within((x, y), min_distance), expected)
+
+    def test_placements_match_the_quadratic_scan_at_higher_density(self):
+        walkable = walkable_from_walls(build_floor1_walls(), FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        base_enemies = FLOOR1_ENEMY_GATES | FLOOR1_EXTRA_ENEMY_PATROLS
+        occupied = {FLOOR1_PLAYER_START, FLOOR1_UP_STAIR_A, FLOOR1_UP_STAIR_B}
+        occupied |= {data["position"] for data in base_enemies.values()}
+
+        for multiplier in (3, 6):
+            with self.subTest(multiplier=multiplier), patch(
+                "tools.floor1_maze_generator.ENEMY_DENSITY_MULTIPLIER", multiplier
+            ):
+                supplemental = build_supplemental_enemy_patrols(
+                    FLOOR1_SUPPLEMENTAL_ENEMY_PREFIX,
+                    base_enemies,
+                    walkable,
+                    occupied,
+                    FLOOR1_SUPPLEMENTAL_ENEMY_TYPES,
+                )
+                self.assertEqual(
+                    [data["position"] for data in supplemental.values()],
+                    reference_supplemental_positions(base_enemies, walkable, occupied, multiplier),
+                )
+
+
+def fail_floor_build():
+    raise ValueError("Disconnected walkable cells: [(2, 2)]")
+
+
+class FloorModelBuildTest(unittest.TestCase):
+    def test_parallel_build_matches_serial_build(self):
+        serial = build_floor_models(jobs=1)
+        parallel = build_floor_models(jobs=3)
+
+        self.assertEqual([json.dumps(model) for model in parallel], [json.dumps(model) for model in serial])
+        self.assertEqual([model["floor_metadata"]["floor_number"] for model in parallel], [1, 2, 3])
+
+    def test_reports_first_failing_floor_in_floor_order(self):
+        builders = (
+            ("Floor 1", build_floor3_model),
+            ("Floor 2", fail_floor_build),
+            ("Floor 3", fail_floor_build),
+        )
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                with self.assertRaisesRegex(FloorBuildError, r"^Floor 2 validation failed: Disconnected"):
+                    build_floor_models(jobs=jobs, builders=builders)
+
+    def test_main_reports_bad_arguments_on_stderr(self):
+        for flags, message in (
+            (["--chunk-size", "-1"], "Error: --chunk-size must be non-negative, got -1"),
+            (["--path-cluster-size", "1"], "Error: --path-cluster-size must be at least 2, got 1"),
+            (["--visibility-radius", "0"], "Error: --visibility-radius must be 1-"),
+        ):
+            with self.subTest(flags=flags):
+                stdout, stderr = io.StringIO(), io.StringIO()
+                argv = ["floor1_maze_generator.py", "--skip-floor-defs", "--no-cache", *flags]
+                with patch.object(sys, "argv", argv), redirect_stdout(stdout), redirect_stderr(stderr):
+                    self.assertEqual(main(), 1)
+
+                self.assertEqual(stdout.getvalue(), "")
+                self.assertIn(message, stderr.getvalue())
+
+    def test_main_reports_validation_failure(self):
+        argv = ["floor1_maze_generator.py", "--skip-floor-defs", "--no-cache", "--jobs", "2"]
+        stdout = io.StringIO()
+        with patch.object(sys, "argv", argv), patch(
+            "tools.floor1_maze_generator.build_floor_models",
+            side_effect=FloorBuildError("Floor 2", ValueError("No path from (10, 10) to (52, 50)")),
+        ), redirect_stdout(stdout):
+            result = main()
+
+        self.assertEqual(result, 1)
+        self.assertIn("Error: Floor 2 validation failed: No path", stdout.getvalue())
+
+
 class Floor1MazeGeneratorTest(unittest.TestCase):
     def setUp(self):
         self.model = build_floor1_model()
@@ -699,6 +818,49 @@ class Floor1MazeGeneratorTest(unittest.TestCase):
         ):
             validate_model(model, 3, 1)
 
+    def test_validate_model_rejects_switches_locked_behind_gates(self):
+        def corridor_model(gates, switches):
+            # A one-cell-high corridor from the start at x=0 to a treasure box at x=7.
+            return {
+                "floor_metadata": {"floor_index": 1, "player_start": {"x": 0, "y": 0}},
+                "tile_layers": {"ground": [], "wall": [], "stair": []},
+                "entities": {
+                    "treasure_boxes": [{"id": "Box_Test", "position": {"x": 7, "y": 0}, "gold": 1, "items": []}],
+                    "puzzle_gates": [
+                        {"id": gate_id, "puzzle_id": puzzle_id, "position": {"x": x, "y": 0}, "starts_closed": True}
+                        for gate_id, puzzle_id, x in gates
+                    ],
+                    "puzzle_switches": [
+                        {"id": switch_id, "puzzle_id": puzzle_id, "position": {"x": x, "y": 0}}
+                        for switch_id, puzzle_id, x in switches
+                    ],
+                },
+            }
+
+        # Each gate's switch sits in front of it, so the player opens them one after the other.
+        validate_model(
+            corridor_model(
+                [("Gate_A", "Puzzle_A", 2), ("Gate_B", "Puzzle_B", 4)],
+                [("Switch_A", "Puzzle_A", 1), ("Switch_B", "Puzzle_B", 3)],
+            ),
+            8,
+            1,
+        )
+
+        for name, gates, switches in (
+            ("switch behind its own gate", [("Gate_A", "Puzzle_A", 3)], [("Switch_A", "Puzzle_A", 5)]),
+            (
+                "gates guarding each other's switches",
+                [("Gate_A", "Puzzle_A", 2), ("Gate_B", "Puzzle_B", 4)],
+                [("Switch_A", "Puzzle_A", 5), ("Switch_B", "Puzzle_B", 3)],
+            ),
+        ):
+            with self.subTest(name), self.assertRaisesRegex(
+                ValueError,
+                r"Soft lock: treasure_boxes Box_Test, puzzle_switches Switch_A, .* \(unlock order: \[\]\)",
+            ):
+                validate_model(corridor_model(gates, switches), 8, 1)
+
     def test_update_floor_definition_updates_floor1_arrays(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             floor_def = Path(tmpdir) / "Floor1F.tres"
@@ -707,11 +869,12 @@ class Floor1MazeGeneratorTest(unittest.TestCase):
             update_floor_definition(floor_def, self.model)
 
             updated = floor_def.read_text(encoding="utf-8")
-            self.assertIn("PlayerStartPosition = Vector2i(8, 30)", updated)
+            # The fixture's walkable start is kept; new landings sit next to the stairs, never on them.
+            self.assertIn("PlayerStartPosition = Vector2i(17, 13)", updated)
             self.assertIn("StairsUp = Array[Vector2i]([Vector2i(49, 12), Vector2i(48, 48)])", updated)
             self.assertIn("StairsDown = Array[Vector2i]([Vector2i(8, 30)])", updated)
-            self.assertIn("StairsUpDestinations = Array[Vector2i]([Vector2i(49, 12), Vector2i(48, 48)])", updated)
-            self.assertIn("StairsDownDestinations = Array[Vector2i]([Vector2i(8, 30)])", updated)
+            self.assertIn("StairsUpDestinations = Array[Vector2i]([Vector2i(50, 12), Vector2i(49, 48)])", updated)
+            self.assertIn("StairsDownDestinations = Array[Vector2i]([Vector2i(9, 30)])", updated)
 
     def test_main_skips_missing_floor2_definition_and_updates_floor1(self):
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -738,6 +901,8 @@ class Floor1MazeGeneratorTest(unittest.TestCase):
                 str(floor3_output),
                 "--floor3-def",
                 str(missing_floor3_def),
+                "--cache-file",
+                str(tmp / "floor_gen_cache.json"),
             ]
 
             stdout = io.StringIO()
@@ -751,7 +916,7 @@ class Floor1MazeGeneratorTest(unittest.TestCase):
             self.assertIn("Warning: floor definition not found", stdout.getvalue())
 
             updated = floor1_def.read_text(encoding="utf-8")
-            self.assertIn("PlayerStartPosition = Vector2i(8, 30)", updated)
+            self.assertIn("PlayerStartPosition = Vector2i(17, 13)", updated)
             self.assertIn("StairsUp = Array[Vector2i]([Vector2i(49, 12), Vector2i(48, 48)])", updated)
 
     def test_main_fails_when_floor1_definition_is_missing(self):
@@ -780,6 +945,8 @@ class Floor1MazeGeneratorTest(unittest.TestCase):
                 str(floor3_output),
                 "--floor3-def",
                 str(floor3_def),
+                "--cache-file",
+                str(tmp / "floor_gen_cache.json"),
             ]
 
             stdout = io.StringIO()
@@ -1057,9 +1224,10 @@ class Floor2MazeGeneratorTest(unittest.TestCase):
             update_floor_definition(floor_def, self.model)
 
             updated = floor_def.read_text(encoding="utf-8")
-            self.assertIn("PlayerStartPosition = Vector2i(10, 10)", updated)
+            self.assertIn("PlayerStartPosition = Vector2i(17, 13)", updated)
             self.assertIn("StairsUp = Array[Vector2i]([Vector2i(52, 50)])", updated)
             self.assertIn("StairsDown = Array[Vector2i]([Vector2i(10, 10), Vector2i(26, 10)])", updated)
+            self.assertIn("StairsDownDestinations = Array[Vector2i]([Vector2i(11, 10), Vector2i(27, 10)])", updated)
 
 
 class Floor3PlaceholderGeneratorTest(unittest.TestCase):
@@ -1107,6 +1275,32 @@ class Floor3PlaceholderGeneratorTest(unittest.TestCase):
 
         self.assertTrue(has_path(self.walkable, FLOOR3_PLAYER_START, FLOOR3_DOWN_STAIR))
 
+    def test_update_keeps_hand_tuned_spawn_cells_off_the_stair(self):
+        fixture = ROOT / "resources/floors/Floor3F.tres"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            floor_def = Path(shutil.copy(fixture, tmpdir))
+            self.assertEqual(update_floor_definitions({floor_def: self.model}), [])
+            self.assertEqual(floor_def.read_bytes(), fixture.read_bytes())
+
+            # Other walkable cells are kept as they are; a start or landing on the stair moves off it.
+            source = fixture.read_text(encoding="utf-8")
+            for start, destination, expected_start, expected_destination in (
+                ("Vector2i(14, 12)", "Vector2i(10, 11)", "Vector2i(14, 12)", "Vector2i(10, 11)"),
+                ("Vector2i(10, 10)", "Vector2i(10, 10)", "Vector2i(11, 10)", "Vector2i(11, 10)"),
+            ):
+                with self.subTest(start=start, destination=destination):
+                    floor_def.write_text(
+                        source.replace("PlayerStartPosition = Vector2i(11, 10)", f"PlayerStartPosition = {start}")
+                        .replace("([Vector2i(11, 10)])", f"([{destination}])"),
+                        encoding="utf-8",
+                    )
+                    update_floor_definition(floor_def, self.model)
+
+                    updated = floor_def.read_text(encoding="utf-8")
+                    self.assertIn(f"PlayerStartPosition = {expected_start}", updated)
+                    self.assertIn(f"StairsDownDestinations = Array[Vector2i]([{expected_destination}])", updated)
+                    self.assertNotIn("StairsUp", updated)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor_benchmarks import (
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_SIZES,
+    compare_to_baseline,
+    host_identity,
+    main,
+    procedural_cases,
+    real_floor_cases,
+    run_benchmarks,
+    synthetic_cases,
+)
+
+
+class BenchmarkReportTest(unittest.TestCase):
+    def test_run_records_timings_and_peak_memory(self):
+        report = run_benchmarks((64,), repeat=2, name_filter="synthetic-64/")
+
+        self.assertEqual(
+            sorted(report["results"]),
+            [
+                "synthetic-64/MazeBuilder.build",
+                "synthetic-64/build_supplemental_enemy_patrols",
+                "synthetic-64/dead_end_branches",
+                "synthetic-64/validate_model",
+                "synthetic-64/write_json",
+            ],
+        )
+        for result in report["results"].values():
+            self.assertEqual(result["runs"], 2)
+            self.assertLessEqual(result["min_seconds"], result["median_seconds"])
+            self.assertGreaterEqual(result["peak_bytes"], 0)
+
+    def test_compare_flags_growth_beyond_tolerance_only(self):
+        baseline = {"results": {"a": {"min_seconds": 1.0, "peak_bytes": 100}, "b": {"min_seconds": 1.0}}}
+        report = {
+            "results": {
+                "a": {"min_seconds": 1.2, "peak_bytes": 200},
+                "b": {"min_seconds": 0.5},
+                "new": {"min_seconds": 9.0},
+            }
+        }
+
+        self.assertEqual(compare_to_baseline(report, baseline, 0.25), ["a: peak_bytes 100 -> 200 (+100%)"])
+
+    def test_main_saves_a_baseline_then_reports_regressions(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            baseline = Path(tmpdir) / "baseline.json"
+            output = Path(tmpdir) / "results.json"
+            argv = ["--sizes", "--filter", "floor1/compile_layout", "--repeat", "1", "--baseline", str(baseline)]
+
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(argv + ["--save-baseline"]), 0)
+            saved = json.loads(baseline.read_text(encoding="utf-8"))
+            saved["results"]["floor1/compile_layout"]["min_seconds"] = 1e-9
+            baseline.write_text(json.dumps(saved), encoding="utf-8")
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                result = main(argv + ["--output", str(output), "--no-memory"])
+
+            self.assertEqual(result, 1)
+            self.assertIn("floor1/compile_layout: min_seconds", stdout.getvalue())
+            self.assertEqual(list(json.loads(output.read_text(encoding="utf-8"))["results"]), ["floor1/compile_layout"])
+
+    def test_regressions_against_another_machine_warn_without_failing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            baseline = Path(tmpdir) / "baseline.json"
+            argv = ["--sizes", "--filter", "floor1/compile_layout", "--repeat", "1", "--baseline", str(baseline)]
+
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(main(argv + ["--save-baseline"]), 0)
+            saved = json.loads(baseline.read_text(encoding="utf-8"))
+            saved["results"]["floor1/compile_layout"]["min_seconds"] = 1e-9
+            saved["host"] = "some-other-host"
+            baseline.write_text(json.dumps(saved), encoding="utf-8")
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                result = main(argv + ["--no-memory"])
+
+            self.assertEqual(result, 0)
+            self.assertIn("Warning: baseline was recorded on some-other-host (", stdout.getvalue())
+            self.assertIn("floor1/compile_layout: min_seconds", stdout.getvalue())
+
+    def test_missing_baseline_is_written_and_reported(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            baseline = Path(tmpdir) / "baseline.json"
+            argv = ["--sizes", "--filter", "floor1/compile_layout", "--repeat", "1", "--baseline", str(baseline)]
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertEqual(main(argv), 0)
+
+            self.assertIn(f"No baseline at {baseline}; wrote one from this run", stdout.getvalue())
+            written = json.loads(baseline.read_text(encoding="utf-8"))
+            self.assertEqual(list(written["results"]), ["floor1/compile_layout"])
+
+    def test_committed_baseline_covers_every_default_case(self):
+        baseline = json.loads(DEFAULT_BASELINE_PATH.read_text(encoding="utf-8"))
+        cases = real_floor_cases() + procedural_cases()
+        for size in DEFAULT_SIZES:
+            cases.extend(synthetic_cases(size))
+
+        self.assertEqual(sorted(baseline["results"]), sorted(case.name for case in cases))
+        self.assertEqual(list(host_identity()), ["host", "cpu", "machine"])
+        for key in host_identity():
+            self.assertTrue(baseline[key], key)
+
+
+if __name__ == "__main__":
+    unittest.main()
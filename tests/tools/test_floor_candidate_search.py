@@ -0,0 +1,110 @@
+import argparse
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import build_floor2_model, build_spec_model
+from tools.floor_candidate_search import (
+    METRICS,
+    CandidateSearch,
+    build_candidate,
+    candidate_metrics,
+    evaluate_candidate,
+    evaluate_candidates,
+    main,
+    parse_weight,
+    score,
+    search_candidates,
+)
+from tools.floor_spec import load_floor_spec
+
+SEARCH = CandidateSearch("floor2", seed=3)
+
+
+class CandidateTest(unittest.TestCase):
+    def test_candidate_zero_is_the_authored_floor(self):
+        spec, _ = build_candidate(SEARCH, 0)
+        result = evaluate_candidate(SEARCH, 0)
+
+        self.assertEqual(spec.data, load_floor_spec("floor2").data)
+        self.assertEqual(result.metrics, candidate_metrics(build_floor2_model(), spec.width, spec.height))
+        self.assertEqual(set(result.metrics), set(METRICS))
+
+    def test_candidates_are_a_function_of_seed_and_index(self):
+        first, _ = build_candidate(SEARCH, 5)
+        again, _ = build_candidate(SEARCH, 5)
+        other, _ = build_candidate(CandidateSearch("floor2", seed=4), 5)
+
+        self.assertEqual(first.data, again.data)
+        self.assertNotEqual(first.data, other.data)
+        self.assertNotEqual(first.data, load_floor_spec("floor2").data)
+
+    def test_pool_streams_the_same_results_as_a_serial_run(self):
+        serial = list(evaluate_candidates(SEARCH, 20))
+        pooled = list(evaluate_candidates(SEARCH, 20, jobs=2))
+
+        self.assertEqual([result.index for result in serial], list(range(1, 21)))
+        self.assertEqual(serial, pooled)
+        self.assertTrue(any(result.metrics is not None for result in serial))
+        self.assertTrue(all(result.pruned is None or result.error for result in serial))
+
+
+class SearchTest(unittest.TestCase):
+    def test_search_ranks_valid_candidates_best_first(self):
+        report = search_candidates(SEARCH, 40, top=3)
+
+        self.assertEqual(report.searched, 40)
+        self.assertEqual(score(report.baseline, report.baseline, {metric: 1.0 for metric in METRICS}), 3.0)
+        self.assertEqual(len(report.ranked), 3)
+        scores = [value for value, _ in report.ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        best = max(
+            (score(result.metrics, report.baseline, {metric: 1.0 for metric in METRICS}), result.index)
+            for result in evaluate_candidates(SEARCH, 40)
+            if result.metrics is not None
+        )
+        self.assertEqual((scores[0], report.ranked[0][1].index), best)
+
+    def test_negative_weights_prefer_smaller_metrics(self):
+        report = search_candidates(SEARCH, 40, top=1, weights={"branch_count": -1.0})
+
+        _, result = report.ranked[0]
+        self.assertLessEqual(result.metrics["branch_count"], report.baseline["branch_count"])
+
+    def test_written_candidates_rebuild_and_validate(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            argv = ["--spec", "floor2", "--seed", "3", "--count", "30", "--top", "2", "--output-dir", tmpdir]
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertEqual(main(argv), 0)
+
+            output = stdout.getvalue()
+            self.assertIn("Searched 30 candidates", output)
+            paths = sorted(Path(tmpdir).iterdir())
+            self.assertEqual(len(paths), 2)
+            for path in paths:
+                spec = load_floor_spec(path)
+                index = int(path.stem.rpartition("candidate")[2])
+                model = build_spec_model(spec)
+                self.assertEqual(
+                    candidate_metrics(model, spec.width, spec.height), evaluate_candidate(SEARCH, index).metrics
+                )
+                self.assertIn(f"candidate {index:>5}", output)
+
+    def test_parse_weight(self):
+        self.assertEqual(parse_weight("enemy_spacing=2.5"), ("enemy_spacing", 2.5))
+        with self.assertRaisesRegex(argparse.ArgumentTypeError, "METRIC=WEIGHT"):
+            parse_weight("loops=1")
+        with self.assertRaisesRegex(argparse.ArgumentTypeError, "must be a number"):
+            parse_weight("branch_count=many")
+
+
+if __name__ == "__main__":
+    unittest.main()
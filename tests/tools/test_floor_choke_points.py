@@ -0,0 +1,85 @@
+import random
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from floor_test_helpers import mask_of
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_model
+from tools.floor_choke_points import ChokeAnalysis, analyze_model
+from tools.floor_json import layer_cells
+from tools.floor_reachability import ReachabilityIndex, walkable_mask_from_walls
+from tools.gate_reachability import ENEMY_GATE, Gate
+from tools.maze_grid import MazeBuilder
+
+
+class ChokeAnalysisTest(unittest.TestCase):
+    def test_corridor_between_rooms_is_a_chain_of_chokes_and_bridges(self):
+        builder = MazeBuilder(14, 5)
+        builder.carve_rect(1, 1, 4, 3)
+        builder.carve_rect(9, 1, 12, 3)
+        builder.carve_rect(5, 2, 8, 2)
+        analysis = ChokeAnalysis(mask_of(builder), 14, 5, (1, 1))
+
+        # The corridor and the room cell at each end of it are chokes; the rest of each room is not.
+        self.assertEqual(analysis.choke_cells, [(x, 2) for x in range(4, 10)])
+        self.assertEqual(len(analysis.bridges), 5)
+        self.assertEqual(analysis.bridges[0], ((4, 2), (5, 2)))
+        self.assertEqual(analysis.separated_count((6, 2)), 14)
+        self.assertEqual(analysis.separated_count((2, 2)), 0)
+        self.assertTrue(analysis.cuts_off((5, 2), (12, 3)))
+        self.assertFalse(analysis.cuts_off((5, 2), (1, 3)))
+        self.assertEqual(
+            analysis.separated_cells((9, 2)),
+            [(x, y) for y in (1, 2, 3) for x in (9, 10, 11, 12) if (x, y) != (9, 2)],
+        )
+
+        gates = [Gate("Inside", ENEMY_GATE, (2, 2)), Gate("Corridor", ENEMY_GATE, (7, 2))]
+        self.assertEqual([gate.id for gate in analysis.bypassed_gates(gates)], ["Inside"])
+
+    def test_matches_blocking_each_cell_and_rerunning_bfs(self):
+        model = build_floor1_model()
+        mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        start = (model["floor_metadata"]["player_start"]["x"], model["floor_metadata"]["player_start"]["y"])
+        analysis = ChokeAnalysis(mask, FLOOR1_WIDTH, FLOOR1_HEIGHT, start)
+        cells = [
+            (index % FLOOR1_WIDTH, index // FLOOR1_WIDTH)
+            for index, flag in enumerate(mask)
+            if flag and (index % FLOOR1_WIDTH, index // FLOOR1_WIDTH) != start
+        ]
+
+        sample = random.Random(3).sample(cells, 60) + analysis.choke_cells[:20]
+        for cell in sample:
+            blocked = bytearray(mask)
+            blocked[cell[1] * FLOOR1_WIDTH + cell[0]] = 0
+            reachability = ReachabilityIndex(blocked, FLOOR1_WIDTH, FLOOR1_HEIGHT, start)
+            lost = [other for other in cells if other != cell and not reachability.is_reachable(other)]
+            with self.subTest(cell=cell):
+                self.assertEqual(analysis.separated_count(cell), len(lost))
+                self.assertEqual(analysis.is_choke(cell), bool(lost))
+
+    def test_report_names_the_gate_on_each_choke(self):
+        _, points = analyze_model(build_floor1_model(), FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        by_gate = {point.gate_id: point for point in points if point.gate_id}
+
+        stair_guard = by_gate["EnemySpawn_Skeleton_StairA"]
+        self.assertEqual(stair_guard.gate_kind, ENEMY_GATE)
+        self.assertIn("1F_2F_A", stair_guard.cuts_off)
+        self.assertEqual(by_gate["PuzzleGate_1F_SouthTrial_Shortcut"].gate_kind, "puzzle_gate")
+        self.assertTrue(all(point.separated > 0 for point in points))
+
+    def test_start_off_the_floor_finds_nothing(self):
+        builder = MazeBuilder(6, 3)
+        builder.carve_rect(1, 1, 4, 1)
+        analysis = ChokeAnalysis(mask_of(builder), 6, 3, (0, 0))
+
+        self.assertEqual(analysis.choke_cells, [])
+        self.assertFalse(analysis.cuts_off((2, 1), (4, 1)))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_model
+from tools.floor_chunks import chunks_near, load_chunk_index, split_floor, write_floor_chunks
+from tools.floor_json import SCHEMA_V2, load_floor_json
+
+
+def tile_key(tile):
+    return tile["y"], tile["x"], tile["tile"]
+
+
+class SplitFloorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = build_floor1_model()
+
+    def test_chunks_partition_tiles_and_entities(self):
+        chunks = split_floor(self.model, 32, FLOOR1_WIDTH, FLOOR1_HEIGHT)
+
+        self.assertEqual(list(chunks), [(0, 0), (1, 0), (0, 1), (1, 1)])
+        for name, tiles in self.model["tile_layers"].items():
+            merged = [tile for chunk in chunks.values() for tile in chunk["tile_layers"][name]]
+            self.assertEqual(sorted(merged, key=tile_key), sorted(tiles, key=tile_key))
+        for kind, entities in self.model["entities"].items():
+            merged = [entity["id"] for chunk in chunks.values() for entity in chunk["entities"][kind]]
+            self.assertEqual(sorted(merged), sorted(entity["id"] for entity in entities))
+        for (cx, cy), chunk in chunks.items():
+            for tile in chunk["tile_layers"]["wall"]:
+                self.assertEqual((tile["x"] // 32, tile["y"] // 32), (cx, cy))
+
+    def test_rejects_bad_sizes_and_positions(self):
+        with self.assertRaisesRegex(ValueError, "Chunk size must be positive"):
+            split_floor(self.model, 0, FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        with self.assertRaisesRegex(ValueError, "outside the 40x40 floor"):
+            split_floor(self.model, 16, 40, 40)
+
+
+class WriteFloorChunksTest(unittest.TestCase):
+    def test_index_describes_every_chunk_file(self):
+        model = build_floor1_model()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "Floor1F.json"
+            index_path = write_floor_chunks(model, output, 16, SCHEMA_V2)
+            index = load_chunk_index(index_path)
+
+            self.assertEqual((index["chunk_size"], index["width"], index["height"]), (16, 60, 60))
+            self.assertEqual(len(index["chunks"]), 16)
+            self.assertEqual(index["floor_metadata"], model["floor_metadata"])
+            total_walls = 0
+            for entry in index["chunks"]:
+                path = index_path.parent / entry["file"]
+                self.assertEqual(hashlib.sha256(path.read_bytes()).hexdigest(), entry["sha256"])
+                self.assertEqual(json.loads(path.read_text(encoding="utf-8"))["schema_version"], SCHEMA_V2)
+                chunk = load_floor_json(path)
+                self.assertEqual(entry["tiles"]["wall"], len(chunk["tile_layers"]["wall"]))
+                self.assertEqual(
+                    entry["entities"],
+                    {kind: len(entities) for kind, entities in chunk["entities"].items() if entities},
+                )
+                total_walls += entry["tiles"]["wall"]
+            self.assertEqual(total_walls, len(model["tile_layers"]["wall"]))
+
+            self.assertEqual([(entry["x"], entry["y"]) for entry in chunks_near(index, (20, 40), 4)], [(1, 2)])
+            self.assertEqual(len(chunks_near(index, (32, 32), 1)), 4)
+
+            write_floor_chunks(model, output, 32)
+            self.assertEqual(
+                sorted(path.name for path in index_path.parent.iterdir()),
+                ["chunk_0_0.json", "chunk_0_1.json", "chunk_1_0.json", "chunk_1_1.json", "index.json"],
+            )
+
+
+
+if __name__ == "__main__":
+    unittest.main()
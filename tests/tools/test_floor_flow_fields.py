@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from array import array
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_model
+from tools.floor_flow_fields import (
+    FlowField,
+    bfs_flow,
+    build_flow_fields,
+    decode_flow_fields,
+    encode_flow_fields,
+    flow_field_path,
+    pack_directions,
+    read_flow_fields,
+    unpack_direction,
+    write_flow_fields,
+)
+from tools.floor_reachability import ReachabilityIndex, walkable_mask_from_tiles
+
+
+class FlowFieldEncodingTest(unittest.TestCase):
+    def test_directions_pack_four_cells_per_byte(self):
+        codes = bytes([0, 1, 2, 3, 3, 2])
+        packed = pack_directions(codes)
+
+        self.assertEqual(len(packed), 2)
+        self.assertEqual([unpack_direction(packed, index) for index in range(len(codes))], list(codes))
+
+    def test_corridor_steps_point_back_to_the_source(self):
+        # 5x3 grid with a walkable middle row and one cell open above it.
+        mask = bytearray(15)
+        mask[5:10] = b"\x01" * 5
+        mask[3] = 1
+        distances, directions = bfs_flow(mask, 5, 5)
+
+        self.assertEqual(list(distances[5:10]), [0, 1, 2, 3, 4])
+        self.assertEqual(distances[3], 4)
+        self.assertEqual(distances[0], -1)
+        self.assertEqual(directions[3], 2)  # South, back into the corridor.
+        self.assertEqual(directions[9], 1)  # West, towards the source.
+
+    def test_wide_distances_fall_back_to_u32(self):
+        field = FlowField("far", (0, 0), array("i", [0, 70000, -1, 3]), pack_directions(bytes(4)), 2, -1)
+
+        decoded = decode_flow_fields(encode_flow_fields([field], 2, 2))[0]
+
+        self.assertEqual(decoded.distance((1, 0)), 70000)
+        self.assertIsNone(decoded.distance((0, 1)))
+
+    def test_rejects_foreign_files(self):
+        with self.assertRaisesRegex(ValueError, "Not a flow field file"):
+            decode_flow_fields(b"JUNK" + bytes(16))
+
+
+class Floor1FlowFieldTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = build_floor1_model()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = flow_field_path(Path(tmpdir) / "Floor1F.json")
+            cls.count = write_flow_fields(cls.model, path)
+            cls.fields = read_flow_fields(path)
+            cls.sidecar_name = path.name
+
+    def test_sidecar_holds_start_and_stair_fields(self):
+        stair_ids = [stair["id"] for stair in self.model["entities"]["stair_connections"]]
+
+        self.assertEqual(self.sidecar_name, "Floor1F.flow.bin")
+        self.assertEqual(list(self.fields), ["player_start", *stair_ids])
+        self.assertEqual(self.count, len(self.fields))
+
+    def test_distances_match_the_reachability_index(self):
+        mask = walkable_mask_from_tiles(self.model["tile_layers"]["wall"], FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        for field in self.fields.values():
+            with self.subTest(field=field.id):
+                index = ReachabilityIndex(mask, FLOOR1_WIDTH, FLOOR1_HEIGHT, field.source)
+                for y in range(FLOOR1_HEIGHT):
+                    for x in range(FLOOR1_WIDTH):
+                        expected = index.distance((x, y))
+                        self.assertEqual(field.distance((x, y)), None if expected < 0 else expected)
+
+    def test_next_steps_walk_to_the_source(self):
+        field = self.fields["player_start"]
+        for stair in self.model["entities"]["stair_connections"]:
+            cell = (stair["position"]["x"], stair["position"]["y"])
+            remaining = field.distance(cell)
+            while field.next_step(cell) is not None:
+                step = field.next_step(cell)
+                self.assertEqual(abs(step[0] - cell[0]) + abs(step[1] - cell[1]), 1)
+                self.assertEqual(field.distance(step), remaining - 1)
+                cell, remaining = step, remaining - 1
+
+            self.assertEqual(cell, field.source)
+            self.assertEqual(remaining, 0)
+
+    def test_build_accepts_explicit_sources(self):
+        start = self.fields["player_start"].source
+        fields = build_flow_fields(self.model, FLOOR1_WIDTH, FLOOR1_HEIGHT, [("custom", start)])
+
+        self.assertEqual([field.id for field in fields], ["custom"])
+        self.assertEqual(fields[0].directions, self.fields["player_start"].directions)
+        with self.assertRaisesRegex(ValueError, "outside the 60x60 floor"):
+            build_flow_fields(self.model, FLOOR1_WIDTH, FLOOR1_HEIGHT, [("bad", (60, 0))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools import floor0_maze_generator, floor1_maze_generator, validate_world
+from tools.floor_gen_cache import GenerationCache, generator_key, generator_sources, layout_constants
+
+
+class GeneratorKeyTest(unittest.TestCase):
+    def test_key_is_stable_and_depends_on_the_floor(self):
+        first = generator_key(floor1_maze_generator, "Floor 1")
+
+        self.assertEqual(first, generator_key(floor1_maze_generator, "Floor 1"))
+        self.assertNotEqual(first, generator_key(floor1_maze_generator, "Floor 2"))
+
+    def test_key_tracks_layout_constants(self):
+        before = generator_key(floor1_maze_generator, "Floor 1")
+        with patch.object(floor1_maze_generator, "FLOOR1_PLAYER_START", (9, 30)):
+            after = generator_key(floor1_maze_generator, "Floor 1")
+
+        self.assertNotEqual(before, after)
+
+    def test_sources_cover_every_tools_module_the_generator_imports(self):
+        tools_dir = ROOT / "tools"
+        self.assertIn(validate_world.__name__, sys.modules)
+        for generator in (floor0_maze_generator, floor1_maze_generator):
+            with self.subTest(generator=generator.__name__):
+                sources = generator_sources(generator)
+                imported = {
+                    Path(sys.modules[value.__module__].__file__).resolve()
+                    for value in vars(generator).values()
+                    if callable(value) and getattr(value, "__module__", "").startswith("tools.")
+                }
+
+                self.assertTrue(imported)
+                self.assertLessEqual(imported, set(sources))
+                self.assertTrue(all(path.parent == tools_dir for path in sources))
+                self.assertIn(tools_dir / "maze_grid.py", sources)
+                self.assertNotIn(tools_dir / "validate_world.py", sources)
+
+    def test_layout_constants_skip_callables(self):
+        constants = layout_constants(floor1_maze_generator)
+
+        self.assertIn("FLOOR1_WIDTH", constants)
+        self.assertNotIn("FLOOR_BUILDERS", constants)
+
+
+class GenerationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.tmp = Path(self.tmpdir.name)
+        self.cache_path = self.tmp / "cache.json"
+        self.output = self.tmp / "Floor.json"
+        self.output.write_text("{}\n", encoding="utf-8")
+
+    def record_and_reload(self, **kwargs):
+        cache = GenerationCache(self.cache_path)
+        self.assertFalse(cache.is_fresh("Floor", "key", self.output))
+        cache.record("key", self.output)
+        cache.save()
+        return GenerationCache(self.cache_path, **kwargs)
+
+    def test_recorded_output_is_a_hit_on_the_next_run(self):
+        cache = self.record_and_reload()
+
+        self.assertTrue(cache.is_fresh("Floor", "key", self.output))
+        self.assertEqual(cache.summary(), "Generation cache: 1 hit(s) [Floor], 0 miss(es) [none]")
+
+    def test_changed_key_or_edited_output_is_a_miss(self):
+        cache = self.record_and_reload()
+        self.assertFalse(cache.is_fresh("Floor", "other-key", self.output))
+
+        self.output.write_text("{ }\n", encoding="utf-8")
+        self.assertFalse(cache.is_fresh("Floor", "key", self.output))
+        self.assertEqual(cache.misses, ["Floor", "Floor"])
+
+    def test_force_and_disabled_caches_always_miss(self):
+        self.assertFalse(self.record_and_reload(force=True).is_fresh("Floor", "key", self.output))
+
+        disabled = GenerationCache(self.cache_path, enabled=False)
+        self.assertFalse(disabled.is_fresh("Floor", "key", self.output))
+        self.assertEqual(disabled.summary(), "Generation cache: disabled")
+
+    def test_unreadable_cache_file_starts_empty(self):
+        self.cache_path.write_text("not json", encoding="utf-8")
+
+        self.assertEqual(GenerationCache(self.cache_path).entries, {})
+
+
+class Floor1CacheIntegrationTest(unittest.TestCase):
+    def run_main(self, tmp, *extra):
+        argv = ["floor1_maze_generator.py", "--skip-floor-defs", "--cache-file", str(tmp / "cache.json")]
+        for number in (1, 2, 3):
+            argv += [f"--floor{number}-output", str(tmp / f"Floor{number}F.json")]
+        stdout = io.StringIO()
+        with patch.object(sys, "argv", argv + list(extra)), redirect_stdout(stdout):
+            result = floor1_maze_generator.main()
+        self.assertEqual(result, 0)
+        return stdout.getvalue()
+
+    def test_second_run_only_rebuilds_edited_or_forced_floors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            flow = ("--sidecars", "flow")
+            self.assertIn("3 miss(es)", self.run_main(tmp, *flow))
+            floor2 = tmp / "Floor2F.json"
+            generated = floor2.read_bytes()
+
+            self.assertIn("Regenerated nothing; 3 floor(s) already up to date", self.run_main(tmp, *flow))
+
+            floor2.write_text("{}\n", encoding="utf-8")
+            output = self.run_main(tmp, *flow)
+            self.assertIn("Regenerated Floor 2; 2 floor(s) already up to date", output)
+            self.assertIn("2 hit(s) [Floor 1, Floor 3], 1 miss(es) [Floor 2]", output)
+            self.assertEqual(floor2.read_bytes(), generated)
+
+            (tmp / "Floor3F.flow.bin").unlink()
+            self.assertIn("Regenerated Floor 3; 2 floor(s) already up to date", self.run_main(tmp, *flow))
+            self.assertTrue((tmp / "Floor3F.flow.bin").exists())
+
+            self.assertIn("Generated Floor 1 maze", self.run_main(tmp, *flow, "--force"))
+            # Asking for a different set of sidecars is a miss, too.
+            self.assertIn("3 miss(es)", self.run_main(tmp, "--sidecars", "flow,chokes"))
+
+    def test_edited_or_deleted_chunk_files_are_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            self.run_main(tmp, "--chunk-size", "32")
+            chunks = tmp / "Floor2F.chunks"
+            chunk = sorted(chunks.glob("chunk_*.json"))[0]
+
+            chunk.write_text("{}\n", encoding="utf-8")
+            self.assertIn("Regenerated Floor 2;", self.run_main(tmp, "--chunk-size", "32"))
+            self.assertNotEqual(chunk.read_text(encoding="utf-8"), "{}\n")
+
+            for path in chunks.iterdir():
+                path.unlink()
+            chunks.rmdir()
+            self.assertIn("Regenerated Floor 2;", self.run_main(tmp, "--chunk-size", "32"))
+            self.assertTrue(chunk.exists())
+
+    def test_cached_rerun_with_jobs_builds_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            self.run_main(tmp, "--jobs", "2")
+
+            output = self.run_main(tmp, "--jobs", "2")
+            self.assertIn("Regenerated nothing; 3 floor(s) already up to date", output)
+            self.assertIn("3 hit(s)", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor0_maze_generator import build_floor_model
+from tools.floor1_maze_generator import build_floor1_model, write_json
+from tools.floor_json import (
+    BITSET_ENCODING,
+    RUNS_ENCODING,
+    SCHEMA_V1,
+    SCHEMA_V2,
+    CellLayer,
+    FloorJsonReader,
+    decode_bitset,
+    decode_runs,
+    dumps_floor_json,
+    encode_bitset,
+    encode_runs,
+    encode_tile_layer,
+    iter_floor_json,
+    iter_tile_layer,
+    layer_cells,
+    load_floor_json,
+    write_floor_json,
+)
+
+
+def row_major(tiles):
+    return sorted(tiles, key=lambda tile: (tile["tile"], tile.get("alt", 0), tile["y"], tile["x"]))
+
+
+class TileLayerEncodingTest(unittest.TestCase):
+    def test_runs_cover_each_row(self):
+        cells = [(0, 0), (1, 0), (2, 0), (5, 0), (3, 2)]
+
+        self.assertEqual(encode_runs(cells), "0:0+3,5+1;2:3+1")
+        self.assertEqual(list(decode_runs("0:0+3,5+1;2:3+1")), sorted(cells, key=lambda c: (c[1], c[0])))
+        self.assertEqual(encode_runs([]), "")
+        self.assertEqual(list(decode_runs("")), [])
+
+    def test_random_cells_round_trip_through_both_encodings(self):
+        rng = random.Random(7)
+        for size in (1, 9, 64, 500):
+            cells = {(rng.randrange(3, 40), rng.randrange(2, 30)) for _ in range(size)}
+            expected = sorted(cells, key=lambda cell: (cell[1], cell[0]))
+            with self.subTest(size=size):
+                self.assertEqual(list(decode_runs(encode_runs(cells))), expected)
+                self.assertEqual(list(decode_bitset(encode_bitset(cells))), expected)
+
+    def test_layers_keep_tile_names_and_alternatives(self):
+        tiles = [
+            {"x": 1, "y": 1, "tile": "up"},
+            {"x": 4, "y": 2, "tile": "down", "alt": 2},
+            {"x": 2, "y": 1, "tile": "up"},
+        ]
+        for encoding in (RUNS_ENCODING, BITSET_ENCODING, None):
+            with self.subTest(encoding=encoding):
+                layer = encode_tile_layer(tiles, encoding)
+                self.assertEqual(row_major(iter_tile_layer(layer)), row_major(tiles))
+
+    def test_auto_encoding_picks_the_smaller_layer(self):
+        full_rows = [{"x": x, "y": y, "tile": "g"} for y in range(50) for x in range(50)]
+        checkerboard = [tile for tile in full_rows if (tile["x"] + tile["y"]) % 2 == 0]
+
+        self.assertEqual(encode_tile_layer(full_rows)["encoding"], RUNS_ENCODING)
+        self.assertEqual(encode_tile_layer(checkerboard)["encoding"], BITSET_ENCODING)
+
+    def test_unknown_encoding_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Unknown tile layer encoding 'rle'"):
+            encode_tile_layer([], "rle")
+        with self.assertRaisesRegex(ValueError, "Unknown tile layer encoding 'rle'"):
+            list(iter_tile_layer({"encoding": "rle", "groups": []}))
+
+
+class FloorJsonSchemaTest(unittest.TestCase):
+    def test_schema_v1_output_is_unchanged(self):
+        model = build_floor1_model()
+
+        self.assertEqual(dumps_floor_json(model), json.dumps(model, indent=2) + "\n")
+
+    def test_schema_v2_round_trips_generated_floors(self):
+        for model in (build_floor_model(), build_floor1_model()):
+            with self.subTest(floor=model["floor_metadata"]["floor_name"]), tempfile.TemporaryDirectory() as tmpdir:
+                path = Path(tmpdir) / "Floor.json"
+                write_json(model, path, SCHEMA_V2)
+                raw = json.loads(path.read_text(encoding="utf-8"))
+                loaded = load_floor_json(path)
+
+                self.assertEqual(raw["schema_version"], SCHEMA_V2)
+                self.assertLess(path.stat().st_size * 10, len(dumps_floor_json(model)))
+                self.assertEqual(loaded["schema_version"], SCHEMA_V1)
+                self.assertEqual(loaded["entities"], model["entities"])
+                self.assertEqual(loaded["floor_metadata"], model["floor_metadata"])
+                for name, tiles in model["tile_layers"].items():
+                    self.assertEqual(row_major(loaded["tile_layers"][name]), row_major(tiles))
+                    self.assertEqual(
+                        sorted(layer_cells(raw["tile_layers"][name])),
+                        sorted((tile["x"], tile["y"]) for tile in tiles),
+                    )
+
+    def test_unsupported_schema_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor.json"
+            path.write_text(json.dumps({"schema_version": "3.0", "tile_layers": {}}), encoding="utf-8")
+
+            with self.assertRaisesRegex(ValueError, "Unsupported floor schema_version '3.0'"):
+                load_floor_json(path)
+
+
+class StreamingWriterTest(unittest.TestCase):
+    def test_stream_matches_json_dumps_for_generated_floors(self):
+        for model in (build_floor_model(), build_floor1_model()):
+            with self.subTest(floor=model["floor_metadata"]["floor_name"]):
+                self.assertEqual("".join(iter_floor_json(model)), json.dumps(model, indent=2) + "\n")
+
+    def test_stream_matches_json_dumps_for_mixed_values(self):
+        model = {
+            "schema_version": SCHEMA_V1,
+            "empty": [[], {}, ()],
+            "scalars": [1.5, None, True, False, -3, "caf\u00e9 \"quoted\"\n"],
+            "nested": {"a": [{"b": [1, {"c": {}}]}], 7: "int key", True: "bool key"},
+        }
+
+        self.assertEqual(dumps_floor_json(model), json.dumps(model, indent=2) + "\n")
+
+    def test_layers_stream_from_generators_and_cell_layers(self):
+        cells = [(2, 0), (0, 1), (1, 1)]
+        expected = {
+            "schema_version": SCHEMA_V1,
+            "tile_layers": {
+                "wall": [{"x": x, "y": y, "tile": "generic"} for x, y in cells],
+                "stair": [{"x": 4, "y": 4, "tile": "up"}],
+            },
+        }
+        streamed = {
+            "schema_version": SCHEMA_V1,
+            "tile_layers": {
+                "wall": CellLayer("generic", cells),
+                "stair": ({"x": x, "y": y, "tile": "up"} for x, y in [(4, 4)]),
+            },
+        }
+
+        self.assertEqual(dumps_floor_json(streamed), json.dumps(expected, indent=2) + "\n")
+
+    def test_unserializable_values_raise_type_error(self):
+        with self.assertRaisesRegex(TypeError, "Object of type object is not JSON serializable"):
+            dumps_floor_json({"schema_version": SCHEMA_V1, "bad": object()})
+
+    def test_failed_write_keeps_the_previous_file(self):
+        def tiles():
+            yield {"x": 0, "y": 0, "tile": "generic"}
+            raise RuntimeError("generator failed")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor.json"
+            path.write_text("previous\n", encoding="utf-8")
+
+            with self.assertRaisesRegex(RuntimeError, "generator failed"):
+                write_floor_json({"schema_version": SCHEMA_V1, "tile_layers": {"wall": tiles()}}, path)
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "previous\n")
+            self.assertEqual([entry.name for entry in Path(tmpdir).iterdir()], ["Floor.json"])
+
+
+
+class FloorJsonReaderTest(unittest.TestCase):
+    def test_reader_matches_a_full_load_in_both_schemas(self):
+        model = build_floor1_model()
+        for schema_version in (SCHEMA_V1, SCHEMA_V2):
+            with self.subTest(schema_version=schema_version), tempfile.TemporaryDirectory() as tmpdir:
+                path = Path(tmpdir) / "Floor.json"
+                write_json(model, path, schema_version)
+                reader = FloorJsonReader(path)
+                loaded = load_floor_json(path)
+
+                self.assertEqual(reader.schema_version, schema_version)
+                self.assertEqual(reader.floor_metadata(), loaded["floor_metadata"])
+                self.assertEqual(reader.entities(), loaded["entities"])
+                self.assertEqual(
+                    reader.entities("treasure_boxes", "no_such_list"),
+                    {"treasure_boxes": loaded["entities"]["treasure_boxes"], "no_such_list": []},
+                )
+                self.assertEqual(reader.layer_names(), list(loaded["tile_layers"]))
+                for name, tiles in loaded["tile_layers"].items():
+                    self.assertEqual(row_major(reader.iter_layer(name)), row_major(tiles))
+                    self.assertEqual(sorted(reader.layer_cells(name)), sorted((tile["x"], tile["y"]) for tile in tiles))
+                wall = loaded["tile_layers"]["wall"][7]
+                self.assertTrue(reader.has_tile("wall", (wall["x"], wall["y"])))
+                self.assertFalse(reader.has_tile("wall", (-1, 0)))
+                self.assertEqual(list(reader.iter_layer("no_such_layer")), [])
+
+    def test_entity_queries_never_parse_the_tile_layers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor.json"
+            write_json(build_floor_model(), path)
+
+            with patch("json.loads", side_effect=AssertionError("full parse")):
+                reader = FloorJsonReader(path)
+                stairs = reader.entities("stair_connections")["stair_connections"]
+                self.assertEqual(reader.floor_metadata()["floor_number"], 0)
+                self.assertEqual([stair["id"] for stair in stairs], ["GF_000"])
+                self.assertTrue(reader.has_tile("ground", (0, 0)))
+                self.assertEqual(next(reader.layer_cells("ground")), (0, 0))
+
+    def test_other_layouts_fall_back_to_a_full_parse(self):
+        model = build_floor1_model()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor.json"
+            path.write_text(json.dumps(model, separators=(",", ":")), encoding="utf-8")
+            reader = FloorJsonReader(path)
+
+            self.assertEqual(reader.entities("enemy_spawns")["enemy_spawns"], model["entities"]["enemy_spawns"])
+            self.assertEqual(list(reader.iter_layer("wall")), model["tile_layers"]["wall"])
+            self.assertTrue(reader.has_tile("ground", (0, 0)))
+
+            unsupported = {"schema_version": "3.0", "floor_metadata": {}, "entities": {}}
+            path.write_text(json.dumps(unsupported), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "Unsupported floor schema_version '3.0'"):
+                FloorJsonReader(path)
+
+    def test_files_without_floor_sections_are_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor1F.regions.json"
+            for document in ({"format_version": 1, "regions": []}, {"floor_metadata": {}}, []):
+                with self.subTest(document=document):
+                    path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+                    with self.assertRaisesRegex(ValueError, "Floor1F.regions.json is not a floor JSON"):
+                        FloorJsonReader(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
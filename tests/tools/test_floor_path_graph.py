@@ -0,0 +1,100 @@
+import random
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from floor_test_helpers import mask_of
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_model
+from tools.floor_json import layer_cells
+from tools.floor_path_graph import (
+    LONG_ENTRANCE,
+    PathGraph,
+    build_path_graph,
+    path_graph_from_model,
+)
+from tools.floor_reachability import UNREACHED, bfs_distances, walkable_mask_from_walls
+from tools.maze_grid import MazeBuilder
+
+
+class PathGraphTest(unittest.TestCase):
+    def test_entrances_sit_on_open_runs_across_cluster_borders(self):
+        builder = MazeBuilder(16, 8)
+        builder.carve_rect(1, 1, 14, 6)
+        builder.walls.update((7, y) for y in range(1, 7) if y != 3)
+        mask = mask_of(builder)
+
+        graph = build_path_graph(mask, 16, 8, cluster_size=8)
+
+        # Vertical border x=7|8 is open only at y=3; horizontal border y=7|8 is off the floor.
+        self.assertEqual([(node.x, node.y, node.cluster) for node in graph.nodes], [(7, 3, 0), (8, 3, 1)])
+        self.assertEqual([(edge.a, edge.b, edge.cost) for edge in graph.edges], [(0, 1, 1)])
+        self.assertEqual(graph.cluster_bounds(1), (8, 0, 15, 7))
+
+    def test_long_entrances_get_a_node_pair_at_each_end(self):
+        builder = MazeBuilder(16, 16)
+        builder.carve_rect(1, 1, 14, 14)
+
+        graph = build_path_graph(mask_of(builder), 16, 16, cluster_size=8)
+
+        # Both borders of cluster 0 are open from 1 to 7, long enough for a pair at each end;
+        # the shared corner (7, 7) is a single node.
+        self.assertGreaterEqual(7, LONG_ENTRANCE)
+        nodes = graph.nodes_in(0)
+        self.assertEqual([(node.x, node.y) for node in nodes], [(7, 1), (1, 7), (7, 7)])
+        costs = {(edge.a, edge.b): edge.cost for edge in graph.edges}
+        self.assertEqual(costs[(nodes[0].id, nodes[1].id)], 12)
+        self.assertEqual(costs[(nodes[0].id, nodes[2].id)], 6)
+
+    def test_paths_match_connectivity_and_never_beat_the_true_distance(self):
+        model = build_floor1_model()
+        mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        graph = path_graph_from_model(model, FLOOR1_WIDTH, FLOOR1_HEIGHT, cluster_size=12)
+        cells = [(index % FLOOR1_WIDTH, index // FLOOR1_WIDTH) for index, flag in enumerate(mask) if flag]
+        self.assertLess(len(graph.nodes), len(cells) // 5)
+
+        rng = random.Random(5)
+        for _ in range(40):
+            start, goal = rng.choice(cells), rng.choice(cells)
+            with self.subTest(start=start, goal=goal):
+                expected = bfs_distances(mask, FLOOR1_WIDTH, [start[1] * FLOOR1_WIDTH + start[0]])
+                distance = expected[goal[1] * FLOOR1_WIDTH + goal[0]]
+                cost, waypoints = graph.find_path(mask, start, goal)
+                self.assertNotEqual(distance, UNREACHED)
+                self.assertGreaterEqual(cost, distance)
+                self.assertLessEqual(cost, distance * 1.5 + 4)
+                self.assertEqual((waypoints[0], waypoints[-1]), (start, goal))
+                for here, there in zip(waypoints, waypoints[1:]):
+                    adjacent = abs(here[0] - there[0]) + abs(here[1] - there[1]) == 1
+                    self.assertTrue(adjacent or graph.cluster_of(here) == graph.cluster_of(there))
+
+    def test_unconnected_cells_have_no_path(self):
+        builder = MazeBuilder(20, 8)
+        builder.carve_rect(1, 1, 8, 6)
+        builder.carve_rect(11, 1, 18, 6)
+        mask = mask_of(builder)
+        graph = build_path_graph(mask, 20, 8, cluster_size=4)
+
+        self.assertIsNone(graph.find_path(mask, (1, 1), (18, 6)))
+        self.assertIsNone(graph.find_path(mask, (0, 0), (2, 2)))
+        self.assertEqual(graph.find_path(mask, (1, 1), (2, 2))[0], 2)
+
+    def test_json_round_trip(self):
+        graph = path_graph_from_model(build_floor1_model(), FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        loaded = PathGraph.from_json(graph.to_json())
+
+        self.assertEqual(loaded.nodes, graph.nodes)
+        self.assertEqual(loaded.edges, graph.edges)
+        self.assertEqual(loaded.neighbours(0), graph.neighbours(0))
+        with self.assertRaisesRegex(ValueError, "Unsupported path graph format_version 2"):
+            PathGraph.from_json({**graph.to_json(), "format_version": 2})
+        with self.assertRaisesRegex(ValueError, "at least 2 cells"):
+            build_path_graph(bytearray(4), 2, 2, cluster_size=1)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
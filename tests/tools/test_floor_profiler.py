@@ -0,0 +1,88 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+import pstats
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools import floor0_maze_generator, floor1_maze_generator
+from tools.floor_profiler import profile_iter, profile_phase, profiled, profiling_active, run_profiled
+from tools.floor_spec import clear_layout_cache
+
+
+@profiled("outer", rest="outer work")
+def outer_phase():
+    with profile_phase("inner"):
+        data = [0] * 100000
+    for _ in profile_iter("items", range(3)):
+        with profile_phase("inner"):
+            pass
+    return len(data)
+
+
+class PhaseProfilerTest(unittest.TestCase):
+    def test_phases_are_no_ops_without_a_profiler(self):
+        self.assertFalse(profiling_active())
+        self.assertEqual(outer_phase(), 100000)
+        self.assertEqual(list(profile_iter("items", range(2))), [0, 1])
+
+    def test_nested_phases_are_aggregated_by_path(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            result = run_profiled(lambda: outer_phase() and outer_phase())
+        rows = {line[:40].rstrip(): line.split() for line in stdout.getvalue().splitlines()[1:]}
+
+        self.assertEqual(result, 100000)
+        self.assertEqual(list(rows), ["outer", "  outer work", "  inner", "  items"])
+        self.assertEqual(rows["outer"][1], "2")
+        self.assertEqual(rows["  inner"][1], "8")
+        self.assertEqual(rows["  items"][1], "8")
+        # The 100000-item list is about 0.76 MiB.
+        self.assertGreaterEqual(float(rows["  inner"][-1]), 0.7)
+        self.assertGreaterEqual(float(rows["outer"][-1]), float(rows["  inner"][-1]))
+        self.assertFalse(profiling_active())
+
+    def test_generator_profile_table_and_stats_dump(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            stats_path = tmp / "floors.prof"
+            argv = ["floor1_maze_generator.py", "--skip-floor-defs", "--no-cache", "--jobs", "2", "--sidecars", "flow"]
+            for number in (1, 2, 3):
+                argv += [f"--floor{number}-output", str(tmp / f"Floor{number}F.json")]
+            argv += ["--profile-stats", str(stats_path)]
+            stdout = io.StringIO()
+            # Layouts compiled by earlier tests would otherwise skip the carve phase.
+            clear_layout_cache()
+            with patch.object(sys, "argv", argv), redirect_stdout(stdout):
+                self.assertEqual(floor1_maze_generator.main(), 0)
+
+            output = stdout.getvalue()
+            names = [line[:40].rstrip() for line in output.splitlines()]
+            for row in ("Floor 1 build", "  entity build", "  carve", "    bfs", "    gates", "    dead ends",
+                        "Floor 3 output", "  json encode", "  file write", "  flow fields"):
+                self.assertIn(row, names)
+            self.assertIn("Profiling builds floors serially; ignoring --jobs", output)
+            self.assertGreater(pstats.Stats(str(stats_path)).total_calls, 0)
+
+    def test_floor0_profile_counts_the_perimeter_fill_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            argv = ["floor0_maze_generator.py", "--skip-floor-def", "--no-cache", "--profile"]
+            argv += ["--output", str(Path(tmpdir) / "FloorGF.json")]
+            stdout = io.StringIO()
+            clear_layout_cache()
+            with patch.object(sys, "argv", argv), redirect_stdout(stdout):
+                self.assertEqual(floor0_maze_generator.main(), 0)
+
+            names = [line[:40].strip() for line in stdout.getvalue().splitlines()]
+            self.assertEqual(names.count("perimeter fill"), 1)
+            self.assertIn("carve", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
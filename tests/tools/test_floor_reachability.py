@@ -0,0 +1,128 @@
+import random
+import unittest
+from collections import deque
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_model
+from tools.floor_reachability import (
+    UNREACHED,
+    ReachabilityIndex,
+    pack_flags,
+    row_bits,
+    walkable_mask_from_tiles,
+    walkable_mask_from_walls,
+)
+from tools.maze_grid import WallGrid
+
+
+def bfs_distances(walkable, start):
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if nxt in walkable and nxt not in distances:
+                distances[nxt] = distances[(x, y)] + 1
+                queue.append(nxt)
+    return distances
+
+
+class ReachabilityIndexTest(unittest.TestCase):
+    def test_labels_components_and_distances(self):
+        # .#..
+        # .#.#
+        # ...#
+        walls = {(1, 0), (1, 1), (3, 1), (3, 2)}
+        index = ReachabilityIndex.from_walls(walls, 4, 3, (0, 0))
+
+        self.assertTrue(index.start_walkable)
+        self.assertEqual(index.distance((0, 0)), 0)
+        self.assertEqual(index.distance((2, 0)), 6)
+        self.assertEqual(index.distance((3, 0)), 7)
+        self.assertEqual(index.distance((1, 1)), UNREACHED)
+        self.assertEqual(index.component_count, 1)
+        self.assertTrue(index.is_reachable((3, 0)))
+        self.assertFalse(index.is_walkable((1, 0)))
+        self.assertFalse(index.is_walkable((4, 0)))
+        self.assertEqual(index.unreachable_cells(), [])
+
+    def test_reports_islands_sorted_by_position(self):
+        # ..#.
+        # ###.
+        walls = {(2, 0), (0, 1), (1, 1), (2, 1)}
+        index = ReachabilityIndex.from_walls(walls, 4, 2, (0, 0))
+
+        self.assertEqual(index.component_count, 2)
+        self.assertEqual(index.component((3, 1)), 1)
+        self.assertTrue(index.connected((3, 0), (3, 1)))
+        self.assertFalse(index.is_reachable((3, 1)))
+        self.assertEqual(index.distance((3, 1)), UNREACHED)
+        self.assertEqual(index.unreachable_cells(), [(3, 0), (3, 1)])
+        self.assertEqual(index.unreachable_cells(width=3), [])
+
+    def test_blocked_start_reaches_nothing(self):
+        index = ReachabilityIndex.from_walls({(0, 0)}, 2, 1, (0, 0))
+
+        self.assertFalse(index.start_walkable)
+        self.assertFalse(index.is_reachable((1, 0)))
+        self.assertEqual(index.unreachable_cells(), [(1, 0)])
+
+    def test_matches_plain_bfs_on_floor1(self):
+        model = build_floor1_model()
+        mask = walkable_mask_from_tiles(model["tile_layers"]["wall"], FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        start = (model["floor_metadata"]["player_start"]["x"], model["floor_metadata"]["player_start"]["y"])
+        index = ReachabilityIndex(mask, FLOOR1_WIDTH, FLOOR1_HEIGHT, start)
+        walkable = {
+            (x, y)
+            for y in range(FLOOR1_HEIGHT)
+            for x in range(FLOOR1_WIDTH)
+            if mask[y * FLOOR1_WIDTH + x]
+        }
+        expected = bfs_distances(walkable, start)
+
+        for cell in walkable:
+            self.assertEqual(index.distance(cell), expected.get(cell, UNREACHED))
+        self.assertEqual(mask, walkable_mask_from_walls(
+            ((tile["x"], tile["y"]) for tile in model["tile_layers"]["wall"]),
+            FLOOR1_WIDTH,
+            FLOOR1_HEIGHT,
+        ))
+
+    def test_bitset_reachability_matches_plain_bfs_on_random_grids(self):
+        rng = random.Random(3)
+        for width, height in ((1, 1), (7, 3), (3, 9), (16, 16), (33, 20)):
+            for density in (0.2, 0.4, 0.6):
+                walls = {(x, y) for y in range(height) for x in range(width) if rng.random() < density}
+                walkable = {(x, y) for y in range(height) for x in range(width)} - walls
+                start = (rng.randrange(width), rng.randrange(height))
+                with self.subTest(size=(width, height), density=density):
+                    index = ReachabilityIndex.from_walls(walls, width, height, start)
+                    reached = bfs_distances(walkable, start) if start in walkable else {}
+                    for y in range(height):
+                        for x in range(width):
+                            self.assertEqual(index.is_reachable((x, y)), (x, y) in reached)
+                    self.assertEqual(index.unreachable_cells(), sorted(walkable - set(reached)))
+
+    def test_wall_grid_masks_match_cell_iteration(self):
+        grid = WallGrid(5, 4)
+        grid.fill_rect(1, 1, 3, 2, 0)
+
+        self.assertEqual(walkable_mask_from_walls(grid, 5, 4), walkable_mask_from_walls(list(grid), 5, 4))
+
+    def test_flags_pack_one_bit_per_cell(self):
+        flags = bytes(random.Random(3).randint(0, 1) for _ in range(21))
+        expected = sum(flag << index for index, flag in enumerate(flags))
+
+        self.assertEqual(pack_flags(flags), expected)
+        self.assertEqual(pack_flags(b""), 0)
+        # row_bits leaves a clear guard bit after each row of 7.
+        self.assertEqual(row_bits(flags, 7, 3), pack_flags(flags[0:7] + b"\0" + flags[7:14] + b"\0" + flags[14:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_layout, build_floor1_model
+from tools.floor_regions import (
+    PASSAGE,
+    RegionGraph,
+    extract_region_graph,
+    region_graph_from_model,
+)
+from tools.floor_reachability import walkable_mask_from_walls
+from tools.maze_grid import CORRIDOR, ROOM, Carve, MazeBuilder
+
+
+def build_graph(builder):
+    mask = walkable_mask_from_walls(builder.walls, builder.width, builder.height)
+    return extract_region_graph(mask, builder.width, builder.height, builder.carves)
+
+
+class RegionExtractionTest(unittest.TestCase):
+    def test_builder_records_clamped_carves(self):
+        builder = MazeBuilder(10, 8)
+        builder.carve_rect(0, 0, 3, 3)
+        builder.carve_path((3, 2), (7, 5), half_width=0)
+
+        self.assertEqual(
+            builder.carves,
+            [Carve(ROOM, 1, 1, 3, 3), Carve(CORRIDOR, 3, 2, 7, 2), Carve(CORRIDOR, 7, 2, 7, 5)],
+        )
+
+    def test_rooms_joined_by_a_corridor(self):
+        builder = MazeBuilder(20, 9)
+        builder.carve_rect(1, 1, 5, 7)
+        builder.carve_rect(14, 1, 18, 7)
+        builder.carve_h_corridor(5, 14, 4, half_width=0)
+        graph = build_graph(builder)
+
+        west, corridor, east = (graph.region_at(cell) for cell in ((3, 4), (9, 4), (16, 4)))
+        self.assertEqual((west.kind, corridor.kind, east.kind), (ROOM, CORRIDOR, ROOM))
+        self.assertEqual((corridor.left, corridor.right, corridor.cell_count), (6, 13, 8))
+        self.assertEqual(sorted(graph.neighbours(corridor.id)), sorted([west.id, east.id]))
+        self.assertEqual(graph.region_path((1, 1), (18, 7)), [west.id, corridor.id, east.id])
+        self.assertIsNone(graph.region_at((9, 3)))
+
+    def test_nested_rooms_and_split_corridors_get_their_own_nodes(self):
+        builder = MazeBuilder(20, 12)
+        builder.carve_rect(1, 1, 12, 10)
+        builder.carve_rect(4, 4, 7, 7)
+        # The room cuts this corridor into a west and an east stub.
+        builder.carve_h_corridor(1, 18, 2, half_width=0)
+        builder.walls.discard((18, 3))
+        graph = build_graph(builder)
+
+        plaza = graph.region_at((1, 1))
+        inner = graph.region_at((5, 5))
+        self.assertNotEqual(plaza.id, inner.id)
+        self.assertEqual((plaza.cell_count, inner.cell_count), (12 * 10 - 16, 16))
+        self.assertEqual(graph.region_at((15, 2)).kind, CORRIDOR)
+        self.assertEqual(graph.region_at((18, 3)).kind, PASSAGE)
+        self.assertEqual(len(graph.regions), 4)
+
+    def test_disconnected_cells_have_no_region_path(self):
+        builder = MazeBuilder(12, 5)
+        builder.carve_rect(1, 1, 3, 3)
+        builder.carve_rect(7, 1, 10, 3)
+
+        self.assertIsNone(build_graph(builder).region_path((1, 1), (8, 2)))
+
+
+class Floor1RegionGraphTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = build_floor1_model()
+        cls.graph = region_graph_from_model(cls.model, build_floor1_layout().carves)
+
+    def test_every_walkable_cell_has_exactly_one_region(self):
+        walls = {(tile["x"], tile["y"]) for tile in self.model["tile_layers"]["wall"]}
+        for y in range(FLOOR1_HEIGHT):
+            for x in range(FLOOR1_WIDTH):
+                self.assertEqual(self.graph.region_at((x, y)) is None, (x, y) in walls)
+        cells = self.graph.region_cells()
+        self.assertEqual([len(region_cells) for region_cells in cells], [r.cell_count for r in self.graph.regions])
+
+    def test_every_stair_has_a_region_path_from_the_start(self):
+        start = self.model["floor_metadata"]["player_start"]
+        for stair in self.model["entities"]["stair_connections"]:
+            path = self.graph.region_path((start["x"], start["y"]), (stair["position"]["x"], stair["position"]["y"]))
+            self.assertIsNotNone(path)
+            for here, there in zip(path, path[1:]):
+                self.assertIn(there, self.graph.neighbours(here))
+
+    def test_json_round_trip_keeps_the_cell_map(self):
+        loaded = RegionGraph.from_json(self.graph.to_json())
+
+        self.assertEqual(loaded.region_ids, self.graph.region_ids)
+        self.assertEqual(loaded.regions, self.graph.regions)
+        self.assertEqual(loaded.doorways, self.graph.doorways)
+        with self.assertRaisesRegex(ValueError, "Unsupported region graph format_version 2"):
+            RegionGraph.from_json({**self.graph.to_json(), "format_version": 2})
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import argparse
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from floor_test_helpers import FLOOR1_GENERATOR_OUTPUTS, run_floor1_generator
+from tools import floor0_maze_generator, floor1_maze_generator
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_layout, build_floor1_model
+from tools.floor_choke_points import analyze_model, read_choke_points
+from tools.floor_chunks import load_chunk_index
+from tools.floor_flow_fields import read_flow_fields
+from tools.floor_path_graph import path_graph_from_model, read_path_graph
+from tools.floor_regions import read_region_graph, region_graph_from_model
+from tools.floor_sidecars import SIDECARS, parse_sidecars
+from tools.floor_visibility import read_visibility, visibility_from_model
+from tools.sfloor import SFloor
+
+
+class ParseSidecarsTest(unittest.TestCase):
+    def test_names_are_comma_separated(self):
+        self.assertEqual(parse_sidecars("flow, vis,flow"), {"flow", "vis"})
+        self.assertEqual(parse_sidecars(""), frozenset())
+        self.assertEqual(parse_sidecars(",".join(SIDECARS)), set(SIDECARS))
+
+    def test_unknown_names_are_rejected(self):
+        with self.assertRaisesRegex(argparse.ArgumentTypeError, "unknown sidecar.*bogus; choose from flow, "):
+            parse_sidecars("flow,bogus")
+
+
+class PlainRunTest(unittest.TestCase):
+    def test_plain_runs_write_only_the_floor_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            floor1_argv = ["floor1_maze_generator.py", "--skip-floor-defs", "--no-cache"]
+            for number in (1, 2, 3):
+                floor1_argv += [f"--floor{number}-output", str(tmp / f"Floor{number}F.json")]
+            floor0_argv = ["floor0_maze_generator.py", "--skip-floor-def", "--no-cache"]
+            floor0_argv += ["--output", str(tmp / "FloorGF.json")]
+            with redirect_stdout(io.StringIO()):
+                for argv, generator in ((floor1_argv, floor1_maze_generator), (floor0_argv, floor0_maze_generator)):
+                    with patch.object(sys, "argv", argv):
+                        self.assertEqual(generator.main(), 0)
+
+            self.assertEqual(
+                sorted(path.name for path in tmp.iterdir()),
+                ["Floor1F.json", "Floor2F.json", "Floor3F.json", "FloorGF.json"],
+            )
+
+
+class GeneratorSidecarTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = build_floor1_model()
+
+    def check_flow(self, tmp):
+        stair_ids = [stair["id"] for stair in self.model["entities"]["stair_connections"]]
+        self.assertEqual(list(read_flow_fields(tmp / "Floor1F.flow.bin")), ["player_start", *stair_ids])
+
+    def check_regions(self, tmp):
+        expected = region_graph_from_model(self.model, build_floor1_layout().carves)
+        self.assertEqual(read_region_graph(tmp / "Floor1F.regions.json").region_ids, expected.region_ids)
+
+    def check_paths(self, tmp):
+        graph = read_path_graph(tmp / "Floor1F.paths.json")
+        self.assertEqual(graph.cluster_size, 10)
+        self.assertEqual(graph.edges, path_graph_from_model(self.model, cluster_size=10).edges)
+
+    def check_chokes(self, tmp):
+        data = read_choke_points(tmp / "Floor1F.chokes.json")
+        analysis, _ = analyze_model(self.model, FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        self.assertEqual([(entry["x"], entry["y"]) for entry in data["choke_points"]], analysis.choke_cells)
+        self.assertEqual(len(data["bridges"]), len(analysis.bridges))
+        self.assertEqual(sum(entry["gate"] is not None for entry in data["choke_points"]), 22)
+        self.assertNotIn("EnemySpawn_Skeleton_StairA", data["bypassed_gates"])
+
+    def check_visibility(self, tmp):
+        visibility = read_visibility(tmp / "Floor1F.vis.bin")
+        self.assertEqual(visibility.radius, 5)
+        self.assertEqual(visibility.records, visibility_from_model(self.model, radius=5).records)
+
+    def check_chunks(self, tmp):
+        self.assertEqual(len(load_chunk_index(tmp / "Floor1F.chunks" / "index.json")["chunks"]), 4)
+        self.assertEqual(len(load_chunk_index(tmp / "Floor3F.chunks" / "index.json")["chunks"]), 1)
+
+    def check_sfloor(self, tmp):
+        with SFloor(tmp / "Floor3F.sfloor") as floor:
+            self.assertEqual((floor.width, floor.height), (24, 18))
+            self.assertEqual(floor.floor_metadata["floor_number"], 3)
+
+    def test_each_option_writes_only_its_own_sidecar_for_every_floor(self):
+        cases = [
+            (("--sidecars", "flow"), ".flow.bin", self.check_flow),
+            (("--sidecars", "regions"), ".regions.json", self.check_regions),
+            (("--sidecars", "paths", "--path-cluster-size", "10"), ".paths.json", self.check_paths),
+            (("--sidecars", "chokes"), ".chokes.json", self.check_chokes),
+            (("--sidecars", "vis", "--visibility-radius", "5"), ".vis.bin", self.check_visibility),
+            (("--chunk-size", "32"), ".chunks", self.check_chunks),
+            (("--sfloor",), ".sfloor", self.check_sfloor),
+        ]
+        for flags, suffix, check in cases:
+            with self.subTest(flags=flags), tempfile.TemporaryDirectory() as tmpdir:
+                tmp = Path(tmpdir)
+                run_floor1_generator(tmp, *flags)
+
+                sidecars = [name.replace(".json", suffix) for name in FLOOR1_GENERATOR_OUTPUTS]
+                self.assertEqual(
+                    sorted(path.name for path in tmp.iterdir()), sorted(FLOOR1_GENERATOR_OUTPUTS + tuple(sidecars))
+                )
+                check(tmp)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor_spec import (
+    FLOOR_SPEC_DIR,
+    FloorSpec,
+    FloorSpecError,
+    compile_layout,
+    floor_layout,
+    load_floor_spec,
+    stair_tiles,
+)
+from tools.maze_grid import MazeBuilder
+
+
+def small_spec(**overrides):
+    data = {
+        "format_version": 1,
+        "label": "Floor 9",
+        "width": 20,
+        "height": 12,
+        "metadata": {"floor_name": "Test Floor", "floor_number": 9, "description": "A test floor."},
+        "anchors": {"player_start": [2, 2], "stair": [16, 8]},
+        "layout": [
+            {"note": "hall", "room": [1, 1, 5, 4]},
+            {"loop": ["player_start", [10, 2], [10, 8], "player_start"], "half_width": 0},
+            {"path": [[10, 8], "stair"]},
+            {"branches": [[[5, 4], [5, 9]]], "half_width": 0},
+            {"corridors": [["h", 12, 17, 2], ["v", 2, 6, 17]], "half_width": 0},
+            {"cell": [18, 10]},
+            {"walls": [{"rect": [13, 7, 13, 9]}, [3, 3]]},
+            {"gate_barrier": "Guard", "cells": [{"rect": [7, 1, 7, 3]}]},
+        ],
+        "tables": {
+            "stairs": {
+                "9F_8F": {"position": "stair", "direction": "down", "target_floor": 8, "destination_stair_id": "8F_9F"}
+            },
+            "guards": {"Guard": {"position": [7, 2], "enemy_type": "orc"}},
+            "boxes": {"Box": {"position": [5, 9], "gold": 5, "items": {"antidote": 2}}},
+            "traps": {"Trap": {"position": [10, 5], "damage": 3}},
+        },
+        "entities": {
+            "enemy_spawns": ["guards"],
+            "stair_connections": ["stairs"],
+            "treasure_boxes": ["boxes"],
+            "trap_tiles": ["traps"],
+        },
+        "puzzle_id": "Puzzle_9F",
+    }
+    data.update(overrides)
+    return FloorSpec(data)
+
+
+class CompileLayoutTest(unittest.TestCase):
+    def test_operations_replay_maze_builder_calls(self):
+        expected = MazeBuilder(20, 12)
+        expected.carve_rect(1, 1, 5, 4)
+        expected.carve_loop([(2, 2), (10, 2), (10, 8), (2, 2)], half_width=0)
+        expected.carve_path((10, 8), (16, 8), half_width=1)
+        expected.carve_path((5, 4), (5, 9), half_width=0)
+        expected.carve_h_corridor(12, 17, 2, half_width=0)
+        expected.carve_v_corridor(2, 6, 17, half_width=0)
+        expected.carve_cell(18, 10)
+        expected.walls.update([(13, 7), (13, 8), (13, 9), (3, 3)])
+        expected.walls.update([(7, 1), (7, 3)])
+        expected.reinforce_perimeter()
+
+        compiled = compile_layout(small_spec())
+
+        self.assertEqual(compiled.walls.cells, expected.walls.cells)
+        self.assertEqual(compiled.carves, expected.carves)
+        self.assertNotIn((7, 2), compiled.walls)
+
+    def test_errors_name_the_operation(self):
+        layout = [{"room": [1, 1, 3, 3]}, {"note": "broken", "path": [[1, 1], "nowhere"]}]
+        with self.assertRaisesRegex(FloorSpecError, r"layout\[1\] \(broken\): unknown cell name 'nowhere'"):
+            compile_layout(small_spec(layout=layout))
+        with self.assertRaisesRegex(FloorSpecError, r"layout\[0\]: loop starts at \(2, 2\) but ends at \(4, 4\)"):
+            compile_layout(small_spec(layout=[{"loop": ["player_start", [4, 2], [4, 4]]}]))
+        with self.assertRaisesRegex(FloorSpecError, r"expected exactly one of"):
+            compile_layout(small_spec(layout=[{"room": [1, 1, 2, 2], "cell": [3, 3]}]))
+        with self.assertRaisesRegex(FloorSpecError, r"unknown room keys \['halfwidth'\]"):
+            compile_layout(small_spec(layout=[{"room": [1, 1, 2, 2], "halfwidth": 0}]))
+        with self.assertRaisesRegex(FloorSpecError, r"corridor direction must be 'h' or 'v'"):
+            compile_layout(small_spec(layout=[{"corridors": [["d", 1, 4, 2]]}]))
+
+    def test_cached_layouts_are_independent_copies(self):
+        spec = small_spec()
+        first = floor_layout(spec)
+        first.walls.add((2, 2))
+        first.carves.clear()
+
+        second = floor_layout(spec)
+
+        self.assertNotIn((2, 2), second.walls)
+        self.assertEqual(second.carves, compile_layout(spec).carves)
+
+    def test_shipped_specs_compile(self):
+        paths = sorted(FLOOR_SPEC_DIR.glob("*.json"))
+        self.assertEqual([path.stem for path in paths], ["floor0", "floor1", "floor2", "floor3"])
+        for path in paths:
+            with self.subTest(spec=path.stem):
+                spec = load_floor_spec(path.stem)
+                builder = compile_layout(spec)
+                self.assertEqual((builder.width, builder.height), (spec.width, spec.height))
+                self.assertNotIn(spec.player_start, builder.walls)
+
+
+class FloorSpecTest(unittest.TestCase):
+    def test_entities_follow_the_floor_json_shape(self):
+        entities = small_spec().entities()
+
+        self.assertEqual(list(entities), ["enemy_spawns", "stair_connections", "treasure_boxes", "trap_tiles"])
+        self.assertEqual(
+            entities["enemy_spawns"],
+            [{"id": "Guard", "position": {"x": 7, "y": 2}, "enemy_type": "orc"}],
+        )
+        self.assertEqual(entities["stair_connections"][0]["position"], {"x": 16, "y": 8})
+        self.assertEqual(entities["treasure_boxes"][0]["items"], [{"item_id": "antidote", "quantity": 2}])
+        self.assertEqual(
+            list(entities["trap_tiles"][0].items()),
+            [
+                ("id", "Trap"),
+                ("puzzle_id", "Puzzle_9F"),
+                ("position", {"x": 10, "y": 5}),
+                ("damage", 3),
+                ("status_effect", ""),
+                ("status_magnitude", 0),
+                ("status_turns", 0),
+            ],
+        )
+        self.assertEqual(stair_tiles(entities["stair_connections"]), [{"x": 16, "y": 8, "tile": "down"}])
+
+    def test_tables_resolve_named_positions(self):
+        spec = small_spec()
+
+        self.assertEqual(spec.table("stairs")["9F_8F"]["position"], (16, 8))
+        self.assertEqual(spec.cell("Box"), (5, 9))
+        self.assertEqual(spec.floor_metadata()["player_start"], {"x": 2, "y": 2})
+        self.assertEqual(spec.grid, (20, 12))
+        spec.table("boxes")["Box"]["items"]["antidote"] = 99
+        self.assertEqual(spec.table("boxes")["Box"]["items"], {"antidote": 2})
+
+    def test_rejects_inconsistent_specs(self):
+        with self.assertRaisesRegex(FloorSpecError, "unsupported format_version 2"):
+            small_spec(format_version=2)
+        with self.assertRaisesRegex(FloorSpecError, "'stair' is defined twice"):
+            small_spec(tables={"extra": {"stair": {"position": [1, 1]}}})
+        with self.assertRaisesRegex(FloorSpecError, r"'stair' at \(30, 8\) is outside the 20x12 floor"):
+            small_spec(anchors={"player_start": [2, 2], "stair": [30, 8]})
+        with self.assertRaisesRegex(FloorSpecError, "anchors must include player_start"):
+            small_spec(anchors={"stair": [16, 8]}, tables={})
+        with self.assertRaisesRegex(FloorSpecError, "trap_tiles entities need a puzzle_id"):
+            data = small_spec().data
+            del data["puzzle_id"]
+            FloorSpec(data)
+        with self.assertRaisesRegex(FloorSpecError, "enemy_spawns names unknown table 'orcs'"):
+            small_spec(entities={"enemy_spawns": ["orcs"]})
+
+    def test_loads_by_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "custom.json"
+            path.write_text(json.dumps(small_spec().data), encoding="utf-8")
+
+            spec = load_floor_spec(path)
+
+            self.assertEqual((spec.label, spec.path), ("Floor 9", path))
+            self.assertEqual(spec.digest, small_spec().digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import random
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import (
+    FLOOR1_HEIGHT,
+    FLOOR1_WIDTH,
+    FLOOR2_HEIGHT,
+    FLOOR2_WIDTH,
+    build_floor1_walls,
+    build_floor2_walls,
+    dead_end_branches,
+    walkable_from_walls,
+)
+from tools.floor_topology import dead_end_chains, degree_map, position_mask, unrewarded_chains
+
+
+def neighbors(walkable, position):
+    x, y = position
+    return [
+        cell
+        for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+        if cell in walkable
+    ]
+
+
+def reference_dead_end_branches(walkable, width, height):
+    branches = []
+    for leaf in sorted(walkable):
+        if leaf[0] >= width or leaf[1] >= height or len(neighbors(walkable, leaf)) != 1:
+            continue
+
+        branch = [leaf]
+        previous = None
+        current = leaf
+        while True:
+            next_cells = [cell for cell in neighbors(walkable, current) if cell != previous]
+            if not next_cells or len(neighbors(walkable, next_cells[0])) != 2:
+                break
+            branch.append(next_cells[0])
+            previous = current
+            current = next_cells[0]
+        branches.append(branch)
+    return branches
+
+
+class DegreeMapTest(unittest.TestCase):
+    def test_counts_walkable_neighbors_without_wrapping_rows(self):
+        # ..#
+        # #..
+        mask = bytes([1, 1, 0, 0, 1, 1])
+
+        self.assertEqual(list(degree_map(mask, 3)), [1, 2, 0, 0, 2, 1])
+
+    def test_matches_neighbor_counts_on_random_grids(self):
+        rng = random.Random(7)
+        for width, height in ((1, 5), (5, 1), (9, 7), (31, 17)):
+            mask = bytes(rng.random() < 0.6 for _ in range(width * height))
+            walkable = {(i % width, i // width) for i, value in enumerate(mask) if value}
+            expected = [
+                len(neighbors(walkable, (i % width, i // width))) if mask[i] else 0
+                for i in range(width * height)
+            ]
+            with self.subTest(size=(width, height)):
+                self.assertEqual(list(degree_map(mask, width)), expected)
+
+
+class DeadEndChainTest(unittest.TestCase):
+    def test_matches_reference_walk_on_generated_floors(self):
+        for build, width, height in (
+            (build_floor1_walls, FLOOR1_WIDTH, FLOOR1_HEIGHT),
+            (build_floor2_walls, FLOOR2_WIDTH, FLOOR2_HEIGHT),
+        ):
+            walkable = walkable_from_walls(build(), width, height)
+            with self.subTest(build=build.__name__):
+                self.assertEqual(
+                    dead_end_branches(walkable, width, height),
+                    reference_dead_end_branches(walkable, width, height),
+                )
+
+    def test_matches_reference_walk_on_random_grids(self):
+        rng = random.Random(11)
+        for _ in range(20):
+            width, height = rng.randrange(2, 24), rng.randrange(2, 24)
+            walkable = {(x, y) for y in range(height) for x in range(width) if rng.random() < 0.55}
+            self.assertEqual(
+                dead_end_branches(walkable, width, height),
+                reference_dead_end_branches(walkable, width, height),
+            )
+
+    def test_reports_the_cell_where_each_chain_stops(self):
+        # .....
+        # ##.##
+        # ##.##
+        walkable = {(x, 0) for x in range(5)} | {(2, 1), (2, 2)}
+        chains = dead_end_chains(position_mask(walkable, 5, 3), 5)
+
+        self.assertEqual(chains, [([0, 1], 2), ([12, 7], 2), ([4, 3], 2)])
+
+    def test_payoff_next_to_a_chain_rewards_it(self):
+        # Same T shape: three dead-end chains meet at (2, 0).
+        walkable = {(x, 0) for x in range(5)} | {(2, 1), (2, 2)}
+        mask = position_mask(walkable, 5, 3)
+
+        self.assertEqual(unrewarded_chains(mask, 5, 3, [(2, 0)]), [])
+        self.assertEqual(unrewarded_chains(mask, 5, 3, [(0, 0)]), [[12, 7], [4, 3]])
+        self.assertEqual(unrewarded_chains(mask, 5, 3, [(0, 2)]), [[0, 1], [12, 7], [4, 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
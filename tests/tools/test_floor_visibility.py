@@ -0,0 +1,98 @@
+import math
+import random
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from floor_test_helpers import mask_of
+from tools.floor1_maze_generator import FLOOR1_HEIGHT, FLOOR1_WIDTH, build_floor1_model
+from tools.floor_json import layer_cells
+from tools.floor_reachability import walkable_mask_from_walls
+from tools.floor_visibility import (
+    BAND_ROWS,
+    VisibilityMap,
+    compute_visibility,
+    visibility_from_model,
+)
+from tools.maze_grid import MazeBuilder
+
+
+def brute_force_sees(mask, width, height, radius, viewer, target):
+    dx, dy = target[0] - viewer[0], target[1] - viewer[1]
+    if dx * dx + dy * dy > radius * radius:
+        return False
+    if not (0 <= target[0] < width and 0 <= target[1] < height):
+        return False
+    steps = max(abs(dx), abs(dy))
+    for step in range(1, steps):
+        x = viewer[0] + math.floor(dx * step / steps + 0.5)
+        y = viewer[1] + math.floor(dy * step / steps + 0.5)
+        if not (0 <= x < width and 0 <= y < height) or not mask[y * width + x]:
+            return False
+    return True
+
+
+class VisibilityTest(unittest.TestCase):
+    def test_walls_block_sight_but_are_themselves_visible(self):
+        builder = MazeBuilder(12, 7)
+        builder.carve_rect(1, 1, 10, 5)
+        builder.walls.update((6, y) for y in range(1, 6) if y != 3)
+        visibility = compute_visibility(mask_of(builder), 12, 7, radius=5)
+
+        self.assertTrue(visibility.can_see((2, 3), (6, 3)))
+        self.assertTrue(visibility.can_see((4, 1), (6, 1)))
+        self.assertTrue(visibility.can_see((4, 3), (0, 3)))
+        self.assertFalse(visibility.can_see((5, 1), (7, 1)))
+        self.assertFalse(visibility.can_see((2, 3), (8, 3)))
+        self.assertFalse(visibility.can_see((1, 1), (-1, 1)))
+        self.assertFalse(visibility.can_see((6, 1), (6, 1)))
+        self.assertEqual(list(visibility.visible_cells((0, 0))), [])
+        self.assertIn((3, 3), list(visibility.visible_cells((3, 3))))
+
+    def test_matches_brute_force_line_of_sight(self):
+        model = build_floor1_model()
+        mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        visibility = compute_visibility(mask, FLOOR1_WIDTH, FLOOR1_HEIGHT, radius=6)
+        cells = [(index % FLOOR1_WIDTH, index // FLOOR1_WIDTH) for index, flag in enumerate(mask) if flag]
+
+        for viewer in random.Random(11).sample(cells, 30):
+            expected = {
+                (viewer[0] + dx, viewer[1] + dy)
+                for dy in range(-6, 7)
+                for dx in range(-6, 7)
+                if brute_force_sees(mask, FLOOR1_WIDTH, FLOOR1_HEIGHT, 6, viewer, (viewer[0] + dx, viewer[1] + dy))
+            }
+            with self.subTest(viewer=viewer):
+                self.assertEqual(set(visibility.visible_cells(viewer)), expected)
+
+    def test_parallel_bands_match_a_serial_run(self):
+        model = build_floor1_model()
+        self.assertGreater(FLOOR1_HEIGHT, BAND_ROWS)
+
+        serial = visibility_from_model(model, FLOOR1_WIDTH, FLOOR1_HEIGHT, radius=4)
+        pooled = visibility_from_model(model, FLOOR1_WIDTH, FLOOR1_HEIGHT, radius=4, jobs=2)
+
+        self.assertEqual(serial.records, pooled.records)
+
+    def test_binary_round_trip(self):
+        visibility = visibility_from_model(build_floor1_model(), FLOOR1_WIDTH, FLOOR1_HEIGHT, radius=3)
+        data = visibility.encode()
+        loaded = VisibilityMap.decode(data)
+
+        self.assertEqual((loaded.width, loaded.height, loaded.radius), (FLOOR1_WIDTH, FLOOR1_HEIGHT, 3))
+        self.assertEqual(loaded.mask, visibility.mask)
+        self.assertEqual(loaded.records, visibility.records)
+        self.assertEqual(loaded.row_offsets, visibility.row_offsets)
+        with self.assertRaisesRegex(ValueError, "Not a visibility file"):
+            VisibilityMap.decode(b"SFLW" + data[4:])
+        with self.assertRaisesRegex(ValueError, "radius must be 1-32"):
+            compute_visibility(bytearray(4), 2, 2, radius=0)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import (
+    FLOOR1_HEIGHT,
+    FLOOR1_PLAYER_START,
+    FLOOR1_WIDTH,
+    build_floor1_model,
+)
+from tools.floor_reachability import walkable_mask_from_tiles, walkable_mask_from_walls
+from tools.gate_reachability import ENEMY_GATE, PUZZLE_GATE, Gate, GateStateEngine, gates_from_model
+
+
+def corridor_engine(gates, length=7):
+    # A one-cell-high corridor: every gate cell cuts it in two.
+    mask = walkable_mask_from_walls((), length, 1)
+    return GateStateEngine(mask, length, 1, (0, 0), gates)
+
+
+class GateStateEngineTest(unittest.TestCase):
+    def test_enemy_gate_blocks_until_cleared(self):
+        engine = corridor_engine([Gate("Enemy", ENEMY_GATE, (2, 0))])
+
+        self.assertFalse(engine.is_reachable(0, (6, 0)))
+        self.assertTrue(engine.is_reachable(engine.state_for(["Enemy"]), (6, 0)))
+        self.assertEqual(engine.unlockable(0), engine.state_for(["Enemy"]))
+
+        report = engine.check([("stair", (6, 0))])
+        self.assertFalse(report.soft_locked)
+        self.assertEqual(report.unlock_order, ("Enemy",))
+
+    def test_puzzle_gate_opens_once_its_switch_is_reachable(self):
+        engine = corridor_engine([
+            Gate("Guard", ENEMY_GATE, (1, 0)),
+            Gate("Seal", PUZZLE_GATE, (4, 0), requires=((3, 0),)),
+        ])
+
+        self.assertEqual(engine.unlockable(0), engine.state_for(["Guard"]))
+        report = engine.check([("stair", (6, 0))])
+        self.assertFalse(report.soft_locked)
+        self.assertEqual(report.unlock_order, ("Guard", "Seal"))
+        self.assertEqual(report.closure_state, engine.all_open)
+
+    def test_reports_soft_lock_with_the_unlock_order_taken(self):
+        engine = corridor_engine([
+            Gate("Guard", ENEMY_GATE, (1, 0)),
+            Gate("Seal", PUZZLE_GATE, (3, 0), requires=((5, 0),)),
+        ])
+
+        report = engine.check([("stair", (6, 0)), ("start", (0, 0))])
+        self.assertTrue(report.soft_locked)
+        self.assertEqual(report.blocked_targets, (("stair", (6, 0)),))
+        self.assertEqual(report.unlock_order, ("Guard",))
+        self.assertEqual(engine.gate_ids(report.closure_state), ["Guard"])
+
+    def test_gates_guarding_each_others_switches_never_open(self):
+        engine = corridor_engine([
+            Gate("West", PUZZLE_GATE, (2, 0), requires=((5, 0),)),
+            Gate("East", PUZZLE_GATE, (4, 0), requires=((3, 0),)),
+        ])
+
+        # Forcing West open would reach East's switch, but neither switch is reachable with both closed.
+        self.assertTrue(engine.is_reachable(engine.state_for(["West"]), (3, 0)))
+        report = engine.check([("reward", (6, 0))])
+        self.assertTrue(report.soft_locked)
+        self.assertEqual((report.closure_state, report.unlock_order), (0, ()))
+
+    def test_memoizes_component_maps_per_state(self):
+        engine = corridor_engine([Gate("Enemy", ENEMY_GATE, (2, 0))])
+
+        self.assertIs(engine.components(0), engine.components(0))
+        self.assertIsNot(engine.components(0), engine.components(1))
+
+
+class Floor1GateStateTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = build_floor1_model()
+        mask = walkable_mask_from_tiles(cls.model["tile_layers"]["wall"], FLOOR1_WIDTH, FLOOR1_HEIGHT)
+        cls.gates = gates_from_model(cls.model)
+        cls.engine = GateStateEngine(mask, FLOOR1_WIDTH, FLOOR1_HEIGHT, FLOOR1_PLAYER_START, cls.gates)
+
+    def test_builds_puzzle_gates_before_enemy_gates(self):
+        self.assertEqual(self.gates[0].kind, PUZZLE_GATE)
+        self.assertEqual(len(self.gates[0].requires), 2)
+        self.assertEqual(
+            sum(gate.kind == ENEMY_GATE for gate in self.gates),
+            len(self.model["entities"]["enemy_spawns"]),
+        )
+
+    def test_every_required_target_survives_any_unlock_order(self):
+        targets = [
+            (stair["id"], (stair["position"]["x"], stair["position"]["y"]))
+            for stair in self.model["entities"]["stair_connections"]
+        ]
+        report = self.engine.check(targets)
+
+        self.assertFalse(report.soft_locked)
+        self.assertEqual(report.closure_state, self.engine.all_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.maze_grid import MazeBuilder, WallGrid
+
+
+class SetMazeBuilder:
+    """The original tuple-set builder, kept as the reference implementation."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.walls = {(x, y) for y in range(height) for x in range(width)}
+
+    def carve_cell(self, x, y):
+        if 1 <= x < self.width - 1 and 1 <= y < self.height - 1:
+            self.walls.discard((x, y))
+
+    def carve_rect(self, x1, y1, x2, y2):
+        left, right = sorted((x1, x2))
+        top, bottom = sorted((y1, y2))
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                self.carve_cell(x, y)
+
+    def carve_path(self, start, end, half_width=1):
+        sx, sy = start
+        ex, ey = end
+        left, right = sorted((sx, ex))
+        for x in range(left, right + 1):
+            for dy in range(-half_width, half_width + 1):
+                self.carve_cell(x, sy + dy)
+        top, bottom = sorted((sy, ey))
+        for y in range(top, bottom + 1):
+            for dx in range(-half_width, half_width + 1):
+                self.carve_cell(ex + dx, y)
+
+    def reinforce_perimeter(self):
+        for x in range(self.width):
+            self.walls.add((x, 0))
+            self.walls.add((x, self.height - 1))
+        for y in range(self.height):
+            self.walls.add((0, y))
+            self.walls.add((self.width - 1, y))
+
+
+class WallGridTest(unittest.TestCase):
+    def test_behaves_like_a_set_of_cells(self):
+        grid = WallGrid(4, 3)
+        self.assertEqual(len(grid), 12)
+        self.assertIn((3, 2), grid)
+        self.assertNotIn((4, 0), grid)
+        self.assertNotIn((-1, 0), grid)
+
+        grid.discard((1, 1))
+        grid.discard((1, 1))
+        grid.discard((9, 9))
+        self.assertEqual(len(grid), 11)
+        self.assertNotIn((1, 1), grid)
+
+        grid.add((1, 1))
+        self.assertEqual(set(grid), {(x, y) for y in range(3) for x in range(4)})
+        with self.assertRaises(IndexError):
+            grid.add((4, 0))
+
+    def test_iterates_in_row_major_order(self):
+        grid = WallGrid(5, 5, filled=False)
+        grid.update([(4, 0), (0, 3), (2, 0), (1, 3)])
+
+        self.assertEqual(list(grid), [(2, 0), (4, 0), (0, 3), (1, 3)])
+        self.assertEqual(list(grid), sorted(grid, key=lambda p: (p[1], p[0])))
+
+    def test_set_algebra_returns_plain_sets(self):
+        grid = WallGrid(2, 1)
+        union = grid | {(5, 5)}
+
+        self.assertIsInstance(union, set)
+        self.assertEqual(union, {(0, 0), (1, 0), (5, 5)})
+
+    def test_slice_fills_keep_the_wall_count(self):
+        grid = WallGrid(6, 6)
+        grid.fill_rect(1, 1, 4, 2, 0)
+        grid.fill_column(2, 0, 5, 0)
+        grid.fill_span(5, 0, 5, 1)
+
+        self.assertEqual(len(grid), sum(grid.cells))
+
+
+class MazeBuilderTest(unittest.TestCase):
+    def test_carving_matches_the_tuple_set_builder(self):
+        rng = random.Random(1234)
+        for width, height in ((12, 9), (40, 40), (73, 51)):
+            with self.subTest(size=(width, height)):
+                grid_builder = MazeBuilder(width, height)
+                set_builder = SetMazeBuilder(width, height)
+                for _ in range(60):
+                    a = (rng.randrange(-2, width + 2), rng.randrange(-2, height + 2))
+                    b = (rng.randrange(-2, width + 2), rng.randrange(-2, height + 2))
+                    if rng.random() < 0.5:
+                        grid_builder.carve_rect(*a, *b)
+                        set_builder.carve_rect(*a, *b)
+                    else:
+                        half_width = rng.randrange(0, 3)
+                        grid_builder.carve_path(a, b, half_width)
+                        set_builder.carve_path(a, b, half_width)
+                grid_builder.walls.add((width // 2, height // 2))
+                set_builder.walls.add((width // 2, height // 2))
+                grid_builder.reinforce_perimeter()
+                set_builder.reinforce_perimeter()
+
+                self.assertEqual(set(grid_builder.walls), set_builder.walls)
+                self.assertEqual(len(grid_builder.walls), len(set_builder.walls))
+
+
+if __name__ == "__main__":
+    unittest.main()
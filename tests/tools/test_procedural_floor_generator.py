@@ -0,0 +1,107 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import entity_position, unrewarded_dead_end_branches, validate_model
+from tools.floor_json import FloorJsonReader
+from tools.floor_reachability import ReachabilityIndex, walkable_mask_from_walls
+from tools.procedural_floor_generator import ProceduralFloorSpec, build_procedural_model, main
+
+
+def walls_of(model):
+    return model["tile_layers"]["wall"].cells
+
+
+class ProceduralFloorTest(unittest.TestCase):
+    def test_same_seed_and_floor_give_the_same_floor(self):
+        first = build_procedural_model(ProceduralFloorSpec(7, floor_number=5))
+        second = build_procedural_model(ProceduralFloorSpec(7, floor_number=5))
+
+        self.assertEqual(walls_of(first).cells, walls_of(second).cells)
+        self.assertEqual(first["entities"], second["entities"])
+        self.assertEqual(first["floor_metadata"], second["floor_metadata"])
+        for other in (ProceduralFloorSpec(8, floor_number=5), ProceduralFloorSpec(7, floor_number=6)):
+            with self.subTest(other=other):
+                self.assertNotEqual(walls_of(build_procedural_model(other)).cells, walls_of(first).cells)
+
+    def test_floors_pass_validation_with_rewarded_dead_ends(self):
+        gates = branches = 0
+        for seed in range(40):
+            with self.subTest(seed=seed):
+                model = build_procedural_model(ProceduralFloorSpec(seed))
+                validate_model(model, 60, 60, rewarded_dead_ends=True)
+                mask = walkable_mask_from_walls(walls_of(model), 60, 60)
+                walkable = {(index % 60, index // 60) for index, flag in enumerate(mask) if flag}
+                self.assertEqual(unrewarded_dead_end_branches(model, walkable, 60, 60), [])
+                gates += len(model["entities"]["puzzle_gates"])
+                branches += len(model["entities"]["treasure_boxes"])
+
+        # Across a batch of seeds every feature shows up regularly.
+        self.assertGreater(gates, 20)
+        self.assertGreater(branches, 200)
+
+    def test_puzzle_gates_close_off_optional_rooms_only(self):
+        model = next(
+            model
+            for model in (build_procedural_model(ProceduralFloorSpec(seed)) for seed in range(20))
+            if model["entities"]["puzzle_gates"]
+        )
+        entities = model["entities"]
+        mask = walkable_mask_from_walls(walls_of(model), 60, 60)
+        for gate in entities["puzzle_gates"]:
+            x, y = entity_position(gate)
+            mask[y * 60 + x] = 0
+        start = entity_position(entities["stair_connections"][0])
+        closed = ReachabilityIndex(mask, 60, 60, start)
+
+        for stair in entities["stair_connections"]:
+            self.assertTrue(closed.is_reachable(entity_position(stair)))
+        for switch in entities["puzzle_switches"]:
+            self.assertTrue(closed.is_reachable(entity_position(switch)))
+        self.assertTrue(
+            any(not closed.is_reachable(entity_position(box)) for box in entities["treasure_boxes"]),
+            "a gated room should hold treasure",
+        )
+
+    def test_stair_pairs_link_consecutive_floors(self):
+        lower = build_procedural_model(ProceduralFloorSpec(3, floor_number=4))["entities"]["stair_connections"]
+        upper = build_procedural_model(ProceduralFloorSpec(3, floor_number=5))["entities"]["stair_connections"]
+
+        self.assertEqual([stair["direction"] for stair in lower], ["down", "up"])
+        self.assertEqual((lower[0]["id"], lower[0]["destination_stair_id"]), ("4F_3F", "3F_4F"))
+        self.assertEqual(lower[1]["destination_stair_id"], upper[0]["id"])
+        self.assertEqual(upper[0]["destination_stair_id"], lower[1]["id"])
+        first = build_procedural_model(ProceduralFloorSpec(3, floor_number=1))["entities"]["stair_connections"]
+        self.assertEqual(first[0]["destination_stair_id"], "GF_1F")
+
+    def test_rejects_unsupported_specs(self):
+        with self.assertRaisesRegex(ValueError, "Tower floors start at floor 1"):
+            ProceduralFloorSpec(1, floor_number=0)
+        with self.assertRaisesRegex(ValueError, "fewer than 2x2 rooms"):
+            ProceduralFloorSpec(1, size=20)
+
+    def test_main_writes_consecutive_floors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            argv = ["procedural_floor_generator.py", "--seed", "9", "--count", "2", "--output-dir", tmpdir]
+            stdout = io.StringIO()
+            with patch.object(sys, "argv", argv), redirect_stdout(stdout):
+                result = main()
+
+            self.assertEqual(result, 0)
+            self.assertIn("Generated 2 tower floors for seed 9", stdout.getvalue())
+            self.assertEqual(sorted(path.name for path in Path(tmpdir).iterdir()), ["Tower9_4F.json", "Tower9_5F.json"])
+            reader = FloorJsonReader(Path(tmpdir) / "Tower9_5F.json")
+            self.assertEqual(reader.floor_metadata()["floor_number"], 5)
+            self.assertEqual(sum(1 for _ in reader.layer_cells("ground")), 60 * 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
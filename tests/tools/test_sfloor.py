@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor0_maze_generator import GRID_HEIGHT, GRID_WIDTH, build_floor_model
+from tools.floor1_maze_generator import build_floor1_model
+from tools.floor_json import CellLayer
+from tools.maze_grid import MazeBuilder
+from tools.sfloor import BIT_PLANE, BYTE_PLANE, SFloor, write_sfloor
+
+
+def row_major(tiles):
+    return sorted(tiles, key=lambda tile: (tile["y"], tile["x"]))
+
+
+class SFloorRoundTripTest(unittest.TestCase):
+    def test_generated_floors_round_trip(self):
+        for model, size in ((build_floor_model(), (GRID_WIDTH, GRID_HEIGHT)), (build_floor1_model(), (None, None))):
+            with self.subTest(floor=model["floor_metadata"]["floor_name"]), tempfile.TemporaryDirectory() as tmpdir:
+                path = Path(tmpdir) / "Floor.sfloor"
+                write_sfloor(model, path, *size)
+                with SFloor(path) as floor:
+                    loaded = floor.to_model()
+                    walls = {(tile["x"], tile["y"]) for tile in model["tile_layers"]["wall"]}
+                    for y in range(floor.height):
+                        for x in range(floor.width):
+                            self.assertEqual(floor.is_wall((x, y)), (x, y) in walls)
+                    self.assertTrue(floor.is_wall((-1, 0)))
+                    self.assertEqual(floor.layers["wall"].plane_bits, BIT_PLANE)
+
+                self.assertEqual(loaded["floor_metadata"], model["floor_metadata"])
+                self.assertEqual(loaded["entities"], model["entities"])
+                for name, tiles in model["tile_layers"].items():
+                    self.assertEqual(loaded["tile_layers"][name], row_major(tiles))
+
+    def test_mixed_layers_use_a_byte_plane(self):
+        model = {
+            "floor_metadata": {"floor_name": "Tiny"},
+            "tile_layers": {
+                "ground": [{"x": x, "y": y, "tile": "grass"} for y in range(3) for x in range(4)],
+                "stair": [{"x": 1, "y": 1, "tile": "up"}, {"x": 3, "y": 2, "tile": "down", "alt": 2}],
+            },
+            "entities": {"enemy_spawns": [{"id": "E", "position": {"x": 2, "y": 0}}], "npc_spawns": []},
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Tiny.sfloor"
+            write_sfloor(model, path)
+            with SFloor(path) as floor:
+                stairs = floor.layers["stair"]
+                self.assertEqual(stairs.plane_bits, BYTE_PLANE)
+                self.assertEqual(stairs.tile_at((3, 2)), ("down", 2))
+                self.assertIsNone(stairs.tile_at((0, 0)))
+                self.assertEqual(list(floor.entities("npc_spawns")), [])
+                self.assertEqual([entity["id"] for entity in floor.entities()], ["E"])
+
+    def test_wall_grid_layers_are_packed_directly(self):
+        builder = MazeBuilder(64, 64)
+        builder.carve_rect(1, 1, 30, 30)
+        model = {
+            "floor_metadata": {},
+            "tile_layers": {"ground": CellLayer("g", MazeBuilder(64, 64).walls), "wall": CellLayer("w", builder.walls)},
+            "entities": {},
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Grid.sfloor"
+            write_sfloor(model, path)
+            with SFloor(path) as floor:
+                self.assertEqual((floor.width, floor.height), (64, 64))
+                self.assertFalse(floor.is_wall((30, 30)))
+                self.assertTrue(floor.is_wall((31, 30)))
+
+    def test_rejects_foreign_files_and_conflicting_tiles(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor.sfloor"
+            path.write_bytes(b"JUNK" + bytes(40))
+            with self.assertRaisesRegex(ValueError, "is not a .sfloor file"):
+                SFloor(path)
+
+            model = {
+                "floor_metadata": {},
+                "tile_layers": {"stair": [{"x": 0, "y": 0, "tile": "up"}, {"x": 0, "y": 0, "tile": "down"}]},
+                "entities": {},
+            }
+            with self.assertRaisesRegex(ValueError, r"stair layer holds two tiles at \(0, 0\)"):
+                write_sfloor(model, path, 2, 2)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.floor1_maze_generator import validate_model
+from tools.floor_json import encode_bitset, encode_runs, load_floor_json
+from tools.maze_grid import WallGrid
+from tools.synthetic_floor_generator import (
+    SyntheticFloorSpec,
+    build_synthetic_layout,
+    build_synthetic_model,
+    main,
+)
+
+
+class SyntheticFloorSpecTest(unittest.TestCase):
+    def test_spacing_corridors_and_npcs_scale_with_size(self):
+        small = SyntheticFloorSpec.for_size(256)
+        large = SyntheticFloorSpec.for_size(4096)
+
+        self.assertEqual((small.lattice_cell, small.corridor_half_width, small.npc_count), (16, 0, 1))
+        self.assertEqual((large.lattice_cell, large.corridor_half_width, large.npc_count), (32, 2, 8))
+
+    def test_sizes_outside_the_supported_range_are_rejected(self):
+        for size in (32, 8192):
+            with self.subTest(size=size), self.assertRaisesRegex(ValueError, "Synthetic floor size must be 64-4096"):
+                SyntheticFloorSpec.for_size(size)
+
+
+class SyntheticFloorModelTest(unittest.TestCase):
+    def test_models_are_valid_and_entity_counts_grow_with_size(self):
+        counts = []
+        for size in (64, 256, 512):
+            with self.subTest(size=size):
+                model = build_synthetic_model(SyntheticFloorSpec.for_size(size, seed=5))
+                validate_model(model, size, size)
+                counts.append(len(model["entities"]["enemy_spawns"]) + len(model["entities"]["treasure_boxes"]))
+
+        self.assertEqual(counts, sorted(counts))
+        self.assertLess(counts[0] * 4, counts[-1])
+
+    def test_same_seed_gives_the_same_floor(self):
+        spec = SyntheticFloorSpec.for_size(128, seed=11)
+        first = build_synthetic_model(spec)
+        second = build_synthetic_model(spec)
+        reseeded = build_synthetic_model(SyntheticFloorSpec.for_size(128, seed=12))
+
+        self.assertEqual(first["tile_layers"]["wall"].cells, second["tile_layers"]["wall"].cells)
+        self.assertEqual(first["entities"], second["entities"])
+        self.assertNotEqual(first["tile_layers"]["wall"].cells, reseeded["tile_layers"]["wall"].cells)
+        self.assertEqual(build_synthetic_layout(spec).walls, first["tile_layers"]["wall"].cells)
+
+    def test_wall_grid_layers_encode_like_cell_lists(self):
+        walls = build_synthetic_layout(SyntheticFloorSpec.for_size(96, seed=2)).walls
+        cells = list(walls)
+
+        self.assertEqual(encode_runs(walls), encode_runs(cells))
+        self.assertEqual(encode_bitset(walls), encode_bitset(cells))
+        self.assertEqual(encode_bitset(WallGrid(4, 4, filled=False))["size"], [0, 0])
+
+    def test_main_writes_a_loadable_v2_floor(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "FloorSynthetic.json"
+            argv = ["synthetic_floor_generator.py", "--size", "128", "--schema-version", "2.0", "--output", str(output)]
+            stdout = io.StringIO()
+            with patch.object(sys, "argv", argv), redirect_stdout(stdout):
+                result = main()
+
+            self.assertEqual(result, 0)
+            self.assertIn("Generated synthetic floor: 128x128", stdout.getvalue())
+            model = load_floor_json(output)
+            self.assertEqual(len(model["tile_layers"]["ground"]), 128 * 128)
+            validate_model(model, 128, 128)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.tres_resource import (
+    Constructor,
+    TresError,
+    TypedArray,
+    Vector2i,
+    format_value,
+    load_tres,
+    parse_tres,
+    update_tres_files,
+)
+
+FLOOR_DEFINITIONS = sorted((ROOT / "resources" / "floors").glob("*.tres"))
+
+SOURCE = "\r\n".join(
+    [
+        '[gd_resource type="Resource" script_class="FloorDefinition" load_steps=2 format=3 uid="uid://abc"]',
+        "",
+        '[ext_resource type="Script" path="res://scripts/game/FloorDefinition.cs" id="1_1"]',
+        "",
+        "[resource]",
+        'script = ExtResource("1_1")',
+        'FloorName = "Test \\"Floor\\""',
+        "FloorNumber = 4",
+        "PlayerStartPosition = Vector2i(3, 4)",
+        "StairsUp = Array[Vector2i]([Vector2i(1, 2), Vector2i(5, 6)])",
+        "Metadata = {",
+        '"depth": 0.5,',
+        '"tags": ["a", null, true]',
+        "}",
+        'FloorDescription = "Two\\nlines"',
+        "",
+    ]
+)
+
+
+class ParseTresTest(unittest.TestCase):
+    def test_properties_parse_to_typed_values(self):
+        document = parse_tres(SOURCE)
+        header = document.sections[0]
+
+        self.assertEqual(header.kind, "gd_resource")
+        self.assertEqual(header.attributes["load_steps"], 2)
+        self.assertEqual(document.section("ext_resource").attributes["id"], "1_1")
+        self.assertEqual(document.get("script"), Constructor("ExtResource", ("1_1",)))
+        self.assertEqual(document.get("FloorName"), 'Test "Floor"')
+        self.assertEqual(document.get("PlayerStartPosition"), Vector2i(3, 4))
+        stairs = document.get("StairsUp")
+        self.assertEqual(stairs, [Vector2i(1, 2), Vector2i(5, 6)])
+        self.assertEqual(stairs.element_type, "Vector2i")
+        self.assertEqual(document.get("Metadata"), {"depth": 0.5, "tags": ["a", None, True]})
+        self.assertEqual(document.get("FloorDescription"), "Two\nlines")
+        self.assertIsNone(document.get("StairsDown"))
+
+    def test_repository_resources_round_trip_unchanged(self):
+        for path in FLOOR_DEFINITIONS + [ROOT / "scenes" / "game" / "Game.tscn"]:
+            with self.subTest(path=path.name):
+                document = load_tres(path)
+                self.assertEqual(document.dumps(), path.read_text(encoding="utf-8"))
+                self.assertFalse(document.changed)
+
+    def test_script_typed_arrays_keep_their_type_text(self):
+        document = parse_tres('[node name="A"]\nFloors = Array[ExtResource("4_x")]([ExtResource("1_a")])\n')
+
+        floors = document.get("Floors", section="node")
+        self.assertEqual(floors.element_type, 'ExtResource("4_x")')
+        self.assertEqual(format_value(floors), 'Array[ExtResource("4_x")]([ExtResource("1_a")])')
+
+    def test_rejects_malformed_text(self):
+        with self.assertRaisesRegex(TresError, "line 2"):
+            parse_tres("[resource]\nStairsUp = Vector2i(1, 2]\n")
+        with self.assertRaisesRegex(TresError, "before any section"):
+            parse_tres("FloorNumber = 1\n")
+        with self.assertRaisesRegex(TresError, "set twice"):
+            parse_tres("[resource]\nFloorNumber = 1\nFloorNumber = 2\n")
+        with self.assertRaisesRegex(TresError, r"has no \[resource\] section"):
+            parse_tres('[gd_resource type="Resource"]\n').section()
+
+
+class EditTresTest(unittest.TestCase):
+    def test_only_changed_values_are_rewritten(self):
+        document = parse_tres(SOURCE)
+
+        self.assertFalse(document.set("PlayerStartPosition", Vector2i(3, 4)))
+        self.assertFalse(document.set("StairsUp", [Vector2i(1, 2), Vector2i(5, 6)]))
+        self.assertFalse(document.changed)
+        self.assertTrue(document.set("StairsUp", [Vector2i(7, 8)]))
+        self.assertTrue(document.set("PlayerStartPosition", Vector2i(9, 10)))
+
+        expected = SOURCE.replace("Vector2i(3, 4)", "Vector2i(9, 10)").replace(
+            "[Vector2i(1, 2), Vector2i(5, 6)]", "[Vector2i(7, 8)]"
+        )
+        self.assertEqual(document.dumps(), expected)
+        self.assertEqual(document.get("StairsUp").element_type, "Vector2i")
+
+    def test_missing_properties_are_appended_to_their_section(self):
+        document = parse_tres("[resource]\nFloorNumber = 1\n\n[sub_resource]\nvalue = 2\n")
+
+        document.set("StairsDown", TypedArray("Vector2i", [Vector2i(1, 1)]))
+        document.set("FloorName", "Top")
+        document.set("StairsDown", TypedArray("Vector2i", [Vector2i(2, 2)]))
+
+        self.assertEqual(
+            document.dumps(),
+            '[resource]\nFloorNumber = 1\nStairsDown = Array[Vector2i]([Vector2i(2, 2)])\nFloorName = "Top"\n'
+            "\n[sub_resource]\nvalue = 2\n",
+        )
+        self.assertEqual(document.get("StairsDown"), [Vector2i(2, 2)])
+
+    def test_batch_updates_every_floor_definition(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [Path(shutil.copy(path, tmpdir)) for path in FLOOR_DEFINITIONS]
+            originals = {path: path.read_bytes() for path in paths}
+            # Values may be derived from the document being updated.
+            updates = dict.fromkeys(
+                paths, lambda document: {"PlayerStartPosition": document.get("PlayerStartPosition"), "StairsUp": []}
+            )
+
+            changed = update_tres_files(updates, required=("PlayerStartPosition",), omit_empty=True)
+
+            # Only files that listed an up stair change; the rest are not rewritten.
+            self.assertEqual(
+                sorted(path.name for path in changed), ["Floor1F.tres", "Floor2F.tres", "FloorGF.tres"]
+            )
+            for path in paths:
+                text = path.read_text(encoding="utf-8")
+                if path in changed:
+                    self.assertIn("StairsUp = Array[Vector2i]([])", text)
+                    self.assertEqual(len(text.splitlines()), len(originals[path].decode("utf-8").splitlines()))
+                else:
+                    self.assertEqual(path.read_bytes(), originals[path])
+                    self.assertNotIn("StairsUp =", text)
+
+    def test_batch_writes_nothing_when_a_file_lacks_a_required_property(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            good = Path(tmpdir) / "Good.tres"
+            bad = Path(tmpdir) / "Bad.tres"
+            good.write_text("[resource]\nPlayerStartPosition = Vector2i(1, 1)\n", encoding="utf-8")
+            bad.write_text("[resource]\nFloorNumber = 1\n", encoding="utf-8")
+
+            with self.assertRaisesRegex(TresError, "Bad.tres: missing required properties: PlayerStartPosition"):
+                update_tres_files(
+                    {good: {"PlayerStartPosition": Vector2i(2, 2)}, bad: {"PlayerStartPosition": Vector2i(2, 2)}},
+                    required=("PlayerStartPosition",),
+                )
+
+            self.assertIn("Vector2i(1, 1)", good.read_text(encoding="utf-8"))
+
+    def test_crlf_line_endings_survive_a_save(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Floor.tres"
+            path.write_bytes(SOURCE.encode("utf-8"))
+
+            self.assertEqual(update_tres_files({path: {"FloorNumber": 5}}), [path])
+
+            self.assertEqual(path.read_bytes(), SOURCE.replace("FloorNumber = 4", "FloorNumber = 5").encode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import io
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from floor_test_helpers import run_floor1_generator
+from tools import floor0_maze_generator
+from tools.floor_json import SCHEMA_V1, SCHEMA_V2, write_floor_json
+from tools.validate_world import main
+
+
+def stair(stair_id, x, y, direction, target_floor, destination):
+    return {
+        "id": stair_id,
+        "position": {"x": x, "y": y},
+        "direction": direction,
+        "target_floor": target_floor,
+        "destination_stair_id": destination,
+    }
+
+
+def floor_model(number, stairs):
+    """An 8x5 room with a wall border."""
+    ground = [{"x": x, "y": y, "tile": "generic"} for y in range(5) for x in range(8)]
+    walls = [tile for tile in ground if tile["x"] in (0, 7) or tile["y"] in (0, 4)]
+    return {
+        "schema_version": SCHEMA_V1,
+        "floor_metadata": {"floor_name": f"Floor {number}", "floor_number": number, "player_start": {"x": 3, "y": 2}},
+        "tile_layers": {"ground": ground, "wall": walls, "stair": []},
+        "entities": {"enemy_spawns": [], "stair_connections": stairs},
+    }
+
+
+def floor_definition(number, up=(), up_destinations=(), down=(), down_destinations=()):
+    def array(cells):
+        return "Array[Vector2i]([" + ", ".join(f"Vector2i({x}, {y})" for x, y in cells) + "])"
+
+    return (
+        '[gd_resource type="Resource" script_class="FloorDefinition" format=3]\n\n'
+        "[resource]\n"
+        f"FloorNumber = {number}\n"
+        f"StairsUp = {array(up)}\n"
+        f"StairsDown = {array(down)}\n"
+        f"StairsUpDestinations = {array(up_destinations)}\n"
+        f"StairsDownDestinations = {array(down_destinations)}\n"
+    )
+
+
+class WorldTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.tmp = Path(self.tmpdir.name)
+
+    def write_world(self, floors, definitions, schema_version=SCHEMA_V1):
+        for number, stairs in floors.items():
+            write_floor_json(floor_model(number, stairs), self.tmp / f"Floor{number}F.json", schema_version)
+        for number, text in definitions.items():
+            (self.tmp / f"Floor{number}F.tres").write_text(text, encoding="utf-8")
+
+    def run_main(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            status = main(["--floors-dir", str(self.tmp), "--defs-dir", str(self.tmp)])
+        return status, stdout.getvalue()
+
+    def test_authored_world_is_consistent(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            status = main(
+                ["--floors-dir", str(ROOT / "scenes/game/floors"), "--defs-dir", str(ROOT / "resources/floors")]
+            )
+
+        self.assertEqual(status, 0, stdout.getvalue())
+        self.assertEqual(stdout.getvalue(), "World OK: 4 floors, 8 stairs\n")
+
+    def test_generator_sidecars_are_not_read_as_floors(self):
+        run_floor1_generator(self.tmp, "--sidecars", "regions,paths,chokes")
+        shutil.copy(ROOT / "scenes/game/floors/FloorGF.json", self.tmp)
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            status = main(["--floors-dir", str(self.tmp), "--defs-dir", str(ROOT / "resources/floors")])
+
+        self.assertEqual(status, 0, stdout.getvalue())
+        self.assertEqual(stdout.getvalue(), "World OK: 4 floors, 8 stairs\n")
+
+    def test_regenerated_floors_and_definitions_stay_consistent(self):
+        definitions = sorted((ROOT / "resources/floors").glob("Floor*.tres"))
+        for path in definitions:
+            shutil.copy(path, self.tmp)
+        argv = ["floor0_maze_generator.py", "--no-cache", "--output", str(self.tmp / "FloorGF.json")]
+        argv += ["--floor-def", str(self.tmp / "FloorGF.tres")]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            self.assertEqual(floor0_maze_generator.main(), 0)
+        run_floor1_generator(self.tmp, defs_dir=self.tmp)
+
+        self.assertEqual(self.run_main(), (0, "World OK: 4 floors, 8 stairs\n"))
+        for path in definitions:
+            self.assertEqual((self.tmp / path.name).read_bytes(), path.read_bytes(), path.name)
+
+    def test_linked_floors_pass_in_both_schemas(self):
+        for schema_version in (SCHEMA_V1, SCHEMA_V2):
+            with self.subTest(schema_version=schema_version):
+                self.write_world(
+                    {
+                        0: [stair("A_up", 5, 2, "up", 1, "B_down")],
+                        1: [stair("B_down", 2, 2, "down", 0, "A_up")],
+                    },
+                    {
+                        0: floor_definition(0, up=[(5, 2)], up_destinations=[(4, 2)]),
+                        1: floor_definition(1, down=[(2, 2)], down_destinations=[(3, 2)]),
+                    },
+                    schema_version,
+                )
+                self.assertEqual(self.run_main(), (0, "World OK: 2 floors, 2 stairs\n"))
+
+    def test_reports_every_broken_link(self):
+        self.write_world(
+            {
+                0: [
+                    stair("A_up", 5, 2, "up", 1, "B_down"),
+                    stair("A_lost", 1, 1, "up", 1, "B_down"),
+                ],
+                1: [
+                    stair("B_down", 2, 2, "down", 0, "A_up"),
+                    stair("B_void", 5, 3, "up", 4, "C"),
+                    stair("B_ghost", 6, 1, "down", 0, "Nowhere"),
+                ],
+            },
+            {
+                # A_up's landing sits in the border wall; B_down is listed at the wrong cell,
+                # so arriving through it falls back to the stair cell itself.
+                0: floor_definition(0, up=[(5, 2), (1, 1)], up_destinations=[(7, 2)]),
+                1: floor_definition(1, up=[(5, 3)], down=[(2, 1), (6, 1)]),
+            },
+        )
+
+        status, output = self.run_main()
+
+        self.assertEqual(status, 1)
+        errors = output.splitlines()
+        self.assertEqual(errors[-1], f"{len(errors) - 1} stair link error(s) across 2 floors")
+        for expected in (
+            "Floor1F.tres: StairsDown [(2, 1), (6, 1)] does not match the down stairs [(2, 2), (6, 1)]",
+            "Stair A_lost -> B_down is one-way: B_down points to 'A_up' on floor 0",
+            "Stair B_ghost points to 'Nowhere', not a stair on floor 0",
+            "Stair B_void targets missing floor 4",
+            "Stair B_down lands on (7, 2) on floor 0, which is not walkable",
+            "Stair A_up lands on the stair at (2, 2) on floor 1",
+        ):
+            self.assertIn(f"Error: {expected}", errors)
+
+    def test_non_floor_files_are_reported(self):
+        self.write_world({0: []}, {0: floor_definition(0)})
+        (self.tmp / "FloorNotes.json").write_text('{\n  "notes": []\n}\n', encoding="utf-8")
+
+        status, output = self.run_main()
+
+        self.assertEqual(status, 1)
+        self.assertEqual(
+            output.splitlines(),
+            [
+                f"Error: {self.tmp / 'FloorNotes.json'} is not a floor JSON: it needs floor_metadata and entities",
+                "1 stair link error(s) across 1 floors",
+            ],
+        )
+
+    def test_tile_layers_are_never_parsed(self):
+        self.write_world(
+            {
+                0: [stair("A_up", 5, 2, "up", 1, "B_down")],
+                1: [stair("B_down", 2, 2, "down", 0, "A_up")],
+            },
+            {
+                0: floor_definition(0, up=[(5, 2)], up_destinations=[(0, 2)]),
+                1: floor_definition(1, down=[(2, 2)], down_destinations=[(3, 2)]),
+            },
+        )
+
+        with patch("json.loads", side_effect=AssertionError("full parse")):
+            status, output = self.run_main()
+
+        self.assertEqual(status, 1)
+        self.assertIn("Error: Stair B_down lands on (0, 2) on floor 0, which is not walkable", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,168 +7,75 @@
 from __future__ import annotations
 
 import argparse
-import json
-import re
 import sys
-from collections import deque
 from pathlib import Path
 
+try:
+    from tools.floor_choke_points import choke_points_path, write_choke_points
+    from tools.floor_chunks import chunk_directory, write_floor_chunks
+    from tools.floor_gen_cache import DEFAULT_CACHE_PATH, GenerationCache, generator_key
+    from tools.floor_flow_fields import flow_field_path, write_flow_fields
+    from tools.floor_json import SCHEMA_V1, SCHEMA_VERSIONS, write_floor_json
+    from tools.floor_path_graph import DEFAULT_CLUSTER_SIZE, path_graph_from_model, path_graph_path, write_path_graph
+    from tools.floor_profiler import add_profile_arguments, profile_phase, profiled, run_profiled
+    from tools.floor_reachability import ReachabilityIndex, walkable_mask_from_tiles
+    from tools.floor_regions import region_graph_from_model, region_graph_path, write_region_graph
+    from tools.floor_sidecars import CHOKES, FLOW, PATHS, REGIONS, VISIBILITY, add_sidecar_argument
+    from tools.floor_spec import floor_layout, load_floor_spec, stair_tiles
+    from tools.floor_visibility import (
+        DEFAULT_VISIBILITY_RADIUS,
+        MAX_VISIBILITY_RADIUS,
+        visibility_from_model,
+        visibility_path,
+        write_visibility,
+    )
+    from tools.maze_grid import MazeBuilder
+    from tools.sfloor import sfloor_path, write_sfloor
+    from tools.tres_resource import TypedArray, Vector2i, load_tres
+except ModuleNotFoundError:  # Direct ``python tools/floor0_maze_generator.py`` invocation.
+    from floor_choke_points import choke_points_path, write_choke_points
+    from floor_chunks import chunk_directory, write_floor_chunks
+    from floor_gen_cache import DEFAULT_CACHE_PATH, GenerationCache, generator_key
+    from floor_flow_fields import flow_field_path, write_flow_fields
+    from floor_json import SCHEMA_V1, SCHEMA_VERSIONS, write_floor_json
+    from floor_path_graph import DEFAULT_CLUSTER_SIZE, path_graph_from_model, path_graph_path, write_path_graph
+    from floor_profiler import add_profile_arguments, profile_phase, profiled, run_profiled
+    from floor_reachability import ReachabilityIndex, walkable_mask_from_tiles
+    from floor_regions import region_graph_from_model, region_graph_path, write_region_graph
+    from floor_sidecars import CHOKES, FLOW, PATHS, REGIONS, VISIBILITY, add_sidecar_argument
+    from floor_spec import floor_layout, load_floor_spec, stair_tiles
+    from floor_visibility import (
+        DEFAULT_VISIBILITY_RADIUS,
+        MAX_VISIBILITY_RADIUS,
+        visibility_from_model,
+        visibility_path,
+        write_visibility,
+    )
+    from maze_grid import MazeBuilder
+    from sfloor import sfloor_path, write_sfloor
+    from tres_resource import TypedArray, Vector2i, load_tres
+
+
+FLOOR0_SPEC = load_floor_spec("floor0")
 
-FLOOR_WIDTH = 100
-FLOOR_HEIGHT = 100
+FLOOR_WIDTH = FLOOR0_SPEC.width
+FLOOR_HEIGHT = FLOOR0_SPEC.height
 
 # The GridMap defaults to 160x160. We emit wall tiles for the full grid
 # so the player cannot walk into void cells beyond the maze content.
-GRID_WIDTH = 160
-GRID_HEIGHT = 160
-
-PLAYER_START = (8, 50)
-SHOPKEEPER_POS = (12, 46)
-HEALER_POS = (12, 54)
-FIRST_GOBLIN_POS = (24, 45)
-STAIR_POS = (82, 68)
+GRID_WIDTH, GRID_HEIGHT = FLOOR0_SPEC.grid
+
+PLAYER_START = FLOOR0_SPEC.player_start
 # Spawn position on this floor (GF) when player returns from floor 1
-RETURN_SPAWN_FROM_FLOOR_1 = (17, 13)
-
-MAIN_LOOP_POINTS = [
-    (8, 50),
-    (18, 50),
-    (18, 18),
-    (56, 18),
-    (76, 30),
-    (82, 68),
-    (52, 82),
-    (18, 72),
-    (8, 50),
-]
-
-TREASURE_BOXES = {
-    "TreasureBox_GF_EntranceCache": ((15, 50), 35, {"health_potion": 1}),
-    "TreasureBox_GF_NorthwestCache": ((30, 8), 60, {"mana_potion": 1}),
-    "TreasureBox_GF_NorthLoopCache": ((49, 8), 80, {"strength_tonic": 1}),
-    "TreasureBox_GF_EastBranchCache": ((91, 30), 110, {"greater_health_potion": 1}),
-    "TreasureBox_GF_StairDistrictCache": ((94, 68), 75, {"iron_skin": 1}),
-    "TreasureBox_GF_SouthDeepCache": ((52, 94), 0, {"iron_sword": 1}),
-    "TreasureBox_GF_SouthwestCache": ((7, 72), 50, {"antidote": 2}),
-    "TreasureBox_GF_SoutheastCache": ((80, 82), 0, {"iron_shield": 1}),
-}
-
-
-class MazeBuilder:
-    def __init__(self, width: int = FLOOR_WIDTH, height: int = FLOOR_HEIGHT) -> None:
-        self.width = width
-        self.height = height
-        self.walls = {(x, y) for y in range(height) for x in range(width)}
-
-    def carve_cell(self, x: int, y: int) -> None:
-        if 1 <= x < self.width - 1 and 1 <= y < self.height - 1:
-            self.walls.discard((x, y))
-
-    def carve_rect(self, x1: int, y1: int, x2: int, y2: int) -> None:
-        left, right = sorted((x1, x2))
-        top, bottom = sorted((y1, y2))
-        for y in range(top, bottom + 1):
-            for x in range(left, right + 1):
-                self.carve_cell(x, y)
-
-    def carve_h_corridor(self, x1: int, x2: int, y: int, half_width: int = 1) -> None:
-        left, right = sorted((x1, x2))
-        for x in range(left, right + 1):
-            for dy in range(-half_width, half_width + 1):
-                self.carve_cell(x, y + dy)
-
-    def carve_v_corridor(self, y1: int, y2: int, x: int, half_width: int = 1) -> None:
-        top, bottom = sorted((y1, y2))
-        for y in range(top, bottom + 1):
-            for dx in range(-half_width, half_width + 1):
-                self.carve_cell(x + dx, y)
-
-    def carve_path(self, start: tuple[int, int], end: tuple[int, int], half_width: int = 1) -> None:
-        sx, sy = start
-        ex, ey = end
-        self.carve_h_corridor(sx, ex, sy, half_width)
-        self.carve_v_corridor(sy, ey, ex, half_width)
-
-    def carve_loop(self, points: list[tuple[int, int]], half_width: int = 1) -> None:
-        for start, end in zip(points, points[1:]):
-            self.carve_path(start, end, half_width)
-
-    def build(self) -> set[tuple[int, int]]:
-        self.carve_loop(MAIN_LOOP_POINTS, half_width=2)
-
-        self.carve_rect(5, 42, 17, 58)    # entrance plaza
-        self.carve_rect(9, 43, 15, 48)    # shop room
-        self.carve_rect(9, 52, 15, 57)    # healer room
-        self.carve_rect(20, 41, 29, 48)   # early combat pocket
-
-        self.carve_rect(11, 11, 25, 24)   # north west landmark
-        self.carve_rect(38, 10, 52, 24)   # north loop room
-        self.carve_path((25, 18), (38, 18), half_width=1)
-        self.carve_path((44, 24), (44, 36), half_width=1)
-        self.carve_rect(39, 34, 50, 41)   # north shortcut room
-        self.carve_path((39, 38), (20, 50), half_width=1)
-
-        self.carve_rect(62, 24, 81, 36)   # east progression room
-        self.carve_rect(70, 42, 88, 55)   # east branch room
-        self.carve_path((76, 36), (79, 42), half_width=1)
-        self.carve_path((70, 49), (56, 49), half_width=1)
-        self.carve_path((56, 49), (56, 18), half_width=1)
-
-        self.carve_rect(66, 63, 88, 74)   # stair district
-        self.carve_rect(72, 76, 90, 88)   # south east optional room
-        self.carve_path((80, 74), (80, 76), half_width=1)
-
-        self.carve_rect(34, 74, 58, 90)   # south optional district
-        self.carve_rect(14, 65, 25, 79)   # south west loop bend
-        self.carve_path((34, 82), (25, 72), half_width=1)
-        self.carve_path((52, 74), (52, 52), half_width=1)
-        self.carve_path((52, 52), (70, 49), half_width=1)
-
-        self.carve_dead_end_branches()
-        self.reinforce_perimeter()
-        return self.walls
-
-    def carve_dead_end_branches(self) -> None:
-        branches = [
-            ((30, 18), (30, 8)),
-            ((49, 18), (49, 8)),
-            ((76, 30), (91, 30)),
-            ((82, 68), (94, 68)),
-            ((52, 82), (52, 94)),
-            ((18, 72), (7, 72)),
-            ((18, 50), (33, 50)),
-        ]
-        for start, end in branches:
-            self.carve_path(start, end, half_width=1)
-
-    def reinforce_perimeter(self) -> None:
-        for x in range(self.width):
-            self.walls.add((x, 0))
-            self.walls.add((x, self.height - 1))
-        for y in range(self.height):
-            self.walls.add((0, y))
-            self.walls.add((self.width - 1, y))
-
-
-def vector(x: int, y: int) -> dict[str, int]:
-    return {"x": x, "y": y}
-
-
-def treasure_box_entities() -> list[dict]:
-    return [
-        {
-            "id": box_id,
-            "position": vector(*position),
-            "gold": gold,
-            "items": [
-                {"item_id": item_id, "quantity": quantity}
-                for item_id, quantity in items.items()
-            ],
-        }
-        for box_id, (position, gold, items) in TREASURE_BOXES.items()
-    ]
+RETURN_SPAWN_FROM_FLOOR_1 = FLOOR0_SPEC.cell("return_spawn_from_floor_1")
+
 
+def build_floor_layout() -> MazeBuilder:
+    """The District Loop carving described by ``floor_specs/floor0.json``."""
+    return floor_layout(FLOOR0_SPEC)
 
+
+@profiled("perimeter fill")
 def perimeter_walls(grid_width: int, grid_height: int) -> set[tuple[int, int]]:
     """Return wall cells that fill the region beyond the maze (100x100) to the full grid."""
     walls: set[tuple[int, int]] = set()
@@ -184,17 +91,12 @@ def perimeter_walls(grid_width: int, grid_height: int) -> set[tuple[int, int]]:
 
 
 def build_floor_model() -> dict:
-    builder = MazeBuilder()
-    walls = builder.build()
+    walls = build_floor_layout().walls
+    entities = FLOOR0_SPEC.entities()
 
     model = {
         "schema_version": "1.0",
-        "floor_metadata": {
-            "floor_name": "Ground Floor",
-            "floor_number": 0,
-            "description": "A readable starter district loop with optional branches.",
-            "player_start": vector(*PLAYER_START),
-        },
+        "floor_metadata": FLOOR0_SPEC.floor_metadata(),
         "tile_layers": {
             "ground": [
                 {"x": x, "y": y, "tile": "starting_area"}
@@ -208,97 +110,31 @@ def build_floor_model() -> dict:
                     key=lambda p: (p[1], p[0]),
                 )
             ],
-            "stair": [{"x": STAIR_POS[0], "y": STAIR_POS[1], "tile": "up"}],
-        },
-        "entities": {
-            "enemy_spawns": [
-                {
-                    "id": "EnemySpawn_Goblin",
-                    "position": vector(*FIRST_GOBLIN_POS),
-                    "enemy_type": "Goblin",
-                },
-                {
-                    "id": "EnemySpawn_Goblin_North",
-                    "position": vector(44, 36),
-                    "enemy_type": "Goblin",
-                },
-                {
-                    "id": "EnemySpawn_Orc_East",
-                    "position": vector(74, 49),
-                    "enemy_type": "Orc",
-                },
-                {
-                    "id": "EnemySpawn_Goblin_South",
-                    "position": vector(45, 82),
-                    "enemy_type": "Goblin",
-                },
-            ],
-            "npc_spawns": [
-                {
-                    "id": "NpcSpawn_Shopkeeper",
-                    "position": vector(*SHOPKEEPER_POS),
-                    "npc_id": "village_shopkeeper",
-                },
-                {
-                    "id": "NpcSpawn_Healer",
-                    "position": vector(*HEALER_POS),
-                    "npc_id": "village_healer",
-                },
-            ],
-            "stair_connections": [
-                {
-                    "id": "GF_000",
-                    "position": vector(*STAIR_POS),
-                    "direction": "up",
-                    "target_floor": 1,
-                    "destination_stair_id": "1F_001",
-                }
-            ],
-            "treasure_boxes": treasure_box_entities(),
+            "stair": stair_tiles(entities["stair_connections"]),
         },
+        "entities": entities,
     }
 
     validate_model(model)
     return model
 
 
-def walkable_cells(model: dict) -> set[tuple[int, int]]:
-    walls = {(tile["x"], tile["y"]) for tile in model["tile_layers"]["wall"]}
-    return {
-        (x, y)
-        for y in range(GRID_HEIGHT)
-        for x in range(GRID_WIDTH)
-        if (x, y) not in walls
-    }
-
-
-def has_path(walkable: set[tuple[int, int]], start: tuple[int, int], goal: tuple[int, int]) -> bool:
-    return connected_walkable_cells(walkable, start).__contains__(goal)
-
-
-def connected_walkable_cells(walkable: set[tuple[int, int]], start: tuple[int, int]) -> set[tuple[int, int]]:
-    queue = deque([start])
-    seen = {start}
-    while queue:
-        x, y = queue.popleft()
-        for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
-            if nxt in walkable and nxt not in seen:
-                seen.add(nxt)
-                queue.append(nxt)
-    return seen
-
-
+@profiled("validation", rest="entity checks")
 def validate_model(model: dict) -> None:
-    walkable = walkable_cells(model)
     start = (model["floor_metadata"]["player_start"]["x"], model["floor_metadata"]["player_start"]["y"])
-    if start not in walkable:
-        raise ValueError(f"Player start {start} is not walkable")
+    with profile_phase("bfs"):
+        reachability = ReachabilityIndex(
+            walkable_mask_from_tiles(model["tile_layers"]["wall"], GRID_WIDTH, GRID_HEIGHT),
+            GRID_WIDTH,
+            GRID_HEIGHT,
+            start,
+        )
+        if not reachability.start_walkable:
+            raise ValueError(f"Player start {start} is not walkable")
 
-    connected = connected_walkable_cells(walkable, start)
-    disconnected = walkable - connected
+        disconnected = reachability.unreachable_cells()
     if disconnected:
-        sample = sorted(disconnected)[:5]
-        raise ValueError(f"Disconnected walkable cells: {sample}")
+        raise ValueError(f"Disconnected walkable cells: {disconnected[:5]}")
 
     goals = []
     for npc in model["entities"]["npc_spawns"]:
@@ -311,61 +147,44 @@ def validate_model(model: dict) -> None:
         goals.append((box["position"]["x"], box["position"]["y"]))
 
     for goal in goals:
-        if goal not in walkable:
+        if not reachability.is_walkable(goal):
             raise ValueError(f"Entity position {goal} is not walkable")
-        if not has_path(walkable, start, goal):
+        if not reachability.is_reachable(goal):
             raise ValueError(f"No path from {start} to {goal}")
 
 
-def write_json(model: dict, output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(model, indent=2) + "\n", encoding="utf-8")
+def write_json(model: dict, output_path: Path, schema_version: str = SCHEMA_V1) -> None:
+    write_floor_json(model, output_path, schema_version)
 
 
 def update_floor_definition(path: Path, model: dict, stair_dest: tuple[int, int] | None = None) -> None:
-    text = path.read_text(encoding="utf-8")
+    document = load_tres(path)
+    missing = [
+        name
+        for name in ("PlayerStartPosition", "StairsUp", "StairsUpDestinations")
+        if name not in document.section()
+    ]
+    if missing:
+        raise ValueError(f"Could not update required FloorDefinition fields: {', '.join(missing)}")
+
     start = model["floor_metadata"]["player_start"]
     stair = model["entities"]["stair_connections"][0]["position"]
 
     # Determine stair destination: explicit param > existing value in file > default constant
-    dest_x, dest_y = stair_dest if stair_dest is not None else RETURN_SPAWN_FROM_FLOOR_1
-    # If no explicit override, try to preserve existing StairsUpDestinations from the file
+    destination = Vector2i(*(stair_dest if stair_dest is not None else RETURN_SPAWN_FROM_FLOOR_1))
     if stair_dest is None:
-        existing_match = re.search(
-            r"StairsUpDestinations\s*=\s*Array\[Vector2i\]\(\[Vector2i\((\d+),\s*(\d+)\)\]\)",
-            text,
-        )
-        if existing_match:
-            dest_x, dest_y = int(existing_match.group(1)), int(existing_match.group(2))
+        existing = document.get("StairsUpDestinations")
+        if len(existing) == 1 and isinstance(existing[0], Vector2i):
+            destination = existing[0]
 
-    text, start_count = re.subn(
-        r"PlayerStartPosition = Vector2i\([^)]+\)",
-        f"PlayerStartPosition = Vector2i({start['x']}, {start['y']})",
-        text,
-    )
-    text, stairs_count = re.subn(
-        r"StairsUp = Array\[Vector2i\]\(\[[^\]]*\]\)",
-        f"StairsUp = Array[Vector2i]([Vector2i({stair['x']}, {stair['y']})])",
-        text,
-    )
-    text, destinations_count = re.subn(
-        r"StairsUpDestinations = Array\[Vector2i\]\(\[[^\]]*\]\)",
-        f"StairsUpDestinations = Array[Vector2i]([Vector2i({dest_x}, {dest_y})])",
-        text,
+    document.update(
+        {
+            "PlayerStartPosition": Vector2i(start["x"], start["y"]),
+            "StairsUp": TypedArray("Vector2i", [Vector2i(stair["x"], stair["y"])]),
+            "StairsUpDestinations": TypedArray("Vector2i", [destination]),
+        }
     )
-    missing = [
-        name
-        for name, count in (
-            ("PlayerStartPosition", start_count),
-            ("StairsUp", stairs_count),
-            ("StairsUpDestinations", destinations_count),
-        )
-        if count != 1
-    ]
-    if missing:
-        raise ValueError(f"Could not update required FloorDefinition fields: {', '.join(missing)}")
-
-    path.write_text(text, encoding="utf-8")
+    document.save()
 
 
 def parse_args() -> argparse.Namespace:
@@ -391,35 +210,149 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Only write JSON; do not update the FloorDefinition resource.",
     )
+    parser.add_argument(
+        "--cache-file",
+        default=str(DEFAULT_CACHE_PATH),
+        help="Generation cache used to skip the floor when its inputs and outputs are unchanged.",
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild the floor even on a cache hit.")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the generation cache.")
+    parser.add_argument(
+        "--schema-version",
+        choices=SCHEMA_VERSIONS,
+        default=SCHEMA_V1,
+        help="Floor JSON schema to write; 2.0 stores tile layers as row runs or bitsets (default: 1.0).",
+    )
+    parser.add_argument(
+        "--path-cluster-size",
+        type=int,
+        default=DEFAULT_CLUSTER_SIZE,
+        help=f"Cluster edge of the --sidecars paths graph (default: {DEFAULT_CLUSTER_SIZE}).",
+    )
+    parser.add_argument(
+        "--visibility-radius",
+        type=int,
+        default=DEFAULT_VISIBILITY_RADIUS,
+        help=f"Sight radius of the --sidecars vis table (default: {DEFAULT_VISIBILITY_RADIUS}).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        help="Also write <floor>.chunks/ with tiles and entities split into chunks of this edge (default: off).",
+    )
+    parser.add_argument(
+        "--sfloor",
+        action="store_true",
+        help="Also write the floor as a binary <floor>.sfloor for mmap-based tooling.",
+    )
+    add_sidecar_argument(parser)
+    add_profile_arguments(parser)
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    model = build_floor_model()
-    write_json(model, Path(args.output))
-    if not args.skip_floor_def:
-        stair_dest = None
-        if args.stair_dest:
-            parts = args.stair_dest.split(",")
-            if len(parts) != 2:
-                print(f"Error: --stair-dest must be 'x,y', got '{args.stair_dest}'", file=sys.stderr)
-                return 1
-            try:
-                stair_dest = (int(parts[0].strip()), int(parts[1].strip()))
-            except ValueError:
-                print(
-                    f"Error: --stair-dest values must be integers, got '{parts[0].strip()}', '{parts[1].strip()}'",
-                    file=sys.stderr,
-                )
-                return 1
-        update_floor_definition(Path(args.floor_def), model, stair_dest)
+    if args.profile or args.profile_stats:
+        return run_profiled(lambda: generate(args), args.profile_stats)
+    return generate(args)
+
+
+def generate(args: argparse.Namespace) -> int:
+    stair_dest = None
+    if not args.skip_floor_def and args.stair_dest:
+        parts = args.stair_dest.split(",")
+        if len(parts) != 2:
+            print(f"Error: --stair-dest must be 'x,y', got '{args.stair_dest}'", file=sys.stderr)
+            return 1
+        try:
+            stair_dest = (int(parts[0].strip()), int(parts[1].strip()))
+        except ValueError:
+            print(
+                f"Error: --stair-dest values must be integers, got '{parts[0].strip()}', '{parts[1].strip()}'",
+                file=sys.stderr,
+            )
+            return 1
+
+    if args.chunk_size < 0:
+        print(f"Error: --chunk-size must be non-negative, got {args.chunk_size}", file=sys.stderr)
+        return 1
+    if args.path_cluster_size < 2:
+        print(f"Error: --path-cluster-size must be at least 2, got {args.path_cluster_size}", file=sys.stderr)
+        return 1
+    if not 1 <= args.visibility_radius <= MAX_VISIBILITY_RADIUS:
+        print(
+            f"Error: --visibility-radius must be 1-{MAX_VISIBILITY_RADIUS}, got {args.visibility_radius}",
+            file=sys.stderr,
+        )
+        return 1
+
+    cache = GenerationCache(Path(args.cache_file), enabled=not args.no_cache, force=args.force)
+    output = Path(args.output)
+    floor_def = None if args.skip_floor_def else Path(args.floor_def)
+    # The stair destination and schema only change the written files, but they are still inputs.
+    key = generator_key(
+        sys.modules[__name__],
+        f"Floor 0 stair-dest={stair_dest} schema={args.schema_version} chunk-size={args.chunk_size} "
+        f"path-cluster-size={args.path_cluster_size} visibility-radius={args.visibility_radius}",
+    )
+    flow_path = flow_field_path(output) if FLOW in args.sidecars else None
+    regions_path = region_graph_path(output) if REGIONS in args.sidecars else None
+    paths_path = path_graph_path(output) if PATHS in args.sidecars else None
+    chokes_path = choke_points_path(output) if CHOKES in args.sidecars else None
+    vis_path = visibility_path(output) if VISIBILITY in args.sidecars else None
+    chunks_path = chunk_directory(output) if args.chunk_size else None
+    binary_path = sfloor_path(output) if args.sfloor else None
+    sidecars = tuple(
+        path
+        for path in (flow_path, regions_path, paths_path, chokes_path, vis_path, chunks_path, binary_path)
+        if path is not None
+    )
+    if cache.is_fresh("Floor 0", key, output, floor_def, sidecars):
+        print("Floor 0 maze already up to date")
+        print(cache.summary())
+        return 0
+
+    with profile_phase("Floor 0 build", rest="entity build"):
+        model = build_floor_model()
+    with profile_phase("Floor 0 output"):
+        write_json(model, output, args.schema_version)
+        if flow_path is not None:
+            with profile_phase("flow fields"):
+                write_flow_fields(model, flow_path, GRID_WIDTH, GRID_HEIGHT)
+        if regions_path is not None:
+            with profile_phase("region graph"):
+                carves = build_floor_layout().carves
+                write_region_graph(region_graph_from_model(model, carves, GRID_WIDTH, GRID_HEIGHT), regions_path)
+        if paths_path is not None:
+            with profile_phase("path graph"):
+                graph = path_graph_from_model(model, GRID_WIDTH, GRID_HEIGHT, args.path_cluster_size)
+                write_path_graph(graph, paths_path)
+        if chokes_path is not None:
+            with profile_phase("choke points"):
+                write_choke_points(model, chokes_path, GRID_WIDTH, GRID_HEIGHT)
+        if vis_path is not None:
+            with profile_phase("visibility"):
+                visibility = visibility_from_model(model, GRID_WIDTH, GRID_HEIGHT, args.visibility_radius)
+                write_visibility(visibility, vis_path)
+        if chunks_path is not None:
+            with profile_phase("chunks"):
+                write_floor_chunks(model, output, args.chunk_size, args.schema_version, GRID_WIDTH, GRID_HEIGHT)
+        if binary_path is not None:
+            with profile_phase("sfloor"):
+                write_sfloor(model, binary_path, GRID_WIDTH, GRID_HEIGHT)
+        if floor_def is not None:
+            with profile_phase("tres update"):
+                update_floor_definition(floor_def, model, stair_dest)
+    cache.record(key, output, floor_def, sidecars)
+    cache.save()
     print(
         f"Generated Floor 0 maze: {FLOOR_WIDTH}x{FLOOR_HEIGHT}, "
         f"{len(model['tile_layers']['wall'])} walls, "
         f"{len(model['entities']['enemy_spawns'])} enemies, "
         f"{len(model['entities']['treasure_boxes'])} treasure boxes"
     )
+    print(cache.summary())
     return 0
 
 
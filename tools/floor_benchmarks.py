@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Time the floor generator hot paths and compare them against a stored baseline.
+
+Usage:
+    python3 tools/floor_benchmarks.py --output floor_benchmarks.json
+    python3 tools/floor_benchmarks.py --sizes 64 256 --save-baseline
+    python3 tools/floor_benchmarks.py --baseline /tmp/my_machine_baseline.json
+
+The committed baseline, ``tools/floor_benchmark_baseline.json``, is recorded
+with the default sizes on the reference machine named in its ``host``,
+``cpu`` and ``python`` fields; re-record it with ``--save-baseline`` when a
+hot path changes on purpose. Timings from another machine are not comparable
+to it: a run whose host, CPU or Python differs from the baseline's still
+lists the regressions but does not fail, so point ``--baseline`` at a
+per-machine file to gate there. A missing baseline is written from the
+current run and reported, and nothing is compared.
+
+Every case is timed ``--repeat`` times with ``time.perf_counter``; peak memory
+comes from one extra ``tracemalloc`` run so tracing never skews the timings.
+Cases cover the authored floors, a batch of ``procedural_floor_generator``
+tower floors and ``synthetic_floor_generator`` floors of each ``--sizes`` edge
+length.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools import floor0_maze_generator as floor0
+    from tools import floor1_maze_generator as floor1
+    from tools.floor_spec import compile_layout
+    from tools.procedural_floor_generator import ProceduralFloorSpec, build_procedural_model
+    from tools.synthetic_floor_generator import (
+        SYNTHETIC_ENEMY_TYPES,
+        SyntheticFloorSpec,
+        build_synthetic_layout,
+        build_synthetic_model,
+    )
+except ModuleNotFoundError:  # Direct ``python tools/floor_benchmarks.py`` invocation.
+    import floor0_maze_generator as floor0
+    import floor1_maze_generator as floor1
+    from floor_spec import compile_layout
+    from procedural_floor_generator import ProceduralFloorSpec, build_procedural_model
+    from synthetic_floor_generator import (
+        SYNTHETIC_ENEMY_TYPES,
+        SyntheticFloorSpec,
+        build_synthetic_layout,
+        build_synthetic_model,
+    )
+
+BENCHMARK_FORMAT_VERSION = 1
+DEFAULT_SIZES = (64, 256, 1024, 2048)
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "floor_benchmark_baseline.json"
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    # ``setup`` runs untimed; its result is passed to ``run``.
+    setup: Callable[[], object]
+    run: Callable[[object], object]
+
+
+def _write_to_temp(model: dict) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        floor1.write_json(model, Path(tmpdir) / "Floor.json")
+
+
+def _floor1_supplemental_inputs() -> tuple:
+    """The arguments ``build_floor1_model`` passes to ``build_supplemental_enemy_patrols``."""
+    walkable = floor1.walkable_from_walls(floor1.build_floor1_walls(), floor1.FLOOR1_WIDTH, floor1.FLOOR1_HEIGHT)
+    base_enemies = floor1.FLOOR1_ENEMY_GATES | floor1.FLOOR1_EXTRA_ENEMY_PATROLS
+    occupied = (
+        {floor1.FLOOR1_PLAYER_START, floor1.FLOOR1_DOWN_STAIR, floor1.FLOOR1_UP_STAIR_A, floor1.FLOOR1_UP_STAIR_B}
+        | set(floor1.FLOOR1_HIDDEN_PLACEHOLDERS.values())
+        | floor1.enemy_data_positions(base_enemies)
+        | floor1.treasure_positions(floor1.FLOOR1_TREASURE_BOXES)
+        | floor1.authored_position_values(floor1.FLOOR1_PUZZLE_TRAPS)
+        | floor1.authored_position_values(floor1.FLOOR1_PUZZLE_SWITCHES)
+        | floor1.authored_position_values(floor1.FLOOR1_PUZZLE_GATES)
+        | floor1.authored_position_values(floor1.FLOOR1_PUZZLE_RIDDLES)
+    )
+    return (
+        floor1.FLOOR1_SUPPLEMENTAL_ENEMY_PREFIX,
+        base_enemies,
+        walkable,
+        occupied,
+        floor1.FLOOR1_SUPPLEMENTAL_ENEMY_TYPES,
+    )
+
+
+def _synthetic_supplemental_inputs(spec: SyntheticFloorSpec) -> tuple:
+    model = build_synthetic_model(spec)
+    walkable = floor1.walkable_from_walls(model["tile_layers"]["wall"].cells, spec.size, spec.size)
+    base_enemies = {
+        enemy["id"]: {"position": floor1.entity_position(enemy), "enemy_type": enemy["enemy_type"]}
+        for enemy in model["entities"]["enemy_spawns"]
+    }
+    occupied = {
+        floor1.entity_position(entity)
+        for key in floor1.ENTITY_POSITION_KEYS
+        for entity in model["entities"].get(key, [])
+    }
+    return ("EnemySpawn_SyntheticPatrol", base_enemies, walkable, occupied, SYNTHETIC_ENEMY_TYPES)
+
+
+def real_floor_cases() -> list[BenchmarkCase]:
+    width, height = floor1.FLOOR1_WIDTH, floor1.FLOOR1_HEIGHT
+    return [
+        BenchmarkCase("floor0/compile_layout", lambda: None, lambda _: compile_layout(floor0.FLOOR0_SPEC)),
+        BenchmarkCase("floor0/write_json", floor0.build_floor_model, _write_to_temp),
+        BenchmarkCase("floor1/compile_layout", lambda: None, lambda _: compile_layout(floor1.FLOOR1_SPEC)),
+        BenchmarkCase("floor1/build_floor1_model", lambda: None, lambda _: floor1.build_floor1_model()),
+        BenchmarkCase(
+            "floor1/validate_model",
+            floor1.build_floor1_model,
+            lambda model: floor1.validate_model(model, width, height),
+        ),
+        BenchmarkCase(
+            "floor1/dead_end_branches",
+            lambda: floor1.walkable_from_walls(floor1.build_floor1_walls(), width, height),
+            lambda walkable: floor1.dead_end_branches(walkable, width, height),
+        ),
+        BenchmarkCase(
+            "floor1/build_supplemental_enemy_patrols",
+            _floor1_supplemental_inputs,
+            lambda inputs: floor1.build_supplemental_enemy_patrols(*inputs),
+        ),
+        BenchmarkCase("floor1/write_json", floor1.build_floor1_model, _write_to_temp),
+    ]
+
+
+PROCEDURAL_BATCH = 50
+
+
+def procedural_cases() -> list[BenchmarkCase]:
+    """Generate and validate a batch of tower floors; floors/s is ``PROCEDURAL_BATCH / min_seconds``."""
+    specs = [ProceduralFloorSpec(seed) for seed in range(PROCEDURAL_BATCH)]
+    return [
+        BenchmarkCase(
+            f"procedural-60/build_procedural_model x{PROCEDURAL_BATCH}",
+            lambda: None,
+            lambda _: [build_procedural_model(spec) for spec in specs],
+        ),
+    ]
+
+
+def synthetic_cases(size: int) -> list[BenchmarkCase]:
+    prefix = f"synthetic-{size}"
+    spec = SyntheticFloorSpec.for_size(size)
+    return [
+        BenchmarkCase(f"{prefix}/MazeBuilder.build", lambda: None, lambda _: build_synthetic_layout(spec)),
+        BenchmarkCase(
+            f"{prefix}/validate_model",
+            lambda: build_synthetic_model(spec),
+            lambda model: floor1.validate_model(model, size, size),
+        ),
+        BenchmarkCase(
+            f"{prefix}/dead_end_branches",
+            lambda: floor1.walkable_from_walls(build_synthetic_layout(spec).walls, size, size),
+            lambda walkable: floor1.dead_end_branches(walkable, size, size),
+        ),
+        BenchmarkCase(
+            f"{prefix}/build_supplemental_enemy_patrols",
+            lambda: _synthetic_supplemental_inputs(spec),
+            lambda inputs: floor1.build_supplemental_enemy_patrols(*inputs),
+        ),
+        BenchmarkCase(f"{prefix}/write_json", lambda: build_synthetic_model(spec), _write_to_temp),
+    ]
+
+
+def measure(case: BenchmarkCase, repeat: int = DEFAULT_REPEAT, memory: bool = True) -> dict[str, float | int]:
+    state = case.setup()
+    timings = []
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        case.run(state)
+        timings.append(time.perf_counter() - started)
+
+    result: dict[str, float | int] = {
+        "runs": len(timings),
+        "min_seconds": round(min(timings), 6),
+        "median_seconds": round(statistics.median(timings), 6),
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            case.run(state)
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    memory: bool = True,
+    name_filter: str = "",
+    progress: Callable[[str, dict], None] | None = None,
+) -> dict:
+    cases = real_floor_cases() + procedural_cases()
+    for size in sizes:
+        cases.extend(synthetic_cases(size))
+
+    results = {}
+    for case in cases:
+        if name_filter not in case.name:
+            continue
+        results[case.name] = measure(case, repeat, memory)
+        if progress is not None:
+            progress(case.name, results[case.name])
+    return {
+        "version": BENCHMARK_FORMAT_VERSION,
+        "python": platform.python_version(),
+        **host_identity(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def cpu_model() -> str:
+    """The CPU model name (``/proc/cpuinfo`` on Linux), falling back to ``platform.processor()``."""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+            for line in cpuinfo:
+                key, _, value = line.partition(":")
+                if key.strip() == "model name":
+                    return value.strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def host_identity() -> dict[str, str]:
+    """Which machine a report was recorded on; timings only compare between equal identities."""
+    return {"host": platform.node(), "cpu": cpu_model(), "machine": platform.machine()}
+
+
+def same_machine(report: dict, baseline: dict) -> bool:
+    return all(baseline.get(key) == report.get(key) for key in ("host", "cpu", "machine", "python"))
+
+
+def describe_machine(report: dict) -> str:
+    return f"{report.get('host')} ({report.get('cpu')}, {report.get('machine')}) / Python {report.get('python')}"
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Describe every case whose min time or peak memory grew by more than ``tolerance``.
+
+    Cases missing from either side are skipped, so adding a benchmark never
+    reads as a regression.
+    """
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for name, result in report["results"].items():
+        previous = baseline_results.get(name)
+        if previous is None:
+            continue
+        for metric in ("min_seconds", "peak_bytes"):
+            if metric not in result or not previous.get(metric):
+                continue
+            ratio = result[metric] / previous[metric]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]} -> {result[metric]} ({(ratio - 1) * 100:+.0f}%)"
+                )
+    return regressions
+
+
+def format_result(name: str, result: dict) -> str:
+    line = f"{name:<52} min {result['min_seconds'] * 1000:10.2f} ms  median {result['median_seconds'] * 1000:10.2f} ms"
+    if "peak_bytes" in result:
+        line += f"  peak {result['peak_bytes'] / (1024 * 1024):9.2f} MiB"
+    return line
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the floor generators.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=list(DEFAULT_SIZES),
+        help="Synthetic grid edge lengths (default: 64 256 1024 2048).",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case (default: 3).")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory run.")
+    parser.add_argument("--output", help="Write the results JSON to this path.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE_PATH), help="Baseline results JSON.")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the baseline instead of comparing against it.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown or memory growth before a case counts as a regression (default: 0.25).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = run_benchmarks(
+        tuple(args.sizes),
+        args.repeat,
+        memory=not args.no_memory,
+        name_filter=args.filter,
+        progress=lambda name, result: print(format_result(name, result), flush=True),
+    )
+    payload = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(payload, encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(payload, encoding="utf-8")
+        print(f"Saved baseline to {baseline_path}")
+        return 0
+    if not baseline_path.is_file():
+        baseline_path.write_text(payload, encoding="utf-8")
+        print(f"No baseline at {baseline_path}; wrote one from this run, nothing to compare yet")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    comparable = same_machine(report, baseline)
+    if not comparable:
+        print(
+            f"Warning: baseline was recorded on {describe_machine(baseline)}, this run is on "
+            f"{describe_machine(report)}; timings are not comparable, so regressions do not fail the run"
+        )
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print("Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if comparable else 0
+    print(f"No regressions against {baseline_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Search perturbed variants of an authored floor spec for better layouts.
+
+Usage:
+    python3 tools/floor_candidate_search.py --spec floor1 --count 2000 --top 10 --jobs 8
+    python3 tools/floor_candidate_search.py --spec floor2 --weight enemy_spacing=2 --output-dir /tmp/candidates
+
+Candidate ``n`` is the authored spec with some rooms shifted, some branch
+tips moved (each with ``--move-chance``) and every enemy table row nudged to
+a nearby open cell, all drawn from a stream seeded by ``(seed, n)``;
+candidate 0 is the authored spec. Cells inside a shifted room and rows
+sitting on a moved branch tip move with them.
+
+Each candidate is pruned as early as possible: a spec that no longer parses,
+then a layout whose walkable cells, anchors or table rows fall apart, and
+only then the full ``build_spec_model`` validation. Survivors are scored on
+:data:`METRICS`, each relative to the authored floor and weighted by
+``--weight``. Workers send back only the candidate index and its metrics, and
+the parent keeps the best ``--top`` in a heap, so memory stays flat however
+many candidates are searched; the winners are rebuilt from their index when
+written out.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import heapq
+import json
+import random
+import sys
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+
+try:
+    from tools.floor1_maze_generator import build_spec_model, entity_position
+    from tools.floor_json import layer_cells
+    from tools.floor_reachability import ReachabilityIndex, walkable_mask_from_walls
+    from tools.floor_spec import FloorSpec, FloorSpecError, compile_layout, load_floor_spec
+    from tools.floor_topology import dead_end_chains
+    from tools.maze_grid import MazeBuilder
+except ModuleNotFoundError:  # Direct ``python tools/floor_candidate_search.py`` invocation.
+    from floor1_maze_generator import build_spec_model, entity_position
+    from floor_json import layer_cells
+    from floor_reachability import ReachabilityIndex, walkable_mask_from_walls
+    from floor_spec import FloorSpec, FloorSpecError, compile_layout, load_floor_spec
+    from floor_topology import dead_end_chains
+    from maze_grid import MazeBuilder
+
+# critical_path: steps from the player start to the nearest up stair (any stair when there is none).
+# branch_count: dead-end corridor chains.
+# enemy_spacing: mean Manhattan distance from each enemy to its nearest neighbour.
+METRICS = ("critical_path", "branch_count", "enemy_spacing")
+DEFAULT_WEIGHTS = {metric: 1.0 for metric in METRICS}
+# Pruning stages, cheapest first.
+PRUNE_STAGES = ("spec", "layout", "validation")
+
+# Candidates handed to a worker at a time, and batches kept queued per worker.
+BATCH_SIZE = 16
+BATCHES_IN_FLIGHT = 4
+# Farthest a row left on a wall is moved to reach an open cell.
+SNAP_RADIUS = 2
+
+
+@dataclass(frozen=True)
+class CandidateSearch:
+    spec: str
+    seed: int = 0
+    # Chance that each room and each branch tip moves in a candidate.
+    move_chance: float = 0.25
+    room_jitter: int = 1
+    branch_jitter: int = 2
+    # Manhattan radius an enemy row may move within.
+    enemy_jitter: int = 3
+
+
+@dataclass(frozen=True)
+class CandidateResult:
+    index: int
+    metrics: dict[str, float] | None = None
+    pruned: str | None = None
+    error: str = ""
+
+
+@dataclass
+class SearchReport:
+    baseline: dict[str, float]
+    # (score, result) pairs, best first.
+    ranked: list[tuple[float, CandidateResult]]
+    pruned: Counter = field(default_factory=Counter)
+    searched: int = 0
+
+
+class CandidatePruned(Exception):
+    def __init__(self, stage: str, error: Exception | str) -> None:
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+        self.error = str(error)
+
+
+@lru_cache(maxsize=8)
+def _base_spec(spec: str) -> FloorSpec:
+    return load_floor_spec(spec)
+
+
+def _cell(value: object) -> tuple[int, int] | None:
+    return (value[0], value[1]) if isinstance(value, list) else None
+
+
+def _clamp(cell: tuple[int, int], width: int, height: int) -> list[int]:
+    return [min(max(cell[0], 1), width - 2), min(max(cell[1], 1), height - 2)]
+
+
+def perturb_layout(data: dict, rng: random.Random, search: CandidateSearch) -> dict:
+    """A copy of spec ``data`` with rooms shifted and branch tips moved.
+
+    Literal cells in anchors, paths, loops, branches and table rows follow the
+    move: a moved branch tip takes everything on it along, and anything inside
+    a shifted room shifts with it (the last listed room wins for nested rooms).
+    """
+    data = copy.deepcopy(data)
+    width, height = data["width"], data["height"]
+    rooms: list[tuple[tuple[int, int, int, int], int, int]] = []
+    tips: dict[tuple[int, int], list[int]] = {}
+    for operation in data["layout"]:
+        if "room" in operation and search.room_jitter and rng.random() < search.move_chance:
+            x1, y1, x2, y2 = operation["room"]
+            jitter = search.room_jitter
+            dx = rng.randint(max(-jitter, 1 - min(x1, x2)), min(jitter, width - 2 - max(x1, x2)))
+            dy = rng.randint(max(-jitter, 1 - min(y1, y2)), min(jitter, height - 2 - max(y1, y2)))
+            rooms.append(((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)), dx, dy))
+            operation["room"] = [x1 + dx, y1 + dy, x2 + dx, y2 + dy]
+        elif "branches" in operation and search.branch_jitter:
+            jitter = search.branch_jitter
+            for _, end in operation["branches"]:
+                tip = _cell(end)
+                if tip is not None and tip not in tips and rng.random() < search.move_chance:
+                    moved = (tip[0] + rng.randint(-jitter, jitter), tip[1] + rng.randint(-jitter, jitter))
+                    tips[tip] = _clamp(moved, width, height)
+
+    def relocate(value: object) -> object:
+        cell = _cell(value)
+        if cell is None:
+            return value
+        if cell in tips:
+            return tips[cell]
+        for (left, top, right, bottom), dx, dy in reversed(rooms):
+            if left <= cell[0] <= right and top <= cell[1] <= bottom:
+                return [cell[0] + dx, cell[1] + dy]
+        return value
+
+    for name, value in data["anchors"].items():
+        data["anchors"][name] = relocate(value)
+    for operation in data["layout"]:
+        for kind in ("path", "loop"):
+            if kind in operation:
+                operation[kind] = [relocate(point) for point in operation[kind]]
+        if "branches" in operation:
+            operation["branches"] = [[relocate(start), relocate(end)] for start, end in operation["branches"]]
+        if "cell" in operation:
+            operation["cell"] = relocate(operation["cell"])
+    for rows in data.get("tables", {}).values():
+        for row in rows.values():
+            row["position"] = relocate(row["position"])
+    return data
+
+
+def _offsets(radius: int) -> list[tuple[int, int]]:
+    """Offsets within Manhattan ``radius`` of a cell, nearest first."""
+    return sorted(
+        (
+            (dx, dy)
+            for dy in range(-radius, radius + 1)
+            for dx in range(-radius, radius + 1)
+            if 0 < abs(dx) + abs(dy) <= radius
+        ),
+        key=lambda offset: (abs(offset[0]) + abs(offset[1]), offset[1], offset[0]),
+    )
+
+
+def _names_in(value: object) -> set[str]:
+    """Every string nested in ``value``: the cell names a layout refers to (plus notes)."""
+    if isinstance(value, str):
+        return {value}
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return set()
+    return set().union(*(_names_in(part) for part in value))
+
+
+def place_rows(data: dict, spec: FloorSpec, layout: MazeBuilder, rng: random.Random, radius: int) -> dict:
+    """Settle the literal table rows of ``data`` on the compiled ``layout`` and nudge its enemies.
+
+    ``spec`` is ``data`` parsed. A row left on a wall by a moved room or branch
+    goes to the nearest free open cell within :data:`SNAP_RADIUS`. Enemy rows
+    then move to a random free open cell within ``radius``; an enemy guarding a
+    dead-end chain only moves along that chain, so the branch keeps its payoff.
+    Rows the layout refers to by id stay put, since moving them would change
+    the carving ``layout`` was compiled from.
+    """
+    walls = layout.walls
+    width, height = spec.width, spec.height
+    chain_of: dict[tuple[int, int], int] = {}
+    mask = walkable_mask_from_walls(walls, width, height)
+    for number, (cells, _) in enumerate(dead_end_chains(mask, width)):
+        for index in cells:
+            chain_of.setdefault((index % width, index // width), number)
+
+    tables = data.get("tables", {})
+    occupied = {spec.cell(name) for name in data["anchors"]}
+    occupied.update(spec.cell(row_id) for rows in tables.values() for row_id in rows)
+    enemy_tables = set(data.get("entities", {}).get("enemy_spawns", []))
+    carved = _names_in(data["layout"])
+
+    def free(cell: tuple[int, int]) -> bool:
+        return 0 < cell[0] < width - 1 and 0 < cell[1] < height - 1 and cell not in walls and cell not in occupied
+
+    for table_name, rows in tables.items():
+        for row_id, row in rows.items():
+            if _cell(row["position"]) is None or row_id in carved:
+                continue
+            x, y = cell = spec.cell(row_id)
+            if cell in walls:
+                cell = next(
+                    ((x + dx, y + dy) for dx, dy in _offsets(SNAP_RADIUS) if free((x + dx, y + dy))), cell
+                )
+            if radius and table_name in enemy_tables:
+                guarded = next(
+                    (
+                        chain_of[near]
+                        for near in (cell, *((cell[0] + dx, cell[1] + dy) for dx, dy in _offsets(1)))
+                        if near in chain_of
+                    ),
+                    None,
+                )
+                options = [
+                    (cell[0] + dx, cell[1] + dy)
+                    for dx, dy in _offsets(radius)
+                    if free((cell[0] + dx, cell[1] + dy))
+                    and (guarded is None or chain_of.get((cell[0] + dx, cell[1] + dy)) == guarded)
+                ]
+                if options:
+                    cell = rng.choice(options)
+            if cell != (x, y):
+                occupied.discard((x, y))
+                occupied.add(cell)
+                row["position"] = list(cell)
+    return data
+
+
+def _check_connected(spec: FloorSpec, layout: MazeBuilder) -> ReachabilityIndex:
+    mask = walkable_mask_from_walls(layout.walls, spec.width, spec.height)
+    reachability = ReachabilityIndex(mask, spec.width, spec.height, spec.player_start)
+    if not reachability.start_walkable:
+        raise CandidatePruned("layout", f"player start {spec.player_start} is not walkable")
+    disconnected = reachability.unreachable_cells()
+    if disconnected:
+        raise CandidatePruned("layout", f"disconnected walkable cells: {disconnected[:5]}")
+    return reachability
+
+
+def build_candidate(search: CandidateSearch, index: int) -> tuple[FloorSpec, MazeBuilder]:
+    """Candidate ``index``'s spec and compiled layout, or :class:`CandidatePruned` before validation."""
+    base = _base_spec(search.spec)
+    if index == 0:
+        return base, compile_layout(base)
+    # String seeds hash with SHA-512, so a candidate is the same in every process.
+    rng = random.Random(f"candidates:{search.seed}:{index}")
+    try:
+        data = perturb_layout(base.data, rng, search)
+        spec = FloorSpec(data, base.path)
+        layout = compile_layout(spec)
+        reachability = _check_connected(spec, layout)
+        spec = FloorSpec(place_rows(data, spec, layout, rng, search.enemy_jitter), base.path)
+    except FloorSpecError as error:
+        raise CandidatePruned("spec", error) from error
+    for rows in spec.data.get("tables", {}).values():
+        for row_id in rows:
+            if not reachability.is_reachable(spec.cell(row_id)):
+                raise CandidatePruned("layout", f"{row_id} at {spec.cell(row_id)} is not reachable")
+    return spec, layout
+
+
+def candidate_metrics(model: dict, width: int, height: int) -> dict[str, float]:
+    """Every :data:`METRICS` value for a validated floor model."""
+    mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), width, height)
+    start = model["floor_metadata"]["player_start"]
+    reachability = ReachabilityIndex(mask, width, height, (start["x"], start["y"]))
+
+    stairs = model["entities"].get("stair_connections", [])
+    exits = [stair for stair in stairs if stair["direction"] == "up"] or stairs
+    critical_path = min((reachability.distance(entity_position(stair)) for stair in exits), default=0)
+
+    enemies = [entity_position(enemy) for enemy in model["entities"].get("enemy_spawns", [])]
+    nearest = [
+        min(abs(x - other_x) + abs(y - other_y) for other, (other_x, other_y) in enumerate(enemies) if other != index)
+        for index, (x, y) in enumerate(enemies)
+    ] if len(enemies) > 1 else []
+
+    return {
+        "critical_path": float(critical_path),
+        "branch_count": float(len(dead_end_chains(mask, width))),
+        "enemy_spacing": round(sum(nearest) / len(nearest), 3) if nearest else 0.0,
+    }
+
+
+def evaluate_candidate(search: CandidateSearch, index: int) -> CandidateResult:
+    try:
+        spec, layout = build_candidate(search, index)
+        try:
+            model = build_spec_model(spec, layout)
+        except ValueError as error:
+            raise CandidatePruned("validation", error) from error
+    except CandidatePruned as pruned:
+        return CandidateResult(index, pruned=pruned.stage, error=pruned.error)
+    return CandidateResult(index, candidate_metrics(model, spec.width, spec.height))
+
+
+def _evaluate_batch(search: CandidateSearch, indices: range) -> list[CandidateResult]:
+    return [evaluate_candidate(search, index) for index in indices]
+
+
+def evaluate_candidates(search: CandidateSearch, count: int, jobs: int = 1) -> Iterator[CandidateResult]:
+    """Results for candidates ``1..count`` in index order, streamed as they finish.
+
+    With ``jobs`` > 1 a process pool works through batches of
+    :data:`BATCH_SIZE`, with only a few batches per worker queued at a time.
+    """
+    batches = (range(start, min(start + BATCH_SIZE, count + 1)) for start in range(1, count + 1, BATCH_SIZE))
+    if jobs <= 1:
+        for indices in batches:
+            yield from _evaluate_batch(search, indices)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        pending = deque(
+            pool.submit(_evaluate_batch, search, indices) for indices in islice(batches, jobs * BATCHES_IN_FLIGHT)
+        )
+        while pending:
+            results = pending.popleft().result()
+            for indices in islice(batches, 1):
+                pending.append(pool.submit(_evaluate_batch, search, indices))
+            yield from results
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def score(metrics: dict[str, float], baseline: dict[str, float], weights: dict[str, float]) -> float:
+    """Weighted sum of each metric relative to the authored floor's (which scores ``sum(weights)``)."""
+    return sum(weight * metrics[metric] / (baseline[metric] or 1.0) for metric, weight in weights.items())
+
+
+def search_candidates(
+    search: CandidateSearch,
+    count: int,
+    top: int,
+    weights: dict[str, float] | None = None,
+    jobs: int = 1,
+) -> SearchReport:
+    """Evaluate ``count`` candidates and keep the ``top`` best scoring ones."""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    authored = evaluate_candidate(search, 0)
+    if authored.metrics is None:
+        raise ValueError(f"The authored {search.spec} floor fails {authored.pruned}: {authored.error}")
+    report = SearchReport(authored.metrics, [])
+
+    # Min-heap of the best ``top``; earlier candidates win ties.
+    best: list[tuple[float, int, CandidateResult]] = []
+    for result in evaluate_candidates(search, count, jobs):
+        report.searched += 1
+        if result.metrics is None:
+            report.pruned[result.pruned] += 1
+            continue
+        entry = (score(result.metrics, report.baseline, weights), -result.index, result)
+        if len(best) < top:
+            heapq.heappush(best, entry)
+        elif entry[:2] > best[0][:2]:
+            heapq.heapreplace(best, entry)
+    report.ranked = [(value, result) for value, _, result in sorted(best, key=lambda entry: entry[:2], reverse=True)]
+    return report
+
+
+def write_candidate(search: CandidateSearch, index: int, output_path: Path) -> None:
+    """Rebuild candidate ``index`` and write its spec JSON, loadable with ``load_floor_spec``."""
+    spec, _ = build_candidate(search, index)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(spec.data, indent=2) + "\n", encoding="utf-8")
+
+
+def format_metrics(metrics: dict[str, float]) -> str:
+    return "  ".join(f"{metric}={metrics[metric]:g}" for metric in METRICS)
+
+
+def parse_weight(text: str) -> tuple[str, float]:
+    metric, separator, value = text.partition("=")
+    if not separator or metric not in METRICS:
+        raise argparse.ArgumentTypeError(f"expected METRIC=WEIGHT with METRIC one of {', '.join(METRICS)}")
+    try:
+        return metric, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"weight for {metric} must be a number, got {value!r}") from None
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search perturbed variants of a floor spec for the best layouts.")
+    parser.add_argument("--spec", default="floor1", help="Spec name under tools/floor_specs or a spec path.")
+    parser.add_argument("--count", type=int, default=1000, help="Candidates to generate (default: 1000).")
+    parser.add_argument("--top", type=int, default=10, help="Best candidates to report (default: 10).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (default: 1, serial).")
+    parser.add_argument(
+        "--move-chance",
+        type=float,
+        default=CandidateSearch.move_chance,
+        help="Chance that each room and branch tip moves (default: 0.25).",
+    )
+    parser.add_argument("--room-jitter", type=int, default=CandidateSearch.room_jitter)
+    parser.add_argument("--branch-jitter", type=int, default=CandidateSearch.branch_jitter)
+    parser.add_argument("--enemy-jitter", type=int, default=CandidateSearch.enemy_jitter)
+    parser.add_argument(
+        "--weight",
+        type=parse_weight,
+        action="append",
+        default=[],
+        metavar="METRIC=WEIGHT",
+        help=f"Override a metric weight; negative weights prefer smaller values ({', '.join(METRICS)}).",
+    )
+    parser.add_argument("--output-dir", help="Write each reported candidate's spec as <spec>.candidateNNNNN.json.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    search = CandidateSearch(
+        args.spec, args.seed, args.move_chance, args.room_jitter, args.branch_jitter, args.enemy_jitter
+    )
+    weights = {**DEFAULT_WEIGHTS, **dict(args.weight)}
+    started = time.perf_counter()
+    try:
+        report = search_candidates(search, args.count, args.top, weights, args.jobs)
+    except (FloorSpecError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    valid = report.searched - sum(report.pruned.values())
+    pruned = ", ".join(f"{report.pruned[stage]} at {stage}" for stage in PRUNE_STAGES if report.pruned[stage])
+    print(f"Authored: {format_metrics(report.baseline)}  score={score(report.baseline, report.baseline, weights):.3f}")
+    print(
+        f"Searched {report.searched} candidates in {elapsed:.1f}s "
+        f"({report.searched / elapsed if elapsed else float('inf'):.0f}/s): {valid} valid"
+        + (f", pruned {pruned}" if pruned else "")
+    )
+    stem = Path(args.spec).stem
+    for rank, (value, result) in enumerate(report.ranked, start=1):
+        print(f"{rank:>3}. candidate {result.index:>5}  score={value:.3f}  {format_metrics(result.metrics)}")
+        if args.output_dir:
+            write_candidate(search, result.index, Path(args.output_dir) / f"{stem}.candidate{result.index:05d}.json")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
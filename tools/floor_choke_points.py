@@ -0,0 +1,247 @@
+"""Choke cells and bridges of a floor's walkable graph, written as a JSON sidecar next to a floor JSON.
+
+One iterative Tarjan depth-first search from the player start numbers every
+reachable cell in preorder and records its low-link. A cell other than the
+start is a choke cell (an articulation point) when some DFS child cannot
+climb above it; blocking the cell cuts that child's whole subtree off from
+the start. Subtrees are contiguous preorder ranges, so "does blocking this
+cell cut that target off" is a range check instead of a BFS with the cell
+walled up. An edge to a child whose low-link stays below the child itself is
+a bridge: a one-cell-wide corridor step with no way around it.
+
+The report lists every choke cell with how many cells it separates, the
+gate sitting on it (a closed puzzle gate or an enemy) and the entities it
+cuts off. Gates that sit on no choke cell can be walked around on their own.
+The start cell is never a choke cell: the player already stands past it.
+Walls come from the floor's ``wall`` layer; gates are not obstacles.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor_flow_fields import model_dimensions
+    from tools.floor_json import layer_cells, replace_atomically
+    from tools.floor_reachability import walkable_mask_from_walls
+    from tools.gate_reachability import Gate, gates_from_model
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_flow_fields import model_dimensions
+    from floor_json import layer_cells, replace_atomically
+    from floor_reachability import walkable_mask_from_walls
+    from gate_reachability import Gate, gates_from_model
+
+CHOKE_POINTS_FORMAT_VERSION = 1
+CHOKE_POINTS_SUFFIX = ".chokes.json"
+
+
+@dataclass(frozen=True)
+class ChokePoint:
+    x: int
+    y: int
+    # Cells the start can no longer reach once this cell is blocked.
+    separated: int
+    gate_id: str | None = None
+    gate_kind: str | None = None
+    # Ids of the entities inside the separated cells, in model order.
+    cuts_off: tuple[str, ...] = ()
+
+
+def choke_points_path(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.chokes.json``."""
+    return json_path.with_suffix(CHOKE_POINTS_SUFFIX)
+
+
+class ChokeAnalysis:
+    """Articulation points and bridges of the cells reachable from ``start``."""
+
+    def __init__(self, mask: bytes | bytearray, width: int, height: int, start: tuple[int, int]) -> None:
+        self.width = width
+        self.height = height
+        self.start = start
+        size = width * height
+        self._preorder = [-1] * size
+        # One past the preorder number of the last cell in each cell's subtree.
+        self._subtree_end = [0] * size
+        # Choke cell -> the children whose subtrees it cuts off.
+        self._cut_children: dict[int, list[int]] = {}
+        self._bridges: list[tuple[int, int]] = []
+        x, y = start
+        if 0 <= x < width and 0 <= y < height and mask[y * width + x]:
+            self._search(mask, y * width + x)
+
+    def _neighbours(self, mask: bytes | bytearray, index: int) -> list[int]:
+        width = self.width
+        x = index % width
+        cells = []
+        if index >= width and mask[index - width]:
+            cells.append(index - width)
+        if x > 0 and mask[index - 1]:
+            cells.append(index - 1)
+        if x + 1 < width and mask[index + 1]:
+            cells.append(index + 1)
+        if index + width < len(mask) and mask[index + width]:
+            cells.append(index + width)
+        return cells
+
+    def _search(self, mask: bytes | bytearray, root: int) -> None:
+        preorder = self._preorder
+        low = [0] * len(preorder)
+        preorder[root] = 0
+        counter = 1
+        # (cell, DFS parent, neighbours still to visit); popping from the end keeps it iterative.
+        stack = [(root, -1, self._neighbours(mask, root))]
+        while stack:
+            cell, parent, pending = stack[-1]
+            if pending:
+                following = pending.pop()
+                if preorder[following] == -1:
+                    preorder[following] = low[following] = counter
+                    counter += 1
+                    stack.append((following, cell, self._neighbours(mask, following)))
+                elif following != parent and preorder[following] < low[cell]:
+                    low[cell] = preorder[following]
+                continue
+            stack.pop()
+            self._subtree_end[cell] = counter
+            if parent == -1:
+                continue
+            if low[cell] < low[parent]:
+                low[parent] = low[cell]
+            if low[cell] >= preorder[parent] and parent != root:
+                self._cut_children.setdefault(parent, []).append(cell)
+            if low[cell] > preorder[parent]:
+                self._bridges.append((parent, cell))
+
+    def _cell(self, index: int) -> tuple[int, int]:
+        return index % self.width, index // self.width
+
+    def _index(self, cell: tuple[int, int]) -> int | None:
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    @property
+    def choke_cells(self) -> list[tuple[int, int]]:
+        """Every choke cell, row-major."""
+        return [self._cell(index) for index in sorted(self._cut_children)]
+
+    @property
+    def bridges(self) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """Every bridge as ``(cell nearer the start, cell beyond it)``, row-major by the nearer cell."""
+        return [(self._cell(a), self._cell(b)) for a, b in sorted(self._bridges)]
+
+    def is_choke(self, cell: tuple[int, int]) -> bool:
+        return self._index(cell) in self._cut_children
+
+    def separated_count(self, cell: tuple[int, int]) -> int:
+        """Number of cells the start loses once ``cell`` is blocked; 0 for anything but a choke cell."""
+        children = self._cut_children.get(self._index(cell), ())
+        return sum(self._subtree_end[child] - self._preorder[child] for child in children)
+
+    def cuts_off(self, cell: tuple[int, int], target: tuple[int, int]) -> bool:
+        """True when blocking ``cell`` leaves ``target`` unreachable from the start while it was reachable."""
+        target_index = self._index(target)
+        if target_index is None or self._preorder[target_index] == -1:
+            return False
+        number = self._preorder[target_index]
+        return any(
+            self._preorder[child] <= number < self._subtree_end[child]
+            for child in self._cut_children.get(self._index(cell), ())
+        )
+
+    def separated_cells(self, cell: tuple[int, int]) -> list[tuple[int, int]]:
+        """The cells counted by :meth:`separated_count`, row-major."""
+        return [
+            self._cell(index)
+            for index, number in enumerate(self._preorder)
+            if number != -1 and self.cuts_off(cell, self._cell(index))
+        ]
+
+    def bypassed_gates(self, gates: list[Gate]) -> list[Gate]:
+        """Gates that block nothing on their own: the start can walk around them."""
+        return [gate for gate in gates if not self.is_choke(gate.position)]
+
+
+def _entity_positions(model: dict) -> list[tuple[str, tuple[int, int]]]:
+    return [
+        (entity["id"], (entity["position"]["x"], entity["position"]["y"]))
+        for entities in model["entities"].values()
+        if isinstance(entities, list)
+        for entity in entities
+        if isinstance(entity, dict) and "id" in entity and "position" in entity
+    ]
+
+
+def analyze_model(
+    model: dict,
+    width: int | None = None,
+    height: int | None = None,
+) -> tuple[ChokeAnalysis, list[ChokePoint]]:
+    """Analyse ``model`` from its player start and describe every choke cell."""
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), width, height)
+    start = model["floor_metadata"]["player_start"]
+    analysis = ChokeAnalysis(mask, width, height, (start["x"], start["y"]))
+
+    gates = {gate.position: gate for gate in reversed(gates_from_model(model))}
+    entities = _entity_positions(model)
+    points = []
+    for cell in analysis.choke_cells:
+        gate = gates.get(cell)
+        points.append(
+            ChokePoint(
+                cell[0],
+                cell[1],
+                analysis.separated_count(cell),
+                gate.id if gate else None,
+                gate.kind if gate else None,
+                tuple(entity_id for entity_id, position in entities if analysis.cuts_off(cell, position)),
+            )
+        )
+    return analysis, points
+
+
+def choke_points_to_json(analysis: ChokeAnalysis, points: list[ChokePoint], gates: list[Gate]) -> dict:
+    return {
+        "format_version": CHOKE_POINTS_FORMAT_VERSION,
+        "width": analysis.width,
+        "height": analysis.height,
+        "start": {"x": analysis.start[0], "y": analysis.start[1]},
+        "choke_points": [
+            {
+                "x": point.x,
+                "y": point.y,
+                "separated": point.separated,
+                "gate": None if point.gate_id is None else {"id": point.gate_id, "kind": point.gate_kind},
+                "cuts_off": list(point.cuts_off),
+            }
+            for point in points
+        ],
+        "bridges": [[a[0], a[1], b[0], b[1]] for a, b in analysis.bridges],
+        "bypassed_gates": [gate.id for gate in analysis.bypassed_gates(gates)],
+    }
+
+
+def write_choke_points(
+    model: dict,
+    output_path: Path,
+    width: int | None = None,
+    height: int | None = None,
+) -> None:
+    analysis, points = analyze_model(model, width, height)
+    data = choke_points_to_json(analysis, points, gates_from_model(model))
+    with replace_atomically(output_path) as temp_file:
+        temp_file.write(json.dumps(data, indent=2) + "\n")
+
+
+def read_choke_points(path: Path) -> dict:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    version = data.get("format_version")
+    if version != CHOKE_POINTS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported choke point format_version {version!r}")
+    return data
@@ -0,0 +1,170 @@
+"""Split a floor into fixed-size chunk files plus an index for streamed loading.
+
+``write_floor_chunks`` writes ``<floor>.chunks/`` next to the floor JSON::
+
+    index.json          chunk size, floor size, floor_metadata and one entry per chunk
+    chunk_<cx>_<cy>.json
+
+Each chunk file is an ordinary floor JSON (either schema) holding only the
+tiles and entities inside its square, with tile coordinates left absolute so
+a chunk can be applied straight onto the floor's TileMap. Index entries carry
+the chunk bounds, per-layer tile and per-kind entity counts, and the chunk
+file's SHA-256, so a loader can decide what to fetch around the player without
+opening any chunk. Chunks with no tiles and no entities are not written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+try:
+    from tools.floor_flow_fields import model_dimensions
+    from tools.floor_json import SCHEMA_V1, dumps_floor_json, iter_tile_layer, replace_atomically
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_flow_fields import model_dimensions
+    from floor_json import SCHEMA_V1, dumps_floor_json, iter_tile_layer, replace_atomically
+
+CHUNK_INDEX_FORMAT_VERSION = 1
+CHUNK_DIRECTORY_SUFFIX = ".chunks"
+CHUNK_INDEX_NAME = "index.json"
+DEFAULT_CHUNK_SIZE = 32
+
+
+def chunk_directory(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.chunks``."""
+    return json_path.with_suffix(CHUNK_DIRECTORY_SUFFIX)
+
+
+def chunk_index_path(json_path: Path) -> Path:
+    return chunk_directory(json_path) / CHUNK_INDEX_NAME
+
+
+def chunk_file_name(chunk: tuple[int, int]) -> str:
+    return f"chunk_{chunk[0]}_{chunk[1]}.json"
+
+
+def split_floor(model: Mapping, chunk_size: int, width: int, height: int) -> dict[tuple[int, int], dict]:
+    """Bucket every tile and positioned entity of ``model`` by ``(x // chunk_size, y // chunk_size)``.
+
+    Returns chunk models in row-major chunk order; empty chunks are left out.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+    layer_names = list(model["tile_layers"])
+    entity_keys = list(model["entities"])
+    chunks: dict[tuple[int, int], dict] = {}
+
+    def chunk_for(x: int, y: int, what: str) -> dict:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"{what} at {(x, y)} is outside the {width}x{height} floor")
+        key = (x // chunk_size, y // chunk_size)
+        chunk = chunks.get(key)
+        if chunk is None:
+            chunk = chunks[key] = {
+                "schema_version": SCHEMA_V1,
+                "chunk": {"x": key[0], "y": key[1], "size": chunk_size},
+                "tile_layers": {name: [] for name in layer_names},
+                "entities": {entity_key: [] for entity_key in entity_keys},
+            }
+        return chunk
+
+    for name in layer_names:
+        for tile in iter_tile_layer(model["tile_layers"][name]):
+            chunk_for(tile["x"], tile["y"], f"{name} tile")["tile_layers"][name].append(tile)
+    for entity_key in entity_keys:
+        for entity in model["entities"][entity_key]:
+            position = entity.get("position")
+            if position is None:
+                raise ValueError(f"Entity {entity.get('id', '?')!r} in {entity_key} has no position to chunk by")
+            chunk_for(position["x"], position["y"], entity.get("id", entity_key))["entities"][entity_key].append(entity)
+    return {key: chunks[key] for key in sorted(chunks, key=lambda key: (key[1], key[0]))}
+
+
+def _index_entry(key: tuple[int, int], chunk: dict, chunk_size: int, width: int, height: int, digest: str) -> dict:
+    left, top = key[0] * chunk_size, key[1] * chunk_size
+    return {
+        "x": key[0],
+        "y": key[1],
+        "file": chunk_file_name(key),
+        "bounds": {
+            "left": left,
+            "top": top,
+            "right": min(left + chunk_size, width) - 1,
+            "bottom": min(top + chunk_size, height) - 1,
+        },
+        "tiles": {name: len(tiles) for name, tiles in chunk["tile_layers"].items() if tiles},
+        "entities": {kind: len(entities) for kind, entities in chunk["entities"].items() if entities},
+        "sha256": digest,
+    }
+
+
+def write_floor_chunks(
+    model: Mapping,
+    json_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    schema_version: str = SCHEMA_V1,
+    width: int | None = None,
+    height: int | None = None,
+) -> Path:
+    """Write ``model`` as chunk files plus ``index.json`` under ``chunk_directory(json_path)``.
+
+    Each file is replaced atomically and the index is written last, so a
+    loader that reads the index first never sees a chunk list pointing at
+    missing files. Chunk files left over from an earlier, larger split are
+    removed. Returns the index path.
+    """
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    directory = chunk_directory(json_path)
+    chunks = split_floor(model, chunk_size, width, height)
+
+    entries = []
+    for key, chunk in chunks.items():
+        text = dumps_floor_json(chunk, schema_version)
+        with replace_atomically(directory / chunk_file_name(key)) as temp_file:
+            temp_file.write(text)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        entries.append(_index_entry(key, chunk, chunk_size, width, height, digest))
+
+    index = {
+        "format_version": CHUNK_INDEX_FORMAT_VERSION,
+        "schema_version": schema_version,
+        "chunk_size": chunk_size,
+        "width": width,
+        "height": height,
+        "floor_metadata": model["floor_metadata"],
+        "chunks": entries,
+    }
+    index_path = directory / CHUNK_INDEX_NAME
+    with replace_atomically(index_path) as temp_file:
+        temp_file.write(json.dumps(index, indent=2) + "\n")
+
+    written = {entry["file"] for entry in entries}
+    for stale in directory.glob("chunk_*_*.json"):
+        if stale.name not in written:
+            stale.unlink()
+    return index_path
+
+
+def load_chunk_index(path: Path) -> dict:
+    index = json.loads(Path(path).read_text(encoding="utf-8"))
+    version = index.get("format_version")
+    if version != CHUNK_INDEX_FORMAT_VERSION:
+        raise ValueError(f"Unsupported chunk index format_version {version!r} in {path}")
+    return index
+
+
+def chunks_near(index: Mapping, cell: tuple[int, int], radius: int) -> list[dict]:
+    """Index entries of the chunks overlapping the square of ``radius`` cells around ``cell``."""
+    x, y = cell
+    return [
+        entry
+        for entry in index["chunks"]
+        if entry["bounds"]["left"] <= x + radius
+        and entry["bounds"]["right"] >= x - radius
+        and entry["bounds"]["top"] <= y + radius
+        and entry["bounds"]["bottom"] >= y - radius
+    ]
@@ -0,0 +1,241 @@
+"""Precomputed BFS flow fields written as a packed binary sidecar next to a floor JSON.
+
+One field is built per source (the player start, every stair and every NPC).
+For each cell a field stores the step distance to its source and the direction
+of the first step along a shortest path, so runtime chase and auto-walk logic
+can read the next cell in O(1) instead of searching.
+
+File layout, all little-endian::
+
+    magic b"SFFL", u16 version, u16 distance_bytes, u32 width, u32 height, u32 field_count
+    per field:
+        u16 id_length, id (UTF-8), i32 source_x, i32 source_y
+        width * height distances (u16 or u32; all ones = unreachable)
+        ceil(width * height / 4) direction bytes, 2 bits per cell, LSB first
+
+Directions are :data:`DIRECTIONS` indices. They are meaningful only for
+reachable cells other than the source. Walls come from the floor's ``wall``
+layer; gates and enemies are not obstacles, since they open at runtime.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor_json import layer_cells, replace_atomically
+    from tools.floor_reachability import walkable_mask_from_walls
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_json import layer_cells, replace_atomically
+    from floor_reachability import walkable_mask_from_walls
+
+FLOW_FIELD_MAGIC = b"SFFL"
+FLOW_FIELD_VERSION = 1
+FLOW_FIELD_SUFFIX = ".flow.bin"
+
+# (dx, dy) of the first step, indexed by the 2-bit direction code.
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+EAST, WEST, SOUTH, NORTH = range(4)
+
+_HEADER = struct.Struct("<4sHHIII")
+_DISTANCE_TYPECODES = {2: "H", 4: "I"}
+
+
+def flow_field_path(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.flow.bin``."""
+    return json_path.with_suffix(FLOW_FIELD_SUFFIX)
+
+
+def bfs_flow(mask: bytes | bytearray, width: int, source: int) -> tuple[array, bytearray]:
+    """Distances from ``source`` and, per cell, the direction code of the step back towards it.
+
+    Cells are reached from the neighbour that dequeued them, so that neighbour
+    is always one step closer; the code records the step from the cell to it.
+    Unreached cells keep distance ``-1``.
+    """
+    size = len(mask)
+    distance = array("i", [-1]) * size
+    directions = bytearray(size)
+    if not mask[source]:
+        return distance, directions
+    distance[source] = 0
+    queue = [source]
+    head = 0
+    while head < len(queue):
+        index = queue[head]
+        head += 1
+        step = distance[index] + 1
+        x = index % width
+        if x + 1 < width and mask[index + 1] and distance[index + 1] < 0:
+            distance[index + 1] = step
+            directions[index + 1] = WEST
+            queue.append(index + 1)
+        if x > 0 and mask[index - 1] and distance[index - 1] < 0:
+            distance[index - 1] = step
+            directions[index - 1] = EAST
+            queue.append(index - 1)
+        below = index + width
+        if below < size and mask[below] and distance[below] < 0:
+            distance[below] = step
+            directions[below] = NORTH
+            queue.append(below)
+        above = index - width
+        if above >= 0 and mask[above] and distance[above] < 0:
+            distance[above] = step
+            directions[above] = SOUTH
+            queue.append(above)
+    return distance, directions
+
+
+def pack_directions(directions: bytes | bytearray) -> bytes:
+    codes = bytearray(directions)
+    codes.extend(bytes(-len(codes) % 4))
+    # Codes are at most 3, so the shifted planes never overlap inside a byte.
+    packed = sum(int.from_bytes(codes[lane::4], "little") << (2 * lane) for lane in range(4))
+    return packed.to_bytes(len(codes) // 4, "little")
+
+
+def unpack_direction(packed: bytes, index: int) -> int:
+    return packed[index >> 2] >> ((index & 3) * 2) & 3
+
+
+@dataclass(frozen=True)
+class FlowField:
+    id: str
+    source: tuple[int, int]
+    distances: array
+    directions: bytes
+    width: int
+    unreachable: int
+
+    def distance(self, cell: tuple[int, int]) -> int | None:
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < len(self.distances) // self.width):
+            return None
+        value = self.distances[y * self.width + x]
+        return None if value == self.unreachable else value
+
+    def next_step(self, cell: tuple[int, int]) -> tuple[int, int] | None:
+        """The neighbour one step closer to the source, or ``None`` at the source or off the field."""
+        if not self.distance(cell):
+            return None
+        x, y = cell
+        dx, dy = DIRECTIONS[unpack_direction(self.directions, y * self.width + x)]
+        return x + dx, y + dy
+
+
+def model_dimensions(model: dict) -> tuple[int, int]:
+    """Footprint of a floor: the extent of its ground layer."""
+    width = height = 0
+    for x, y in layer_cells(model["tile_layers"]["ground"]):
+        width = max(width, x + 1)
+        height = max(height, y + 1)
+    return width, height
+
+
+def flow_sources(model: dict) -> list[tuple[str, tuple[int, int]]]:
+    start = model["floor_metadata"]["player_start"]
+    sources = [("player_start", (start["x"], start["y"]))]
+    for key in ("stair_connections", "npc_spawns"):
+        for entity in model["entities"].get(key, []):
+            sources.append((entity["id"], (entity["position"]["x"], entity["position"]["y"])))
+    return sources
+
+
+def build_flow_fields(
+    model: dict,
+    width: int | None = None,
+    height: int | None = None,
+    sources: Iterable[tuple[str, tuple[int, int]]] | None = None,
+) -> list[FlowField]:
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), width, height)
+    fields = []
+    for field_id, (x, y) in flow_sources(model) if sources is None else sources:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"Flow field source {field_id} at {(x, y)} is outside the {width}x{height} floor")
+        distances, directions = bfs_flow(mask, width, y * width + x)
+        fields.append(FlowField(field_id, (x, y), distances, pack_directions(directions), width, -1))
+    return fields
+
+
+def _distance_bytes(fields: list[FlowField]) -> int:
+    longest = max((max(field.distances, default=0) for field in fields), default=0)
+    return 2 if longest < 0xFFFF else 4
+
+
+def _distance_payload(distances: array, distance_bytes: int) -> bytes:
+    """Little-endian u16/u32 distances; ``-1`` wraps to all ones, the unreachable marker."""
+    values = array("i", distances)
+    if sys.byteorder == "big":
+        values.byteswap()
+    raw = values.tobytes()
+    if distance_bytes == 4:
+        return raw
+    # Every distance is below 0xFFFF here, so the low two bytes hold it whole.
+    narrow = bytearray(len(values) * 2)
+    narrow[0::2] = raw[0::4]
+    narrow[1::2] = raw[1::4]
+    return bytes(narrow)
+
+
+def encode_flow_fields(fields: list[FlowField], width: int, height: int) -> bytes:
+    distance_bytes = _distance_bytes(fields)
+    parts = [_HEADER.pack(FLOW_FIELD_MAGIC, FLOW_FIELD_VERSION, distance_bytes, width, height, len(fields))]
+    for field in fields:
+        encoded_id = field.id.encode("utf-8")
+        parts.append(struct.pack("<H", len(encoded_id)) + encoded_id)
+        parts.append(struct.pack("<ii", *field.source))
+        parts.append(_distance_payload(field.distances, distance_bytes))
+        parts.append(field.directions)
+    return b"".join(parts)
+
+
+def decode_flow_fields(data: bytes) -> list[FlowField]:
+    magic, version, distance_bytes, width, height, count = _HEADER.unpack_from(data, 0)
+    if magic != FLOW_FIELD_MAGIC:
+        raise ValueError("Not a flow field file")
+    if version != FLOW_FIELD_VERSION:
+        raise ValueError(f"Unsupported flow field version {version}")
+    typecode = _DISTANCE_TYPECODES[distance_bytes]
+    unreachable = (1 << (8 * distance_bytes)) - 1
+    cells = width * height
+    offset = _HEADER.size
+    fields = []
+    for _ in range(count):
+        (id_length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        field_id = data[offset:offset + id_length].decode("utf-8")
+        offset += id_length
+        source = struct.unpack_from("<ii", data, offset)
+        offset += 8
+        distances = array(typecode)
+        distances.frombytes(data[offset:offset + cells * distance_bytes])
+        if sys.byteorder == "big":
+            distances.byteswap()
+        offset += cells * distance_bytes
+        directions = bytes(data[offset:offset + (cells + 3) // 4])
+        offset += (cells + 3) // 4
+        fields.append(FlowField(field_id, source, distances, directions, width, unreachable))
+    return fields
+
+
+def write_flow_fields(model: dict, output_path: Path, width: int | None = None, height: int | None = None) -> int:
+    """Build every flow field for ``model`` and write them atomically; returns the field count."""
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    fields = build_flow_fields(model, width, height)
+    payload = encode_flow_fields(fields, width, height)
+    with replace_atomically(output_path, "wb") as temp_file:
+        temp_file.write(payload)
+    return len(fields)
+
+
+def read_flow_fields(path: Path) -> dict[str, FlowField]:
+    return {field.id: field for field in decode_flow_fields(Path(path).read_bytes())}
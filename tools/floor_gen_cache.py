@@ -0,0 +1,200 @@
+"""Content-addressed cache that lets the floor generators skip unchanged floors."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+from types import ModuleType
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent / ".floor_gen_cache.json"
+
+# Floor spec files the generators compile; every floor's key covers all of them.
+SHARED_GENERATOR_DATA = "floor_specs"
+
+
+def sha256_file(path: Path) -> str | None:
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_path(path: Path) -> str | None:
+    """SHA-256 of a file, or of every file under a directory (names and contents); None when missing."""
+    if not path.is_dir():
+        return sha256_file(path)
+    digest = hashlib.sha256()
+    for child in sorted(child for child in path.rglob("*") if child.is_file()):
+        digest.update(child.relative_to(path).as_posix().encode("utf-8") + b"\0")
+        digest.update((sha256_file(child) or "").encode("ascii"))
+    return digest.hexdigest()
+
+
+def generator_sources(module: ModuleType) -> list[Path]:
+    """The generator's source and every tools/ module it uses, directly or through another one.
+
+    Modules are found by following the generator's globals: imported modules
+    and the modules that define imported functions, classes and objects. The
+    result does not depend on what else the process has imported.
+    """
+    tools_dir = Path(__file__).resolve().parent
+    sources: set[Path] = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        file_name = getattr(current, "__file__", None)
+        if file_name is None:
+            continue
+        path = Path(file_name).resolve()
+        if path in sources or path.parent != tools_dir:
+            continue
+        sources.add(path)
+        for value in vars(current).values():
+            used = value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, "__module__", None) or "")
+            if used is not None:
+                pending.append(used)
+    return sorted(sources)
+
+
+def _is_layout_value(value: object) -> bool:
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return True
+    if isinstance(value, dict):
+        return all(_is_layout_value(key) and _is_layout_value(item) for key, item in value.items())
+    if isinstance(value, (tuple, list)):
+        return all(_is_layout_value(item) for item in value)
+    return False
+
+
+def _constant_value(value: object) -> object:
+    if isinstance(value, dict):
+        return {repr(key): _constant_value(item) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [_constant_value(item) for item in value]
+    return value
+
+
+def layout_constants(module: ModuleType) -> dict[str, object]:
+    """Upper-case module globals holding layout numbers, positions and entity tables."""
+    return {
+        name: _constant_value(value)
+        for name, value in sorted(vars(module).items())
+        if name.isupper() and _is_layout_value(value)
+    }
+
+
+def generator_key(module: ModuleType, floor_label: str) -> str:
+    """Hash of everything that determines one floor's output.
+
+    The key covers the sources from :func:`generator_sources`, the floor
+    spec files, the module's layout constants and entity tables, and the
+    floor label.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_FORMAT_VERSION}\0{floor_label}\0".encode("utf-8"))
+    tools_dir = Path(__file__).resolve().parent
+    sources = (*generator_sources(module), *sorted((tools_dir / SHARED_GENERATOR_DATA).glob("*.json")))
+    for source in sources:
+        digest.update(source.name.encode("utf-8") + b"\0")
+        digest.update(source.read_bytes() if source.is_file() else b"<missing>")
+    digest.update(json.dumps(layout_constants(module), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class GenerationCache:
+    """Records, per output file, the generator key and the hashes of what was written.
+
+    A floor is fresh when its key matches and the files on disk still hash to
+    what was recorded, so hand edits or deleted outputs force a rebuild.
+    A directory sidecar (the chunk split) is hashed file by file.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, enabled: bool = True, force: bool = False) -> None:
+        self.path = path
+        self.enabled = enabled
+        self.force = force
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+        self.entries: dict[str, dict[str, str | None]] = {}
+        if enabled and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == CACHE_FORMAT_VERSION:
+                self.entries = data.get("entries", {})
+
+    @staticmethod
+    def _entry_name(output_path: Path) -> str:
+        return str(output_path.resolve())
+
+    @staticmethod
+    def _sidecar_hashes(sidecars: tuple[Path, ...]) -> dict[str, str | None]:
+        return {path.name: sha256_path(path) for path in sidecars}
+
+    def is_fresh(
+        self,
+        label: str,
+        key: str,
+        output_path: Path,
+        floor_def: Path | None = None,
+        sidecars: tuple[Path, ...] = (),
+    ) -> bool:
+        """Check (and count) whether ``output_path`` and its sidecars can be reused for ``key``."""
+        entry = self.entries.get(self._entry_name(output_path))
+        fresh = (
+            self.enabled
+            and not self.force
+            and entry is not None
+            and entry.get("key") == key
+            and entry.get("output_sha256") == sha256_file(output_path)
+            and (floor_def is None or entry.get("floor_def_sha256") == sha256_file(floor_def))
+            and entry.get("sidecar_sha256", {}) == self._sidecar_hashes(sidecars)
+        )
+        (self.hits if fresh else self.misses).append(label)
+        return fresh
+
+    def record(
+        self,
+        key: str,
+        output_path: Path,
+        floor_def: Path | None = None,
+        sidecars: tuple[Path, ...] = (),
+    ) -> None:
+        if not self.enabled:
+            return
+        self.entries[self._entry_name(output_path)] = {
+            "key": key,
+            "output_sha256": sha256_file(output_path),
+            "floor_def_sha256": sha256_file(floor_def) if floor_def is not None else None,
+            "sidecar_sha256": self._sidecar_hashes(sidecars),
+        }
+
+    def save(self) -> None:
+        if not self.enabled:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"version": CACHE_FORMAT_VERSION, "entries": self.entries}, indent=2, sort_keys=True)
+        handle, temp_name = tempfile.mkstemp(prefix=self.path.name, dir=self.path.parent)
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                temp_file.write(payload + "\n")
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    def summary(self) -> str:
+        if not self.enabled:
+            return "Generation cache: disabled"
+        hits = ", ".join(self.hits) or "none"
+        misses = ", ".join(self.misses) or "none"
+        return f"Generation cache: {len(self.hits)} hit(s) [{hits}], {len(self.misses)} miss(es) [{misses}]"
@@ -0,0 +1,549 @@
+"""Read and write floor JSON in schema 1.0 (per-cell tile dicts) or 2.0 (compact tile layers).
+
+Schema 2.0 keeps ``floor_metadata`` and ``entities`` exactly as in 1.0 and only
+changes ``tile_layers``. Each layer becomes an object holding one group per
+``(tile, alt)`` pair, encoded either as row runs or as a base64 bitset::
+
+    "wall": {
+      "encoding": "runs",
+      "groups": [{"tile": "generic", "runs": "0:0+60;1:0+1,59+1;..."}]
+    }
+
+    "wall": {
+      "encoding": "bitset",
+      "groups": [{"tile": "generic", "origin": [0, 0], "size": [60, 60], "bits": "..."}]
+    }
+
+``runs`` lists every row that holds the tile as ``y:x+length,x+length``, rows
+separated by ``;``. ``bits`` covers the ``size`` box at ``origin`` row-major,
+least significant bit first. Decoding yields each group's tiles in row-major
+order, one group after another.
+
+Both schemas are written by :func:`write_floor_json`, which streams the
+indent-2 text straight to a temp file and renames it over the target.
+:class:`FloorJsonReader` reads that text back piecemeal, so tools that only
+need the metadata or a few entity lists skip the tile layers entirely.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor_profiler import profile_iter, profile_phase
+    from tools.floor_reachability import pack_flags
+    from tools.maze_grid import WALL, WallGrid
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_profiler import profile_iter, profile_phase
+    from floor_reachability import pack_flags
+    from maze_grid import WALL, WallGrid
+
+SCHEMA_V1 = "1.0"
+SCHEMA_V2 = "2.0"
+SCHEMA_VERSIONS = (SCHEMA_V1, SCHEMA_V2)
+
+RUNS_ENCODING = "runs"
+BITSET_ENCODING = "bitset"
+LAYER_ENCODINGS = (RUNS_ENCODING, BITSET_ENCODING)
+
+# _BIT_PLANES[k] maps a packed byte to its k-th bit.
+_BIT_PLANES = tuple(bytes((value >> bit) & 1 for value in range(256)) for bit in range(8))
+
+_WALL_RUN = re.compile(re.escape(bytes([WALL])) + b"+")
+
+# Serialized items are buffered into chunks of about this many characters.
+WRITE_CHUNK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class CellLayer:
+    """A schema 1.0 tile layer given as positions sharing one tile name.
+
+    The streaming writer formats each cell straight from its ``(x, y)`` pair,
+    so no per-cell dict is built. ``cells`` must be re-iterable.
+    """
+
+    tile: str
+    cells: Iterable[tuple[int, int]]
+
+
+def _grid_runs(grid: WallGrid) -> str:
+    rows = []
+    for y in range(grid.height):
+        runs = [f"{match.start()}+{match.end() - match.start()}" for match in _WALL_RUN.finditer(grid.row(y))]
+        if runs:
+            rows.append(f"{y}:{','.join(runs)}")
+    return ";".join(rows)
+
+
+def encode_runs(cells: Iterable[tuple[int, int]]) -> str:
+    if isinstance(cells, WallGrid):
+        return _grid_runs(cells)
+    rows: list[str] = []
+    current_y = None
+    runs: list[str] = []
+    run_start = run_end = 0
+    for x, y in sorted(set(cells), key=lambda cell: (cell[1], cell[0])):
+        if y == current_y and x == run_end:
+            run_end += 1
+            continue
+        if current_y is not None:
+            runs.append(f"{run_start}+{run_end - run_start}")
+            if y != current_y:
+                rows.append(f"{current_y}:{','.join(runs)}")
+                runs = []
+        current_y, run_start, run_end = y, x, x + 1
+    if current_y is not None:
+        runs.append(f"{run_start}+{run_end - run_start}")
+        rows.append(f"{current_y}:{','.join(runs)}")
+    return ";".join(rows)
+
+
+def decode_runs(text: str) -> Iterator[tuple[int, int]]:
+    if not text:
+        return
+    for row in text.split(";"):
+        y_text, _, runs = row.partition(":")
+        y = int(y_text)
+        for run in runs.split(","):
+            start, _, length = run.partition("+")
+            x = int(start)
+            for cell_x in range(x, x + int(length)):
+                yield cell_x, y
+
+
+def _grid_flags(grid: WallGrid) -> tuple[int, int, int, int, bytearray]:
+    """Bounding box and row-major 0/1 flags of a grid's walls, straight from its bytes."""
+    stride = grid.width
+    top = grid.cells.find(WALL) // stride
+    bottom = grid.cells.rfind(WALL) // stride
+    # OR-ing the rows as integers leaves a non-zero byte in every column that holds a wall.
+    columns = 0
+    for y in range(top, bottom + 1):
+        columns |= int.from_bytes(grid.cells[y * stride:(y + 1) * stride], "little")
+    occupied = columns.to_bytes(stride, "little")
+    left = len(occupied) - len(occupied.lstrip(b"\x00"))
+    right = len(occupied.rstrip(b"\x00")) - 1
+    flags = bytearray().join(
+        grid.cells[y * stride + left:y * stride + right + 1] for y in range(top, bottom + 1)
+    )
+    return left, top, right - left + 1, bottom - top + 1, flags
+
+
+def encode_bitset(cells: Iterable[tuple[int, int]]) -> dict:
+    if isinstance(cells, WallGrid):
+        if not cells:
+            return {"origin": [0, 0], "size": [0, 0], "bits": ""}
+        left, top, width, height, flags = _grid_flags(cells)
+        flags.extend(bytes(-len(flags) % 8))
+    else:
+        cells = set(cells)
+        if not cells:
+            return {"origin": [0, 0], "size": [0, 0], "bits": ""}
+        left = min(x for x, _ in cells)
+        top = min(y for _, y in cells)
+        width = max(x for x, _ in cells) - left + 1
+        height = max(y for _, y in cells) - top + 1
+
+        flags = bytearray(-(-width * height // 8) * 8)
+        for x, y in cells:
+            flags[(y - top) * width + x - left] = 1
+    bits = pack_flags(flags).to_bytes(len(flags) // 8, "little")
+    return {
+        "origin": [left, top],
+        "size": [width, height],
+        "bits": base64.b64encode(bits).decode("ascii"),
+    }
+
+
+def decode_bitset(group: dict) -> Iterator[tuple[int, int]]:
+    left, top = group["origin"]
+    width, height = group["size"]
+    if width <= 0 or height <= 0:
+        return
+    packed = base64.b64decode(group["bits"])
+    flags = bytearray(len(packed) * 8)
+    for bit, plane in enumerate(_BIT_PLANES):
+        flags[bit::8] = packed.translate(plane)
+    index = flags.find(1, 0, width * height)
+    while index != -1:
+        yield left + index % width, top + index // width
+        index = flags.find(1, index + 1, width * height)
+
+
+def _group_cells(tiles: Iterable[dict] | CellLayer) -> dict[tuple[str, int], Iterable[tuple[int, int]]]:
+    if isinstance(tiles, CellLayer):
+        return {(tiles.tile, 0): tiles.cells}
+    groups: dict[tuple[str, int], list[tuple[int, int]]] = {}
+    for tile in tiles:
+        groups.setdefault((tile["tile"], tile.get("alt", 0)), []).append((tile["x"], tile["y"]))
+    return groups
+
+
+def _group_header(tile: str, alt: int) -> dict:
+    return {"tile": tile, "alt": alt} if alt else {"tile": tile}
+
+
+def encode_tile_layer(tiles: Iterable[dict] | CellLayer, encoding: str | None = None) -> dict:
+    """Encode one schema 1.0 tile list; ``encoding=None`` picks the smaller form.
+
+    A :class:`CellLayer` over a ``WallGrid`` is encoded from the grid's bytes.
+    """
+    groups = _group_cells(tiles)
+    if encoding is None:
+        runs = _encode_groups(groups, RUNS_ENCODING)
+        bitset = _encode_groups(groups, BITSET_ENCODING)
+        return min((runs, bitset), key=lambda layer: len(json.dumps(layer)))
+    return _encode_groups(groups, encoding)
+
+
+def _encode_groups(groups: dict[tuple[str, int], Iterable[tuple[int, int]]], encoding: str) -> dict:
+    if encoding == RUNS_ENCODING:
+        encoded = [{**_group_header(*key), "runs": encode_runs(cells)} for key, cells in groups.items()]
+    elif encoding == BITSET_ENCODING:
+        encoded = [{**_group_header(*key), **encode_bitset(cells)} for key, cells in groups.items()]
+    else:
+        raise ValueError(f"Unknown tile layer encoding '{encoding}'")
+    return {"encoding": encoding, "groups": encoded}
+
+
+def iter_tile_layer(layer: list[dict] | dict) -> Iterator[dict]:
+    """Yield ``{"x", "y", "tile"[, "alt"]}`` dicts from a schema 1.0 or 2.0 layer."""
+    if isinstance(layer, CellLayer):
+        for x, y in layer.cells:
+            yield {"x": x, "y": y, "tile": layer.tile}
+        return
+    if not isinstance(layer, Mapping):
+        yield from layer
+        return
+    encoding = layer.get("encoding")
+    if encoding not in LAYER_ENCODINGS:
+        raise ValueError(f"Unknown tile layer encoding '{encoding}'")
+    for group in layer.get("groups", []):
+        tile = group["tile"]
+        alt = group.get("alt", 0)
+        cells = decode_runs(group["runs"]) if encoding == RUNS_ENCODING else decode_bitset(group)
+        for x, y in cells:
+            yield {"x": x, "y": y, "tile": tile, "alt": alt} if alt else {"x": x, "y": y, "tile": tile}
+
+
+def layer_cells(layer: list[dict] | dict) -> Iterator[tuple[int, int]]:
+    """Just the ``(x, y)`` positions of a layer, without building tile dicts for v2 runs."""
+    if isinstance(layer, CellLayer):
+        yield from layer.cells
+    elif isinstance(layer, dict) and layer.get("encoding") == RUNS_ENCODING:
+        for group in layer.get("groups", []):
+            yield from decode_runs(group["runs"])
+    elif isinstance(layer, dict) and layer.get("encoding") == BITSET_ENCODING:
+        for group in layer.get("groups", []):
+            yield from decode_bitset(group)
+    else:
+        for tile in iter_tile_layer(layer):
+            yield tile["x"], tile["y"]
+
+
+def to_schema(model: dict, schema_version: str, encoding: str | None = None) -> dict:
+    """Return a shallow copy of ``model`` with its tile layers in ``schema_version``."""
+    if schema_version not in SCHEMA_VERSIONS:
+        raise ValueError(f"Unsupported floor schema_version '{schema_version}'")
+    layers = model.get("tile_layers", {})
+    if schema_version == SCHEMA_V2:
+        converted = {
+            name: encode_tile_layer(layer if isinstance(layer, CellLayer) else iter_tile_layer(layer), encoding)
+            for name, layer in layers.items()
+        }
+    else:
+        converted = {
+            name: layer if isinstance(layer, (list, CellLayer)) else list(iter_tile_layer(layer))
+            for name, layer in layers.items()
+        }
+    result = dict(model)
+    result["schema_version"] = schema_version
+    result["tile_layers"] = converted
+    return result
+
+
+def _indent(depth: int) -> str:
+    return "\n" + "  " * depth
+
+
+def _key_text(key: object) -> str:
+    return json.dumps(key if isinstance(key, str) else json.dumps(key).strip('"'))
+
+
+def _cell_layer_items(layer: CellLayer, depth: int) -> Iterator[str]:
+    outer = _indent(depth)
+    inner = _indent(depth + 1)
+    prefix = "{" + inner + '"x": '
+    middle = "," + inner + '"y": '
+    suffix = "," + inner + '"tile": ' + json.dumps(layer.tile) + outer + "}"
+    for x, y in layer.cells:
+        yield f"{prefix}{x}{middle}{y}{suffix}"
+
+
+def _scalar_text(value: object, strings: dict[str, str]) -> str | None:
+    """JSON text for a scalar, or ``None`` when ``value`` is a container."""
+    kind = type(value)
+    if kind is int:
+        return int.__repr__(value)
+    if kind is str:
+        text = strings.get(value)
+        if text is None:
+            text = strings[value] = json.dumps(value)
+        return text
+    if kind is bool or value is None or kind is float:
+        return json.dumps(value)
+    return None
+
+
+def _iter_items(values: Iterable, depth: int) -> Iterator[str]:
+    if isinstance(values, CellLayer):
+        yield from _cell_layer_items(values, depth)
+        return
+    outer = _indent(depth)
+    inner = _indent(depth + 1)
+    separator = "," + inner
+    # Tile and position dicts hold only scalars; format them in one pass and
+    # reuse the encoded key and string texts across the whole list.
+    strings: dict[str, str] = {}
+    for value in values:
+        if type(value) is dict and value:
+            fields = []
+            for key, item in value.items():
+                text = _scalar_text(item, strings)
+                if text is None or type(key) is not str:
+                    break
+                fields.append(_scalar_text(key, strings) + ": " + text)
+            else:
+                yield "{" + inner + separator.join(fields) + outer + "}"
+                continue
+        yield "".join(_iter_json(value, depth))
+
+
+def _iter_json(value: object, depth: int) -> Iterator[str]:
+    """Yield ``json.dumps(value, indent=2)`` text for ``value`` nested ``depth`` levels deep.
+
+    Lists, tuples, generators and :class:`CellLayer` values are consumed lazily.
+    """
+    if isinstance(value, Mapping):
+        if not value:
+            yield "{}"
+            return
+        separator = "{" + _indent(depth + 1)
+        for key, item in value.items():
+            yield separator + _key_text(key) + ": "
+            yield from _iter_json(item, depth + 1)
+            separator = "," + _indent(depth + 1)
+        yield _indent(depth) + "}"
+    elif isinstance(value, (str, int, float, bool)) or value is None:
+        yield json.dumps(value)
+    elif isinstance(value, (CellLayer, Iterable)):
+        separator = "[" + _indent(depth + 1)
+        chunk: list[str] = []
+        size = 0
+        for item in _iter_items(value, depth + 1):
+            chunk.append(separator)
+            chunk.append(item)
+            size += len(item)
+            separator = "," + _indent(depth + 1)
+            if size >= WRITE_CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+                size = 0
+        if separator[0] == "[":
+            yield "[]"
+            return
+        yield "".join(chunk) + _indent(depth) + "]"
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_floor_json(model: Mapping, schema_version: str = SCHEMA_V1) -> Iterator[str]:
+    """Stream ``model`` as indent-2 JSON text, ending with a newline.
+
+    The text is byte-identical to ``json.dumps(model, indent=2) + "\n"``.
+    """
+    if model.get("schema_version") != schema_version:
+        model = to_schema(model, schema_version)
+    yield from _iter_json(model, 0)
+    yield "\n"
+
+
+def dumps_floor_json(model: Mapping, schema_version: str = SCHEMA_V1) -> str:
+    return "".join(iter_floor_json(model, schema_version))
+
+
+def _new_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def replace_atomically(output_path: Path, mode: str = "w") -> Iterator:
+    """Yield a temp file next to ``output_path`` that is renamed over it on success.
+
+    Readers never see a partially written file, and an exception leaves the
+    previous file untouched. The target keeps its permissions.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    file_mode = output_path.stat().st_mode & 0o777 if output_path.exists() else _new_file_mode()
+    handle, temp_name = tempfile.mkstemp(prefix=f".{output_path.name}.", suffix=".tmp", dir=output_path.parent)
+    try:
+        with os.fdopen(handle, mode, encoding=None if "b" in mode else "utf-8") as temp_file:
+            yield temp_file
+        os.chmod(temp_name, file_mode)
+        os.replace(temp_name, output_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_floor_json(model: Mapping, output_path: Path, schema_version: str = SCHEMA_V1) -> None:
+    """Stream ``model`` to a temp file next to ``output_path`` and rename it into place."""
+    with replace_atomically(output_path) as temp_file:
+        for chunk in profile_iter("json encode", iter_floor_json(model, schema_version)):
+            with profile_phase("file write"):
+                temp_file.write(chunk)
+
+
+def load_floor_json(path: Path) -> dict:
+    """Load a schema 1.0 or 2.0 floor file as a schema 1.0 model."""
+    model = json.loads(Path(path).read_text(encoding="utf-8"))
+    version = model.get("schema_version", SCHEMA_V1)
+    if version not in SCHEMA_VERSIONS:
+        raise ValueError(f"Unsupported floor schema_version '{version}' in {path}")
+    return to_schema(model, SCHEMA_V1) if version != SCHEMA_V1 else model
+
+
+_DECODER = json.JSONDecoder()
+# Keys of the top-level object and of its sections, in the indent-2 layout the writer produces.
+# A JSON string never holds a raw newline, so these only match real keys.
+_SECTION_KEY = re.compile(r'\n  "((?:[^"\\\n]|\\.)*)": ')
+_MEMBER_KEY = re.compile(r'\n    "((?:[^"\\\n]|\\.)*)": ')
+_TILE_OBJECT = re.compile(r"\{[^{}]*\}")
+_TILE_CELL = re.compile(r'\{\s*"x": (-?\d+),\s*"y": (-?\d+)\s*[,}]')
+
+
+class FloorJsonReader:
+    """Decode only the parts of a floor file a caller asks for.
+
+    A file in the writer's indent-2 layout is indexed by the offsets of its
+    top-level keys and of the layer and entity-list keys below them, so
+    ``floor_metadata`` and a few ``entities`` lists cost one ``raw_decode``
+    each and ``tile_layers`` is never parsed. Schema 1.0 layers are read
+    tile by tile on demand; schema 2.0 layers are small enough to decode
+    whole. Any other layout falls back to one ``json.loads`` of the file.
+    A file without ``floor_metadata`` and ``entities`` is a ``ValueError``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.text = self.path.read_text(encoding="utf-8")
+        self._model: dict | None = None
+        self._sections: dict[str, tuple[int, int]] = {}
+        self._members: dict[str, dict[str, tuple[int, int]]] = {}
+        if self.text.startswith("{\n  "):
+            self._sections = self._spans(_SECTION_KEY, 0, len(self.text))
+        if "floor_metadata" not in self._sections or "entities" not in self._sections:
+            self._model = json.loads(self.text)
+            if not isinstance(self._model, dict) or not {"floor_metadata", "entities"} <= self._model.keys():
+                raise ValueError(f"{path} is not a floor JSON: it needs floor_metadata and entities")
+        version = self._section("schema_version") if "schema_version" in self else SCHEMA_V1
+        if version not in SCHEMA_VERSIONS:
+            raise ValueError(f"Unsupported floor schema_version '{version}' in {path}")
+        self.schema_version = version
+
+    def _spans(self, pattern: re.Pattern, start: int, end: int) -> dict[str, tuple[int, int]]:
+        """``{key: (value start, value end)}`` for every ``pattern`` key between ``start`` and ``end``."""
+        matches = list(pattern.finditer(self.text, start, end))
+        return {
+            _DECODER.decode(f'"{match.group(1)}"'): (match.end(), following.start() if following else end)
+            for match, following in zip(matches, [*matches[1:], None])
+        }
+
+    def __contains__(self, key: str) -> bool:
+        return key in (self._model if self._model is not None else self._sections)
+
+    def _section(self, key: str) -> object:
+        if self._model is not None:
+            return self._model[key]
+        return _DECODER.raw_decode(self.text, self._sections[key][0])[0]
+
+    def _member_spans(self, key: str) -> dict[str, tuple[int, int]]:
+        spans = self._members.get(key)
+        if spans is None:
+            spans = self._spans(_MEMBER_KEY, *self._sections[key]) if key in self._sections else {}
+            self._members[key] = spans
+        return spans
+
+    def _member(self, key: str, name: str, default: object) -> object:
+        if self._model is not None:
+            return self._model.get(key, {}).get(name, default)
+        span = self._member_spans(key).get(name)
+        return default if span is None else _DECODER.raw_decode(self.text, span[0])[0]
+
+    def floor_metadata(self) -> dict:
+        return self._section("floor_metadata")
+
+    def entities(self, *names: str) -> dict[str, list[dict]]:
+        """The ``entities`` lists called ``names`` (every list when none are given); missing ones are empty."""
+        if not names:
+            return self._section("entities")
+        return {name: self._member("entities", name, []) for name in names}
+
+    def layer_names(self) -> list[str]:
+        if self._model is not None:
+            return list(self._model.get("tile_layers", {}))
+        return list(self._member_spans("tile_layers"))
+
+    def _layer_text(self, name: str) -> str | None:
+        """The raw text of a schema 1.0 layer list; ``None`` when the layer has to be decoded."""
+        if self._model is not None:
+            return None
+        span = self._member_spans("tile_layers").get(name)
+        if span is None or not self.text.startswith("[", span[0]):
+            return None
+        return self.text[span[0]:span[1]]
+
+    def iter_layer(self, name: str) -> Iterator[dict]:
+        """Yield the layer's ``{"x", "y", "tile"[, "alt"]}`` dicts one at a time; nothing for a missing layer."""
+        text = self._layer_text(name)
+        if text is None:
+            yield from iter_tile_layer(self._member("tile_layers", name, []))
+            return
+        for match in _TILE_OBJECT.finditer(text):
+            yield json.loads(match.group())
+
+    def layer_cells(self, name: str) -> Iterator[tuple[int, int]]:
+        """Just the ``(x, y)`` positions of a layer, read straight from the text where it can be."""
+        text = self._layer_text(name)
+        if text is None:
+            yield from layer_cells(self._member("tile_layers", name, []))
+            return
+        for match in _TILE_OBJECT.finditer(text):
+            cell = _TILE_CELL.match(match.group())
+            if cell is None:
+                tile = json.loads(match.group())
+                yield tile["x"], tile["y"]
+            else:
+                yield int(cell.group(1)), int(cell.group(2))
+
+    def has_tile(self, name: str, cell: tuple[int, int]) -> bool:
+        """True when the layer holds a tile at ``cell``.
+
+        A schema 1.0 layer is searched as text for the cell's ``"x": .., "y": ..``
+        pair, so one query costs a regex scan rather than a tile dict per cell.
+        """
+        text = self._layer_text(name)
+        if text is None:
+            return cell in set(self.layer_cells(name))
+        return re.search(r'\{\s*"x": %d,\s*"y": %d\s*[,}]' % cell, text) is not None
@@ -0,0 +1,312 @@
+"""Hierarchical (HPA*-style) abstract path graph written as a JSON sidecar next to a floor JSON.
+
+The floor is cut into square clusters of ``cluster_size`` cells. Wherever two
+neighbouring clusters share a run of open cells across their border, the run
+becomes an entrance: one pair of facing cells for a short run, one pair at
+each end of a run of :data:`LONG_ENTRANCE` or more cells. Each cell of a pair
+is a node of the graph, and the pair is joined by an edge of cost 1.
+
+Inside a cluster every pair of nodes that can reach each other without
+leaving it is joined by an edge costing their step distance, found with a BFS
+bounded to the cluster. A runtime search then links the start and goal to the
+nodes of their own clusters the same way and runs Dijkstra or A* over a few
+hundred nodes instead of every cell; :meth:`PathGraph.find_path` is the
+reference version. Path costs are never below the true shortest path and on
+the authored floors stay within a few percent of it; the runtime refines a
+path cluster by cluster. Walls come from the floor's ``wall`` layer; gates
+and enemies are not obstacles, since they open at runtime.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor_flow_fields import model_dimensions
+    from tools.floor_json import layer_cells, replace_atomically
+    from tools.floor_reachability import walkable_mask_from_walls
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_flow_fields import model_dimensions
+    from floor_json import layer_cells, replace_atomically
+    from floor_reachability import walkable_mask_from_walls
+
+PATH_GRAPH_FORMAT_VERSION = 1
+PATH_GRAPH_SUFFIX = ".paths.json"
+DEFAULT_CLUSTER_SIZE = 16
+# Entrance runs at least this long get a node pair at both ends instead of one in the middle.
+LONG_ENTRANCE = 6
+
+
+@dataclass(frozen=True)
+class PathNode:
+    id: int
+    x: int
+    y: int
+    cluster: int
+
+
+@dataclass(frozen=True)
+class PathEdge:
+    a: int
+    b: int
+    cost: int
+
+
+def path_graph_path(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.paths.json``."""
+    return json_path.with_suffix(PATH_GRAPH_SUFFIX)
+
+
+class PathGraph:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cluster_size: int,
+        nodes: list[PathNode],
+        edges: list[PathEdge],
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.cluster_size = cluster_size
+        self.clusters_x = -(-width // cluster_size)
+        self.clusters_y = -(-height // cluster_size)
+        self.nodes = nodes
+        self.edges = edges
+        self._neighbours: list[list[tuple[int, int]]] = [[] for _ in nodes]
+        for edge in edges:
+            self._neighbours[edge.a].append((edge.b, edge.cost))
+            self._neighbours[edge.b].append((edge.a, edge.cost))
+        self._cluster_nodes: dict[int, list[PathNode]] = {}
+        for node in nodes:
+            self._cluster_nodes.setdefault(node.cluster, []).append(node)
+
+    def cluster_of(self, cell: tuple[int, int]) -> int:
+        return (cell[1] // self.cluster_size) * self.clusters_x + cell[0] // self.cluster_size
+
+    def cluster_bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """Inclusive ``(left, top, right, bottom)`` of ``cluster``, clipped to the floor."""
+        left = cluster % self.clusters_x * self.cluster_size
+        top = cluster // self.clusters_x * self.cluster_size
+        return (
+            left,
+            top,
+            min(left + self.cluster_size, self.width) - 1,
+            min(top + self.cluster_size, self.height) - 1,
+        )
+
+    def nodes_in(self, cluster: int) -> list[PathNode]:
+        return self._cluster_nodes.get(cluster, [])
+
+    def neighbours(self, node_id: int) -> list[tuple[int, int]]:
+        """``(node id, cost)`` for every edge of ``node_id``."""
+        return self._neighbours[node_id]
+
+    def find_path(
+        self,
+        mask: bytes | bytearray,
+        start: tuple[int, int],
+        goal: tuple[int, int],
+    ) -> tuple[int, list[tuple[int, int]]] | None:
+        """Cost and waypoints from ``start`` to ``goal`` over the abstract graph; ``None`` if unconnected.
+
+        Waypoints run from ``start`` through the entrance nodes to ``goal``;
+        consecutive waypoints are either neighbours or share a cluster.
+        """
+        for cell in (start, goal):
+            x, y = cell
+            if not (0 <= x < self.width and 0 <= y < self.height) or not mask[y * self.width + x]:
+                return None
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        from_start = cluster_distances(mask, self.width, self.cluster_bounds(start_cluster), start)
+        to_goal = cluster_distances(mask, self.width, self.cluster_bounds(goal_cluster), goal)
+
+        best: tuple[int, list[tuple[int, int]]] | None = None
+        if start_cluster == goal_cluster and goal in from_start:
+            best = (from_start[goal], [start, goal])
+
+        exits = {
+            node.id: to_goal[(node.x, node.y)] for node in self.nodes_in(goal_cluster) if (node.x, node.y) in to_goal
+        }
+        cost = {}
+        previous: dict[int, int] = {}
+        queue = []
+        for node in self.nodes_in(start_cluster):
+            if (node.x, node.y) in from_start:
+                cost[node.id] = from_start[(node.x, node.y)]
+                queue.append((cost[node.id], node.id))
+        heapq.heapify(queue)
+        while queue:
+            distance, node_id = heapq.heappop(queue)
+            if distance > cost[node_id]:
+                continue
+            if best is not None and distance >= best[0]:
+                break
+            if node_id in exits and (best is None or distance + exits[node_id] < best[0]):
+                route = [node_id]
+                while route[-1] in previous:
+                    route.append(previous[route[-1]])
+                waypoints = [(self.nodes[step].x, self.nodes[step].y) for step in reversed(route)]
+                best = (distance + exits[node_id], [start, *waypoints, goal])
+            for following, step in self._neighbours[node_id]:
+                if distance + step < cost.get(following, distance + step + 1):
+                    cost[following] = distance + step
+                    previous[following] = node_id
+                    heapq.heappush(queue, (distance + step, following))
+        return best
+
+    def to_json(self) -> dict:
+        return {
+            "format_version": PATH_GRAPH_FORMAT_VERSION,
+            "width": self.width,
+            "height": self.height,
+            "cluster_size": self.cluster_size,
+            "nodes": [{"id": node.id, "x": node.x, "y": node.y, "cluster": node.cluster} for node in self.nodes],
+            "edges": [{"a": edge.a, "b": edge.b, "cost": edge.cost} for edge in self.edges],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> PathGraph:
+        version = data.get("format_version")
+        if version != PATH_GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported path graph format_version {version!r}")
+        return cls(
+            data["width"],
+            data["height"],
+            data["cluster_size"],
+            [PathNode(entry["id"], entry["x"], entry["y"], entry["cluster"]) for entry in data["nodes"]],
+            [PathEdge(entry["a"], entry["b"], entry["cost"]) for entry in data["edges"]],
+        )
+
+
+def cluster_distances(
+    mask: bytes | bytearray,
+    width: int,
+    bounds: tuple[int, int, int, int],
+    source: tuple[int, int],
+) -> dict[tuple[int, int], int]:
+    """Step distance from ``source`` to every open cell it reaches without leaving ``bounds``."""
+    left, top, right, bottom = bounds
+    distances = {source: 0}
+    queue = [source]
+    head = 0
+    while head < len(queue):
+        x, y = cell = queue[head]
+        head += 1
+        step = distances[cell] + 1
+        for following in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            fx, fy = following
+            if (
+                left <= fx <= right
+                and top <= fy <= bottom
+                and following not in distances
+                and mask[fy * width + fx]
+            ):
+                distances[following] = step
+                queue.append(following)
+    return distances
+
+
+def _entrance_offsets(run_start: int, run_end: int) -> tuple[int, ...]:
+    if run_end - run_start + 1 >= LONG_ENTRANCE:
+        return (run_start, run_end)
+    return ((run_start + run_end) // 2,)
+
+
+def _entrances(
+    mask: bytes | bytearray,
+    width: int,
+    height: int,
+    cluster_size: int,
+) -> set[tuple[tuple[int, int], tuple[int, int]]]:
+    """Facing cell pairs across every cluster border, one or two per open run."""
+    pairs = set()
+    # Vertical borders: the last column of a cluster against the first of the next.
+    for x in range(cluster_size - 1, width - 1, cluster_size):
+        for top in range(0, height, cluster_size):
+            run_start = None
+            for y in range(top, min(top + cluster_size, height) + 1):
+                index = y * width + x
+                is_open = y < min(top + cluster_size, height) and mask[index] and mask[index + 1]
+                if is_open and run_start is None:
+                    run_start = y
+                elif not is_open and run_start is not None:
+                    pairs.update(((x, door), (x + 1, door)) for door in _entrance_offsets(run_start, y - 1))
+                    run_start = None
+    # Horizontal borders: the last row of a cluster against the first of the next.
+    for y in range(cluster_size - 1, height - 1, cluster_size):
+        for left in range(0, width, cluster_size):
+            run_start = None
+            for x in range(left, min(left + cluster_size, width) + 1):
+                index = y * width + x
+                is_open = x < min(left + cluster_size, width) and mask[index] and mask[index + width]
+                if is_open and run_start is None:
+                    run_start = x
+                elif not is_open and run_start is not None:
+                    pairs.update(((door, y), (door, y + 1)) for door in _entrance_offsets(run_start, x - 1))
+                    run_start = None
+    return pairs
+
+
+def build_path_graph(
+    mask: bytes | bytearray,
+    width: int,
+    height: int,
+    cluster_size: int = DEFAULT_CLUSTER_SIZE,
+) -> PathGraph:
+    """Cluster ``mask``, place the entrance nodes and cost every intra-cluster node pair."""
+    if cluster_size < 2:
+        raise ValueError(f"Path graph clusters must be at least 2 cells wide, got {cluster_size}")
+    graph = PathGraph(width, height, cluster_size, [], [])
+    pairs = _entrances(mask, width, height, cluster_size)
+    cells = sorted(
+        {cell for pair in pairs for cell in pair},
+        key=lambda cell: (graph.cluster_of(cell), cell[1], cell[0]),
+    )
+    node_ids = {cell: node_id for node_id, cell in enumerate(cells)}
+    nodes = [PathNode(node_id, x, y, graph.cluster_of((x, y))) for node_id, (x, y) in enumerate(cells)]
+
+    edges = {(min(node_ids[a], node_ids[b]), max(node_ids[a], node_ids[b])): 1 for a, b in pairs}
+    by_cluster: dict[int, list[PathNode]] = {}
+    for node in nodes:
+        by_cluster.setdefault(node.cluster, []).append(node)
+    for cluster, members in by_cluster.items():
+        bounds = graph.cluster_bounds(cluster)
+        for position, node in enumerate(members[:-1]):
+            distances = cluster_distances(mask, width, bounds, (node.x, node.y))
+            for other in members[position + 1:]:
+                cost = distances.get((other.x, other.y))
+                if cost is not None:
+                    edges[(node.id, other.id)] = cost
+    return PathGraph(
+        width,
+        height,
+        cluster_size,
+        nodes,
+        [PathEdge(a, b, cost) for (a, b), cost in sorted(edges.items())],
+    )
+
+
+def path_graph_from_model(
+    model: dict,
+    width: int | None = None,
+    height: int | None = None,
+    cluster_size: int = DEFAULT_CLUSTER_SIZE,
+) -> PathGraph:
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), width, height)
+    return build_path_graph(mask, width, height, cluster_size)
+
+
+def write_path_graph(graph: PathGraph, output_path: Path) -> None:
+    with replace_atomically(output_path) as temp_file:
+        temp_file.write(json.dumps(graph.to_json(), indent=2) + "\n")
+
+
+def read_path_graph(path: Path) -> PathGraph:
+    return PathGraph.from_json(json.loads(Path(path).read_text(encoding="utf-8")))
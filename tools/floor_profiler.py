@@ -0,0 +1,188 @@
+"""Per-phase wall time and peak memory for the floor generator CLIs.
+
+Generator code marks its phases with :func:`profile_phase` or
+:func:`profiled`; both cost one global lookup unless a profiler is active.
+``--profile`` activates a :class:`PhaseProfiler` for the run and prints one
+table row per phase path, nested phases indented under their parent.
+``--profile-stats FILE`` also runs ``cProfile`` and dumps ``pstats`` data.
+
+Peak memory is the ``tracemalloc`` high-water mark above the phase's starting
+allocation, so times measured with ``--profile`` include tracing overhead and
+are best compared with each other rather than with unprofiled runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import functools
+import io
+import pstats
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_active: PhaseProfiler | None = None
+
+
+@dataclass
+class PhaseRecord:
+    path: tuple[str, ...]
+    calls: int = 0
+    seconds: float = 0.0
+    child_seconds: float = 0.0
+    peak_bytes: int = 0
+    # Label for the time not covered by child phases, shown as its own row.
+    rest: str | None = None
+
+
+@dataclass
+class _OpenPhase:
+    record: PhaseRecord
+    started: float
+    base_bytes: int = 0
+    peak_bytes: int = 0
+    child_seconds: float = 0.0
+
+
+@dataclass
+class PhaseProfiler:
+    memory: bool = True
+    records: dict[tuple[str, ...], PhaseRecord] = field(default_factory=dict)
+    _stack: list[_OpenPhase] = field(default_factory=list)
+
+    @contextmanager
+    def phase(self, name: str, rest: str | None = None) -> Iterator[None]:
+        path = (*self._stack[-1].record.path, name) if self._stack else (name,)
+        record = self.records.get(path)
+        if record is None:
+            record = self.records[path] = PhaseRecord(path, rest=rest)
+        opened = _OpenPhase(record, 0.0)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # reset_peak() is global, so the parent keeps the peak it has seen so far.
+                self._stack[-1].peak_bytes = max(self._stack[-1].peak_bytes, peak)
+            tracemalloc.reset_peak()
+            opened.base_bytes = opened.peak_bytes = current
+        self._stack.append(opened)
+        opened.started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - opened.started
+            self._stack.pop()
+            record.calls += 1
+            record.seconds += elapsed
+            record.child_seconds += opened.child_seconds
+            if self.memory:
+                opened.peak_bytes = max(opened.peak_bytes, tracemalloc.get_traced_memory()[1])
+                record.peak_bytes = max(record.peak_bytes, opened.peak_bytes - opened.base_bytes)
+                if self._stack:
+                    self._stack[-1].peak_bytes = max(self._stack[-1].peak_bytes, opened.peak_bytes)
+                tracemalloc.reset_peak()
+            if self._stack:
+                self._stack[-1].child_seconds += elapsed
+
+    def format_table(self) -> str:
+        lines = [f"{'Phase':<40} {'calls':>6} {'total ms':>10} {'self ms':>10} {'peak MiB':>9}"]
+        for record in self.records.values():
+            name = "  " * (len(record.path) - 1) + record.path[-1]
+            self_ms = (record.seconds - record.child_seconds) * 1000
+            peak = f"{record.peak_bytes / (1024 * 1024):9.2f}" if self.memory else f"{'-':>9}"
+            lines.append(f"{name:<40} {record.calls:>6} {record.seconds * 1000:>10.2f} {self_ms:>10.2f} {peak}")
+            if record.rest is not None and record.child_seconds:
+                rest = "  " * len(record.path) + record.rest
+                lines.append(f"{rest:<40} {record.calls:>6} {self_ms:>10.2f} {self_ms:>10.2f} {'-':>9}")
+        return "\n".join(lines)
+
+
+def profile_phase(name: str, rest: str | None = None):
+    """Time the ``with`` block as phase ``name`` when a profiler is active; otherwise do nothing."""
+    if _active is None:
+        return nullcontext()
+    return _active.phase(name, rest)
+
+
+def profiled(name: str, rest: str | None = None) -> Callable[[Callable], Callable]:
+    """Decorator form of :func:`profile_phase` for functions that are one whole phase."""
+
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return function(*args, **kwargs)
+            with _active.phase(name, rest):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def profile_iter(name: str, items: Iterable) -> Iterable:
+    """Charge the time spent producing each item of ``items`` to phase ``name``."""
+    if _active is None:
+        return items
+    return _timed_items(_active, name, iter(items))
+
+
+_DONE = object()
+
+
+def _timed_items(profiler: PhaseProfiler, name: str, items: Iterator) -> Iterator:
+    while True:
+        with profiler.phase(name):
+            item = next(items, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
+
+def profiling_active() -> bool:
+    return _active is not None
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time and peak memory for each generation phase.",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        metavar="FILE",
+        help="Also run cProfile and dump pstats data to FILE (implies --profile).",
+    )
+
+
+def run_profiled(run: Callable[[], int], stats_path: str | None = None, memory: bool = True) -> int:
+    """Call ``run`` with a phase profiler active, print its table, and optionally dump cProfile stats."""
+    global _active
+    profiler = PhaseProfiler(memory=memory)
+    was_tracing = tracemalloc.is_tracing()
+    if memory and not was_tracing:
+        tracemalloc.start()
+    previous, _active = _active, profiler
+    stats = cProfile.Profile() if stats_path else None
+    try:
+        if stats is not None:
+            result = stats.runcall(run)
+        else:
+            result = run()
+    finally:
+        _active = previous
+        if memory and not was_tracing:
+            tracemalloc.stop()
+
+    print(profiler.format_table())
+    if stats is not None:
+        stats.dump_stats(stats_path)
+        summary = io.StringIO()
+        pstats.Stats(stats, stream=summary).sort_stats("cumulative").print_stats(15)
+        print(summary.getvalue().rstrip())
+        print(f"Wrote cProfile stats to {Path(stats_path)}")
+    return result
@@ -0,0 +1,257 @@
+"""Single-pass reachability queries over a floor's walkable grid."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from functools import cached_property
+
+try:
+    from tools.maze_grid import OPEN, WallGrid
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from maze_grid import OPEN, WallGrid
+
+UNREACHED = -1
+
+# Maps WallGrid bytes to walkable flags.
+_OPEN_TABLE = bytes(1 if value == OPEN else 0 for value in range(256))
+
+
+def walkable_mask_from_walls(
+    walls: Iterable[tuple[int, int]],
+    width: int,
+    height: int,
+) -> bytearray:
+    """Return a row-major ``bytearray`` with 1 for every walkable cell of the grid."""
+    if isinstance(walls, WallGrid) and (walls.width, walls.height) == (width, height):
+        return bytearray(walls.cells.translate(_OPEN_TABLE))
+    mask = bytearray([1]) * (width * height)
+    for x, y in walls:
+        if 0 <= x < width and 0 <= y < height:
+            mask[y * width + x] = 0
+    return mask
+
+
+def walkable_mask_from_tiles(tiles: Iterable[dict], width: int, height: int) -> bytearray:
+    """Like :func:`walkable_mask_from_walls`, reading ``{"x", "y"}`` wall tile dicts."""
+    return walkable_mask_from_walls(((tile["x"], tile["y"]) for tile in tiles), width, height)
+
+
+def bfs_distances(mask: bytes | bytearray, width: int, starts: Iterable[int]) -> array:
+    """Breadth-first step distance from the ``starts`` indices to every walkable cell.
+
+    Cells that are walls or cannot be reached hold :data:`UNREACHED`.
+    """
+    size = len(mask)
+    distance = array("i", [UNREACHED]) * size
+    queue = []
+    for start in starts:
+        if mask[start] and distance[start] == UNREACHED:
+            distance[start] = 0
+            queue.append(start)
+
+    head = 0
+    while head < len(queue):
+        index = queue[head]
+        head += 1
+        step = distance[index] + 1
+        x = index % width
+        if x + 1 < width and mask[index + 1] and distance[index + 1] == UNREACHED:
+            distance[index + 1] = step
+            queue.append(index + 1)
+        if x > 0 and mask[index - 1] and distance[index - 1] == UNREACHED:
+            distance[index - 1] = step
+            queue.append(index - 1)
+        below = index + width
+        if below < size and mask[below] and distance[below] == UNREACHED:
+            distance[below] = step
+            queue.append(below)
+        above = index - width
+        if above >= 0 and mask[above] and distance[above] == UNREACHED:
+            distance[above] = step
+            queue.append(above)
+    return distance
+
+
+def pack_flags(flags: bytes | bytearray) -> int:
+    """Pack 0/1 bytes into an int, flag ``i`` becoming bit ``i``."""
+    # Flags are 0/1 bytes, so the shifted planes add without carries.
+    return sum(int.from_bytes(flags[bit::8], "little") << bit for bit in range(8))
+
+
+def row_bits(mask: bytes | bytearray, width: int, height: int) -> int:
+    """Pack a row-major 0/1 mask into an int, one bit per cell and ``width + 1`` bits per row.
+
+    The extra bit after every row is always clear, so a shift or a carry that
+    runs off the end of a row lands on it instead of the next row.
+    """
+    padded = bytearray((width + 1) * height)
+    for y in range(height):
+        start = y * (width + 1)
+        padded[start:start + width] = mask[y * width:(y + 1) * width]
+    return pack_flags(padded)
+
+
+def flood_fill_bits(walkable: int, stride: int, seeds: int) -> int:
+    """Every cell of the :func:`row_bits` set ``walkable`` connected to a cell of ``seeds``.
+
+    Each round grows the region one step up, down and left, and runs it to the
+    end of every row span to the right in one addition: adding the region to the
+    mask carries through each span of set bits, flipping the span above every
+    region cell. Rounds therefore scale with the turns in the longest path, not
+    its length, and every round is a handful of whole-grid int operations.
+    """
+    reached = seeds & walkable
+    while True:
+        grown = reached | (((walkable + reached) ^ walkable) & walkable)
+        grown |= ((grown >> 1) | (grown << stride) | (grown >> stride)) & walkable
+        if grown == reached:
+            return reached
+        reached = grown
+
+
+def component_labels(
+    mask: bytes | bytearray,
+    width: int,
+    reached: array | None = None,
+) -> tuple[array, int]:
+    """Label every walkable cell with a connected-component id.
+
+    ``reached`` is an optional :func:`bfs_distances` result; the cells it reached
+    become component 0 without being flooded again. The remaining components are
+    numbered in row-major order of their first cell. Walls hold :data:`UNREACHED`.
+    """
+    size = len(mask)
+    labels = array("i", [UNREACHED]) * size
+    count = 0
+    if reached is not None:
+        for index in range(size):
+            if reached[index] != UNREACHED:
+                labels[index] = 0
+                count = 1
+    for seed in range(size):
+        if not mask[seed] or labels[seed] != UNREACHED:
+            continue
+        labels[seed] = count
+        stack = [seed]
+        while stack:
+            index = stack.pop()
+            x = index % width
+            for neighbor in (
+                index + 1 if x + 1 < width else -1,
+                index - 1 if x > 0 else -1,
+                index + width if index + width < size else -1,
+                index - width,
+            ):
+                if neighbor >= 0 and mask[neighbor] and labels[neighbor] == UNREACHED:
+                    labels[neighbor] = count
+                    stack.append(neighbor)
+        count += 1
+    return labels, count
+
+
+class ReachabilityIndex:
+    """Start reachability for one walkable grid, built once.
+
+    Construction flood-fills the start's component as a bitset, so
+    :meth:`is_reachable` is a bit test. Step distances and component labels
+    cost a full BFS and are only built the first time they are asked for;
+    every query after that is a single array lookup.
+    """
+
+    def __init__(
+        self,
+        mask: bytes | bytearray,
+        width: int,
+        height: int,
+        start: tuple[int, int],
+    ) -> None:
+        if len(mask) != width * height:
+            raise ValueError(f"Walkable mask has {len(mask)} cells; expected {width * height}")
+        self.mask = mask
+        self.width = width
+        self.height = height
+        self.start = start
+        start_index = self.index_of(start)
+        self.start_walkable = start_index is not None and bool(mask[start_index])
+        self._walkable_bits = row_bits(mask, width, height)
+        self._reached_bits = (
+            flood_fill_bits(self._walkable_bits, width + 1, 1 << self._bit(start)) if self.start_walkable else 0
+        )
+
+    @cached_property
+    def distances(self) -> array:
+        start_index = self.index_of(self.start)
+        return bfs_distances(self.mask, self.width, [start_index] if self.start_walkable else [])
+
+    @cached_property
+    def _components(self) -> tuple[array, int]:
+        return component_labels(self.mask, self.width, self.distances)
+
+    @property
+    def labels(self) -> array:
+        return self._components[0]
+
+    @property
+    def component_count(self) -> int:
+        return self._components[1]
+
+    def _bit(self, cell: tuple[int, int]) -> int:
+        return cell[1] * (self.width + 1) + cell[0]
+
+    @classmethod
+    def from_walls(
+        cls,
+        walls: Iterable[tuple[int, int]],
+        width: int,
+        height: int,
+        start: tuple[int, int],
+    ) -> ReachabilityIndex:
+        return cls(walkable_mask_from_walls(walls, width, height), width, height, start)
+
+    def index_of(self, cell: tuple[int, int]) -> int | None:
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    def is_walkable(self, cell: tuple[int, int]) -> bool:
+        index = self.index_of(cell)
+        return index is not None and bool(self.mask[index])
+
+    def component(self, cell: tuple[int, int]) -> int:
+        index = self.index_of(cell)
+        return UNREACHED if index is None else self.labels[index]
+
+    def is_reachable(self, cell: tuple[int, int]) -> bool:
+        """True when ``cell`` shares the player start's component."""
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self._reached_bits >> self._bit(cell) & 1)
+
+    def connected(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        label = self.component(a)
+        return label != UNREACHED and label == self.component(b)
+
+    def distance(self, cell: tuple[int, int]) -> int:
+        """Steps from the start to ``cell``, or :data:`UNREACHED`."""
+        index = self.index_of(cell)
+        return UNREACHED if index is None else self.distances[index]
+
+    def unreachable_cells(self, width: int | None = None, height: int | None = None) -> list[tuple[int, int]]:
+        """Walkable cells outside the start's component, sorted by ``(x, y)``.
+
+        ``width``/``height`` restrict the scan to the top-left footprint.
+        """
+        if self._walkable_bits == self._reached_bits:
+            return []
+        width = self.width if width is None else width
+        height = self.height if height is None else height
+        cells = [
+            (x, y)
+            for y in range(height)
+            for x in range(width)
+            if self.labels[y * self.width + x] > 0
+            or (not self.start_walkable and self.mask[y * self.width + x])
+        ]
+        cells.sort()
+        return cells
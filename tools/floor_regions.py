@@ -0,0 +1,295 @@
+"""Room and corridor region graph built from a floor's recorded carve operations.
+
+Every walkable cell is assigned to exactly one region. Rooms (``carve_rect``)
+claim their cells first, smallest room first so a shop inside a plaza keeps its
+own node; corridor segments then claim what is left in carve order, and any
+walkable cell no carve covers (hand-opened cells) falls into a ``passage``
+region. Each claimed area is split into 4-connected pieces, so a corridor that
+a room or a wall cuts in two becomes two nodes.
+
+Doorways are the edges: two regions share one when any of their cells touch.
+The exported graph stores each region's cells as ``floor_json`` row runs, so a
+reader can rebuild the per-cell region map once and then answer "which room is
+this cell in" with a single lookup.
+"""
+
+from __future__ import annotations
+
+import json
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor_flow_fields import model_dimensions
+    from tools.floor_json import decode_runs, encode_runs, layer_cells, replace_atomically
+    from tools.floor_reachability import walkable_mask_from_walls
+    from tools.maze_grid import CORRIDOR, Carve
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_flow_fields import model_dimensions
+    from floor_json import decode_runs, encode_runs, layer_cells, replace_atomically
+    from floor_reachability import walkable_mask_from_walls
+    from maze_grid import CORRIDOR, Carve
+
+REGION_GRAPH_FORMAT_VERSION = 1
+REGION_GRAPH_SUFFIX = ".regions.json"
+PASSAGE = "passage"
+NO_REGION = -1
+
+
+@dataclass(frozen=True)
+class Region:
+    id: int
+    kind: str
+    # Inclusive bounding box of the cells the region actually owns.
+    left: int
+    top: int
+    right: int
+    bottom: int
+    cell_count: int
+
+
+@dataclass(frozen=True)
+class Doorway:
+    a: int
+    b: int
+    # The first touching pair in row-major order: a cell of ``a`` and its neighbour in ``b``.
+    cell_a: tuple[int, int]
+    cell_b: tuple[int, int]
+    # How many touching cell pairs the two regions share.
+    width: int
+
+
+def region_graph_path(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.regions.json``."""
+    return json_path.with_suffix(REGION_GRAPH_SUFFIX)
+
+
+class RegionGraph:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        region_ids: array,
+        regions: list[Region],
+        doorways: list[Doorway],
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.region_ids = region_ids
+        self.regions = regions
+        self.doorways = doorways
+        self._neighbours: list[list[int]] = [[] for _ in regions]
+        for doorway in doorways:
+            self._neighbours[doorway.a].append(doorway.b)
+            self._neighbours[doorway.b].append(doorway.a)
+
+    def region_at(self, cell: tuple[int, int]) -> Region | None:
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        region_id = self.region_ids[y * self.width + x]
+        return None if region_id == NO_REGION else self.regions[region_id]
+
+    def neighbours(self, region_id: int) -> list[int]:
+        return self._neighbours[region_id]
+
+    def region_path(self, start: tuple[int, int], goal: tuple[int, int]) -> list[int] | None:
+        """Region ids from ``start``'s region to ``goal``'s, fewest doorways first; ``None`` if unconnected."""
+        first = self.region_at(start)
+        last = self.region_at(goal)
+        if first is None or last is None:
+            return None
+        previous = {first.id: first.id}
+        queue = deque([first.id])
+        while queue:
+            current = queue.popleft()
+            if current == last.id:
+                path = [current]
+                while path[-1] != first.id:
+                    path.append(previous[path[-1]])
+                return path[::-1]
+            for following in self._neighbours[current]:
+                if following not in previous:
+                    previous[following] = current
+                    queue.append(following)
+        return None
+
+    def region_cells(self) -> list[list[tuple[int, int]]]:
+        """Every region's cells in row-major order, indexed by region id."""
+        cells: list[list[tuple[int, int]]] = [[] for _ in self.regions]
+        width = self.width
+        for index, region_id in enumerate(self.region_ids):
+            if region_id != NO_REGION:
+                cells[region_id].append((index % width, index // width))
+        return cells
+
+    def to_json(self) -> dict:
+        cells = self.region_cells()
+        return {
+            "format_version": REGION_GRAPH_FORMAT_VERSION,
+            "width": self.width,
+            "height": self.height,
+            "regions": [
+                {
+                    "id": region.id,
+                    "kind": region.kind,
+                    "bounds": {"left": region.left, "top": region.top, "right": region.right, "bottom": region.bottom},
+                    "cell_count": region.cell_count,
+                    "cells": encode_runs(cells[region.id]),
+                }
+                for region in self.regions
+            ],
+            "doorways": [
+                {
+                    "a": doorway.a,
+                    "b": doorway.b,
+                    "cells": [
+                        {"x": doorway.cell_a[0], "y": doorway.cell_a[1]},
+                        {"x": doorway.cell_b[0], "y": doorway.cell_b[1]},
+                    ],
+                    "width": doorway.width,
+                }
+                for doorway in self.doorways
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> RegionGraph:
+        version = data.get("format_version")
+        if version != REGION_GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported region graph format_version {version!r}")
+        width = data["width"]
+        height = data["height"]
+        region_ids = array("i", [NO_REGION]) * (width * height)
+        regions = []
+        for entry in data["regions"]:
+            bounds = entry["bounds"]
+            regions.append(
+                Region(
+                    entry["id"],
+                    entry["kind"],
+                    bounds["left"],
+                    bounds["top"],
+                    bounds["right"],
+                    bounds["bottom"],
+                    entry["cell_count"],
+                )
+            )
+            for x, y in decode_runs(entry["cells"]):
+                region_ids[y * width + x] = entry["id"]
+        doorways = [
+            Doorway(
+                entry["a"],
+                entry["b"],
+                (entry["cells"][0]["x"], entry["cells"][0]["y"]),
+                (entry["cells"][1]["x"], entry["cells"][1]["y"]),
+                entry["width"],
+            )
+            for entry in data["doorways"]
+        ]
+        return cls(width, height, region_ids, regions, doorways)
+
+
+def _area(carve: Carve) -> int:
+    return (carve.right - carve.left + 1) * (carve.bottom - carve.top + 1)
+
+
+def _claim_order(carves: list[Carve]) -> list[int]:
+    rooms = [index for index, carve in enumerate(carves) if carve.kind != CORRIDOR]
+    corridors = [index for index, carve in enumerate(carves) if carve.kind == CORRIDOR]
+    # Smallest room first, so a room carved inside another keeps its own cells.
+    rooms.sort(key=lambda index: _area(carves[index]))
+    return rooms + corridors
+
+
+def extract_region_graph(mask: bytes | bytearray, width: int, height: int, carves: Iterable[Carve]) -> RegionGraph:
+    """Partition the walkable cells of ``mask`` into regions and find the doorways between them."""
+    carves = list(carves)
+    size = width * height
+    unclaimed = len(carves)
+    owner = array("i", [unclaimed]) * size
+    for carve_index in _claim_order(carves):
+        carve = carves[carve_index]
+        for y in range(max(carve.top, 0), min(carve.bottom, height - 1) + 1):
+            row = y * width
+            for index in range(row + max(carve.left, 0), row + min(carve.right, width - 1) + 1):
+                if mask[index] and owner[index] == unclaimed:
+                    owner[index] = carve_index
+
+    region_ids = array("i", [NO_REGION]) * size
+    regions: list[Region] = []
+    for start in range(size):
+        if not mask[start] or region_ids[start] != NO_REGION:
+            continue
+        label = owner[start]
+        region_id = len(regions)
+        region_ids[start] = region_id
+        queue = [start]
+        head = 0
+        left, top, right, bottom = width, height, -1, -1
+        while head < len(queue):
+            index = queue[head]
+            head += 1
+            x, y = index % width, index // width
+            left, right = min(left, x), max(right, x)
+            top, bottom = min(top, y), max(bottom, y)
+            for following, inside in (
+                (index + 1, x + 1 < width),
+                (index - 1, x > 0),
+                (index + width, index + width < size),
+                (index - width, index >= width),
+            ):
+                if inside and mask[following] and owner[following] == label and region_ids[following] == NO_REGION:
+                    region_ids[following] = region_id
+                    queue.append(following)
+        kind = carves[label].kind if label < unclaimed else PASSAGE
+        regions.append(Region(region_id, kind, left, top, right, bottom, len(queue)))
+
+    return RegionGraph(width, height, region_ids, regions, _doorways(region_ids, width, size))
+
+
+def _doorways(region_ids: array, width: int, size: int) -> list[Doorway]:
+    found: dict[tuple[int, int], list] = {}
+    for index in range(size):
+        here = region_ids[index]
+        if here == NO_REGION:
+            continue
+        for following, inside in ((index + 1, (index + 1) % width != 0), (index + width, index + width < size)):
+            if not inside:
+                continue
+            there = region_ids[following]
+            if there == NO_REGION or there == here:
+                continue
+            key = (here, there) if here < there else (there, here)
+            entry = found.get(key)
+            if entry is None:
+                cells = ((index % width, index // width), (following % width, following // width))
+                found[key] = [cells if here < there else cells[::-1], 1]
+            else:
+                entry[1] += 1
+    return [Doorway(a, b, cells[0], cells[1], count) for (a, b), (cells, count) in sorted(found.items())]
+
+
+def region_graph_from_model(
+    model: dict,
+    carves: Iterable[Carve],
+    width: int | None = None,
+    height: int | None = None,
+) -> RegionGraph:
+    """Region graph of a generated floor; walls come from the model, structure from ``carves``."""
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), width, height)
+    return extract_region_graph(mask, width, height, carves)
+
+
+def write_region_graph(graph: RegionGraph, output_path: Path) -> None:
+    with replace_atomically(output_path) as temp_file:
+        temp_file.write(json.dumps(graph.to_json(), indent=2) + "\n")
+
+
+def read_region_graph(path: Path) -> RegionGraph:
+    return RegionGraph.from_json(json.loads(Path(path).read_text(encoding="utf-8")))
@@ -0,0 +1,48 @@
+"""The ``--sidecars`` option shared by the floor generator CLIs.
+
+Derived data written next to a floor JSON is opt-in: a plain generator run
+only writes the floor itself, so ``scenes/game/floors/`` stays clean. Name
+the sidecars to write as a comma-separated list, e.g.
+``--sidecars flow,regions,paths,chokes,vis``.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+FLOW = "flow"
+REGIONS = "regions"
+PATHS = "paths"
+CHOKES = "chokes"
+VISIBILITY = "vis"
+# Name -> the file it adds next to ``<floor>.json``.
+SIDECARS = {
+    FLOW: "<floor>.flow.bin BFS flow fields",
+    REGIONS: "<floor>.regions.json room and corridor graph",
+    PATHS: "<floor>.paths.json hierarchical path graph",
+    CHOKES: "<floor>.chokes.json choke cell and bridge report",
+    VISIBILITY: "<floor>.vis.bin line-of-sight table",
+}
+
+
+def parse_sidecars(text: str) -> frozenset[str]:
+    """``"flow,vis"`` -> ``{"flow", "vis"}``; unknown names are an argparse error."""
+    names = frozenset(name.strip() for name in text.split(",") if name.strip())
+    unknown = sorted(names - SIDECARS.keys())
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown sidecar(s) {', '.join(unknown)}; choose from {', '.join(SIDECARS)}"
+        )
+    return names
+
+
+def add_sidecar_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--sidecars",
+        type=parse_sidecars,
+        default=frozenset(),
+        metavar="NAME[,NAME...]",
+        help="Also write these sidecars next to each floor JSON (default: none): "
+        + "; ".join(f"{name} ({description})" for name, description in SIDECARS.items())
+        + ".",
+    )
@@ -0,0 +1,304 @@
+"""Declarative floor specs and the shared engine that compiles them.
+
+A spec is one JSON file under ``tools/floor_specs/`` describing a floor::
+
+    format_version        1
+    label                 generator name for the floor, e.g. "Floor 1"
+    width, height         footprint the layout is carved into
+    grid                  optional [width, height] of the TileMap around the footprint
+    metadata              floor_name, floor_number and description for floor_metadata
+    anchors               named cells; player_start is required
+    layout                carve operations, applied in order
+    tables                id-keyed entity rows, each with a position
+    entities              per floor JSON entity kind, the tables that fill it, in order
+    puzzle_id             stamped on trap, switch, gate and riddle entities
+    supplemental_enemies  optional density patrol prefix and enemy types
+
+Wherever a cell is expected a spec may write ``[x, y]``, an anchor name or
+the id of a table row, so stairs and gates are placed once and referred to by
+name. Layout operations take an optional ``half_width`` (default 1) and
+``note``::
+
+    {"room": [x1, y1, x2, y2]}                       carve_rect
+    {"path": [cell, cell, ...]}                      carve_path between consecutive cells
+    {"loop": [cell, ..., cell]}                      a path that ends where it starts
+    {"branches": [[cell, cell], ...]}                one two-cell path per entry
+    {"corridors": [["h", x1, x2, y], ["v", y1, y2, x], ...]}
+    {"cell": cell}                                   carve_cell
+    {"walls": cells}                                 put walls back
+    {"gate_barrier": cell, "cells": cells}           walls around a gate, leaving the gate open
+
+where ``cells`` lists cells and ``{"rect": [x1, y1, x2, y2]}`` blocks. The
+perimeter is reinforced after the last operation.
+
+:func:`floor_layout` caches compiled layouts by spec digest, so building a
+floor's model and replaying its carves for the region graph carve it once.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+try:
+    from tools.floor_profiler import profiled
+    from tools.maze_grid import MazeBuilder
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_profiler import profiled
+    from maze_grid import MazeBuilder
+
+FLOOR_SPEC_FORMAT_VERSION = 1
+FLOOR_SPEC_DIR = Path(__file__).resolve().parent / "floor_specs"
+DEFAULT_HALF_WIDTH = 1
+
+LAYOUT_OPERATIONS = ("room", "path", "loop", "branches", "corridors", "cell", "walls", "gate_barrier")
+_OPTIONAL_OPERATION_KEYS = {"half_width", "note"}
+
+PUZZLE_ENTITY_KINDS = ("trap_tiles", "puzzle_switches", "puzzle_gates", "puzzle_riddles")
+# Fields the game reads on every entity of a kind, filled in when a row leaves them out.
+ENTITY_DEFAULTS = {
+    "trap_tiles": {"status_effect": "", "status_magnitude": 0, "status_turns": 0},
+}
+
+
+class FloorSpecError(ValueError):
+    pass
+
+
+def floor_spec_path(name: str) -> Path:
+    """``"floor1"`` -> ``tools/floor_specs/floor1.json``."""
+    return FLOOR_SPEC_DIR / f"{name}.json"
+
+
+def _literal_cell(value: object) -> tuple[int, int] | None:
+    if isinstance(value, list) and len(value) == 2 and all(type(part) is int for part in value):
+        return value[0], value[1]
+    return None
+
+
+class FloorSpec:
+    """One parsed spec; cell references resolve against its anchors and table rows."""
+
+    def __init__(self, data: dict, path: Path | None = None) -> None:
+        self.data = data
+        self.path = path
+        self.digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+        self._named: dict[str, tuple[int, int]] = {}
+        self._check()
+
+    def __repr__(self) -> str:
+        return f"FloorSpec({self.label!r})"
+
+    @property
+    def source(self) -> str:
+        return str(self.path) if self.path is not None else f"<{self.data.get('label', 'floor spec')}>"
+
+    @property
+    def label(self) -> str:
+        return self.data["label"]
+
+    @property
+    def width(self) -> int:
+        return self.data["width"]
+
+    @property
+    def height(self) -> int:
+        return self.data["height"]
+
+    @property
+    def grid(self) -> tuple[int, int]:
+        """TileMap size the footprint sits in; the footprint itself when the spec gives none."""
+        grid = self.data.get("grid")
+        return (self.width, self.height) if grid is None else (grid[0], grid[1])
+
+    @property
+    def player_start(self) -> tuple[int, int]:
+        return self._named["player_start"]
+
+    def _check(self) -> None:
+        version = self.data.get("format_version")
+        if version != FLOOR_SPEC_FORMAT_VERSION:
+            raise FloorSpecError(f"{self.source}: unsupported format_version {version!r}")
+        for key in ("label", "width", "height", "metadata", "anchors", "layout"):
+            if key not in self.data:
+                raise FloorSpecError(f"{self.source}: missing {key!r}")
+
+        for name, value in self.data["anchors"].items():
+            cell = _literal_cell(value)
+            if cell is None:
+                raise FloorSpecError(f"{self.source}: anchor {name!r} must be [x, y], got {value!r}")
+            self._add_name(name, cell)
+        if "player_start" not in self._named:
+            raise FloorSpecError(f"{self.source}: anchors must include player_start")
+
+        tables = self.data.get("tables", {})
+        for table_name, rows in tables.items():
+            for row_id, row in rows.items():
+                if "position" not in row:
+                    raise FloorSpecError(f"{self.source}: {table_name} row {row_id!r} has no position")
+                try:
+                    cell = self.cell(row["position"])
+                except FloorSpecError as error:
+                    raise FloorSpecError(f"{self.source}: {table_name} row {row_id!r}: {error}") from None
+                self._add_name(row_id, cell)
+
+        for kind, table_names in self.data.get("entities", {}).items():
+            for table_name in table_names:
+                if table_name not in tables:
+                    raise FloorSpecError(f"{self.source}: {kind} names unknown table {table_name!r}")
+            if kind in PUZZLE_ENTITY_KINDS and table_names and "puzzle_id" not in self.data:
+                raise FloorSpecError(f"{self.source}: {kind} entities need a puzzle_id")
+
+    def _add_name(self, name: str, cell: tuple[int, int]) -> None:
+        if name in self._named:
+            raise FloorSpecError(f"{self.source}: {name!r} is defined twice")
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise FloorSpecError(f"{self.source}: {name!r} at {cell} is outside the {self.width}x{self.height} floor")
+        self._named[name] = cell
+
+    def cell(self, value: object) -> tuple[int, int]:
+        """Resolve ``[x, y]``, an anchor name or a table row id to a cell."""
+        if isinstance(value, str):
+            try:
+                return self._named[value]
+            except KeyError:
+                raise FloorSpecError(f"unknown cell name {value!r}") from None
+        cell = _literal_cell(value)
+        if cell is None:
+            raise FloorSpecError(f"expected [x, y] or a cell name, got {value!r}")
+        return cell
+
+    def cells(self, values: list) -> Iterator[tuple[int, int]]:
+        """Cells of a ``cells`` list, expanding ``{"rect": [x1, y1, x2, y2]}`` blocks row by row."""
+        for value in values:
+            if isinstance(value, dict):
+                x1, y1, x2, y2 = value["rect"]
+                for y in range(min(y1, y2), max(y1, y2) + 1):
+                    for x in range(min(x1, x2), max(x1, x2) + 1):
+                        yield x, y
+            else:
+                yield self.cell(value)
+
+    def table(self, name: str) -> dict[str, dict]:
+        """Rows of table ``name`` with positions resolved to ``(x, y)`` tuples."""
+        return {
+            row_id: {**copy.deepcopy(row), "position": self._named[row_id]}
+            for row_id, row in self.data.get("tables", {})[name].items()
+        }
+
+    def floor_metadata(self) -> dict:
+        x, y = self.player_start
+        return {**self.data["metadata"], "player_start": {"x": x, "y": y}}
+
+    def entities(self) -> dict[str, list[dict]]:
+        """Every entity kind in spec order, each row shaped the way floor JSON stores it."""
+        puzzle_id = self.data.get("puzzle_id")
+        entities: dict[str, list[dict]] = {}
+        for kind, table_names in self.data.get("entities", {}).items():
+            built = entities[kind] = []
+            for table_name in table_names:
+                for row_id, row in self.table(table_name).items():
+                    entity: dict = {"id": row_id}
+                    if kind in PUZZLE_ENTITY_KINDS:
+                        entity["puzzle_id"] = puzzle_id
+                    x, y = row.pop("position")
+                    entity["position"] = {"x": x, "y": y}
+                    for key, value in row.items():
+                        if key == "items" and isinstance(value, dict):
+                            value = [{"item_id": item_id, "quantity": quantity} for item_id, quantity in value.items()]
+                        entity[key] = value
+                    for key, value in ENTITY_DEFAULTS.get(kind, {}).items():
+                        entity.setdefault(key, value)
+                    built.append(entity)
+        return entities
+
+
+def load_floor_spec(path: str | Path) -> FloorSpec:
+    """Load a spec from a file path, or by name from :data:`FLOOR_SPEC_DIR` (``"floor1"``)."""
+    path = Path(path)
+    if path.suffix != ".json":
+        path = floor_spec_path(str(path))
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as error:
+        raise FloorSpecError(f"{path}: {error}") from error
+    return FloorSpec(data, path)
+
+
+def stair_tiles(stairs: list[dict]) -> list[dict]:
+    """The stair tile layer for ``stair_connections`` entities, tiled by direction."""
+    return [{"x": stair["position"]["x"], "y": stair["position"]["y"], "tile": stair["direction"]} for stair in stairs]
+
+
+def _apply_operation(builder: MazeBuilder, spec: FloorSpec, operation: dict) -> None:
+    kinds = [key for key in operation if key in LAYOUT_OPERATIONS]
+    if len(kinds) != 1:
+        raise FloorSpecError(f"expected exactly one of {', '.join(LAYOUT_OPERATIONS)}, got {sorted(operation)}")
+    kind = kinds[0]
+    allowed = _OPTIONAL_OPERATION_KEYS | {kind} | ({"cells"} if kind == "gate_barrier" else set())
+    unknown = sorted(set(operation) - allowed)
+    if unknown:
+        raise FloorSpecError(f"unknown {kind} keys {unknown}")
+    value = operation[kind]
+    half_width = operation.get("half_width", DEFAULT_HALF_WIDTH)
+
+    if kind == "room":
+        builder.carve_rect(*value)
+    elif kind in ("path", "loop"):
+        points = [spec.cell(point) for point in value]
+        if len(points) < 2:
+            raise FloorSpecError(f"{kind} needs at least two cells")
+        if kind == "loop" and points[0] != points[-1]:
+            raise FloorSpecError(f"loop starts at {points[0]} but ends at {points[-1]}")
+        builder.carve_loop(points, half_width)
+    elif kind == "branches":
+        for start, end in value:
+            builder.carve_path(spec.cell(start), spec.cell(end), half_width)
+    elif kind == "corridors":
+        for direction, start, end, fixed in value:
+            if direction == "h":
+                builder.carve_h_corridor(start, end, fixed, half_width)
+            elif direction == "v":
+                builder.carve_v_corridor(start, end, fixed, half_width)
+            else:
+                raise FloorSpecError(f"corridor direction must be 'h' or 'v', got {direction!r}")
+    elif kind == "cell":
+        builder.carve_cell(*spec.cell(value))
+    elif kind == "walls":
+        builder.walls.update(spec.cells(value))
+    else:
+        gate = spec.cell(value)
+        builder.walls.update(cell for cell in spec.cells(operation["cells"]) if cell != gate)
+
+
+@profiled("carve")
+def compile_layout(spec: FloorSpec) -> MazeBuilder:
+    """Replay ``spec``'s layout on a fresh builder; use :func:`floor_layout` for the cached copy."""
+    builder = MazeBuilder(spec.width, spec.height)
+    for index, operation in enumerate(spec.data["layout"]):
+        try:
+            _apply_operation(builder, spec, operation)
+        except (LookupError, TypeError, ValueError) as error:
+            note = f" ({operation['note']})" if isinstance(operation, dict) and "note" in operation else ""
+            raise FloorSpecError(f"{spec.source}: layout[{index}]{note}: {error}") from error
+    builder.reinforce_perimeter()
+    return builder
+
+
+_compiled_layouts: dict[str, MazeBuilder] = {}
+
+
+def floor_layout(spec: FloorSpec) -> MazeBuilder:
+    """The compiled layout of ``spec``, cached by digest; every caller gets its own copy."""
+    compiled = _compiled_layouts.get(spec.digest)
+    if compiled is None:
+        compiled = _compiled_layouts[spec.digest] = compile_layout(spec)
+    return compiled.copy()
+
+
+def clear_layout_cache() -> None:
+    _compiled_layouts.clear()
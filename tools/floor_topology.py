@@ -0,0 +1,140 @@
+"""Degree maps and corridor chains over a floor's walkable mask."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+# Walkable cells carry ``WALKABLE_BIAS`` on top of their neighbour count, so one
+# translate table can both strip the bias and zero the degree of walls.
+WALKABLE_BIAS = 5
+_DEGREE_TABLE = bytes(value - WALKABLE_BIAS if value >= WALKABLE_BIAS else 0 for value in range(256))
+
+
+def degree_map(mask: bytes | bytearray, width: int) -> bytes:
+    """Number of walkable orthogonal neighbours of every walkable cell, row-major.
+
+    The four neighbour planes are shifted copies of the mask. Each plane is read
+    as one little-endian integer and the planes are added as integers; no byte
+    ever exceeds 9, so no carry crosses a cell and the sum is a per-cell add done
+    in a few C-level passes. Walls get a degree of zero.
+    """
+    size = len(mask)
+    if size == 0:
+        return b""
+    # Cells in the last column must not count as the left neighbour of the next
+    # row's first cell, and vice versa for the first column.
+    no_last_column = bytearray(mask)
+    no_last_column[width - 1::width] = bytes(len(range(width - 1, size, width)))
+    no_first_column = bytearray(mask)
+    no_first_column[0::width] = bytes(len(range(0, size, width)))
+
+    planes = (
+        b"\x00" + no_last_column[:-1],
+        no_first_column[1:] + b"\x00",
+        bytes(width) + mask[:-width],
+        mask[width:] + bytes(width),
+    )
+    total = sum(int.from_bytes(plane, "little") for plane in planes)
+    total += WALKABLE_BIAS * int.from_bytes(mask, "little")
+    return total.to_bytes(size, "little").translate(_DEGREE_TABLE)
+
+
+def _walkable_neighbors(mask: bytes | bytearray, width: int, index: int) -> list[int]:
+    size = len(mask)
+    x = index % width
+    neighbors = []
+    if x + 1 < width and mask[index + 1]:
+        neighbors.append(index + 1)
+    if x > 0 and mask[index - 1]:
+        neighbors.append(index - 1)
+    if index + width < size and mask[index + width]:
+        neighbors.append(index + width)
+    if index >= width and mask[index - width]:
+        neighbors.append(index - width)
+    return neighbors
+
+
+def dead_end_chains(
+    mask: bytes | bytearray,
+    width: int,
+    degree: bytes | None = None,
+) -> list[tuple[list[int], int | None]]:
+    """Every corridor chain that starts at a dead end, as ``(cells, stop)`` pairs.
+
+    ``cells`` holds flat indices from the dead end along the degree-2 corridor;
+    ``stop`` is the first cell that is not a corridor cell (a junction or the
+    opposite dead end), or ``None`` for an isolated cell. Chains are ordered by
+    the ``(x, y)`` position of their dead end.
+    """
+    if degree is None:
+        degree = degree_map(mask, width)
+
+    leaves = []
+    index = degree.find(1)
+    while index != -1:
+        leaves.append(index)
+        index = degree.find(1, index + 1)
+    leaves.sort(key=lambda leaf: (leaf % width, leaf // width))
+
+    chains: list[tuple[list[int], int | None]] = []
+    for leaf in leaves:
+        chain = [leaf]
+        previous = -1
+        current = leaf
+        stop = None
+        while True:
+            next_cells = [cell for cell in _walkable_neighbors(mask, width, current) if cell != previous]
+            if not next_cells:
+                break
+            next_cell = next_cells[0]
+            if degree[next_cell] != 2:
+                stop = next_cell
+                break
+            chain.append(next_cell)
+            previous = current
+            current = next_cell
+
+        chains.append((chain, stop))
+    return chains
+
+
+def position_mask(positions: Iterable[tuple[int, int]], width: int, height: int) -> bytearray:
+    mask = bytearray(width * height)
+    for x, y in positions:
+        if 0 <= x < width and 0 <= y < height:
+            mask[y * width + x] = 1
+    return mask
+
+
+def near_position_mask(
+    walkable: bytes | bytearray,
+    positions: Iterable[tuple[int, int]],
+    width: int,
+    height: int,
+) -> bytearray:
+    """Flag walkable cells that hold one of ``positions`` or touch one orthogonally."""
+    near = bytearray(width * height)
+    for x, y in positions:
+        if not (0 <= x < width and 0 <= y < height) or not walkable[y * width + x]:
+            continue
+        index = y * width + x
+        near[index] = 1
+        for neighbor in _walkable_neighbors(walkable, width, index):
+            near[neighbor] = 1
+    return near
+
+
+def unrewarded_chains(
+    mask: bytes | bytearray,
+    width: int,
+    height: int,
+    payoff_positions: Iterable[tuple[int, int]],
+) -> list[list[int]]:
+    """Dead-end chains where no cell, and no walkable neighbour of a cell, holds a payoff."""
+    near = near_position_mask(mask, payoff_positions, width, height)
+    return [
+        cells
+        for cells, _ in dead_end_chains(mask, width)
+        if not any(near[cell] for cell in cells)
+    ]
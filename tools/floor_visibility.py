@@ -0,0 +1,250 @@
+"""Precomputed line-of-sight written as a packed binary sidecar next to a floor JSON.
+
+For every walkable cell the sidecar stores which cells within ``radius``
+(Euclidean) it can see, as a bitset over the ``(2 * radius + 1)`` square
+window centred on the cell. A target is visible when no wall lies strictly
+between the two cells on the line from the viewer's centre to the target's;
+walls themselves can be seen, so fog-of-war reveals the room edges. Cells
+off the floor block sight and are never visible. Reveal and aggro checks at
+runtime become one bit lookup.
+
+Each window offset's line is precomputed as a bitmask over the window, so a
+cell's whole visibility set costs one AND per offset against the walls around
+it. Rows are split into bands that a process pool can compute in parallel.
+
+File layout, all little-endian::
+
+    magic b"SVIS", u16 version, u16 radius, u32 width, u32 height, u32 cell_count
+    height u32 row offsets: record index of each row's first walkable cell
+    ceil(width * height / 8) walkable bitset bytes, row-major, LSB first
+    cell_count records of ceil(window * window / 8) bytes, window row-major, LSB first
+
+Records follow walkable cells in row-major order; a cell's record index is
+its row offset plus the walkable cells before it in the row.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    from tools.floor_flow_fields import model_dimensions
+    from tools.floor_json import layer_cells, replace_atomically
+    from tools.floor_reachability import pack_flags, row_bits, walkable_mask_from_walls
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_flow_fields import model_dimensions
+    from floor_json import layer_cells, replace_atomically
+    from floor_reachability import pack_flags, row_bits, walkable_mask_from_walls
+
+VISIBILITY_MAGIC = b"SVIS"
+VISIBILITY_VERSION = 1
+VISIBILITY_SUFFIX = ".vis.bin"
+DEFAULT_VISIBILITY_RADIUS = 8
+MAX_VISIBILITY_RADIUS = 32
+# Rows per band handed to a worker.
+BAND_ROWS = 16
+
+_HEADER = struct.Struct("<4sHHIII")
+
+
+def visibility_path(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.vis.bin``."""
+    return json_path.with_suffix(VISIBILITY_SUFFIX)
+
+
+def _window_bit(radius: int, dx: int, dy: int) -> int:
+    return (dy + radius) * (2 * radius + 1) + dx + radius
+
+
+@lru_cache(maxsize=4)
+def sight_lines(radius: int) -> tuple[tuple[int, int], ...]:
+    """``(target bit, line mask)`` for every window offset within ``radius``, the viewer's own cell first.
+
+    The line mask flags the cells strictly between the viewer and the target,
+    stepping along the longer axis and rounding the other half up.
+    """
+    lines = [(_window_bit(radius, 0, 0), 0)]
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if (dx or dy) and dx * dx + dy * dy <= radius * radius:
+                steps = max(abs(dx), abs(dy))
+                line = 0
+                for step in range(1, steps):
+                    line |= 1 << _window_bit(
+                        radius, (2 * dx * step + steps) // (2 * steps), (2 * dy * step + steps) // (2 * steps)
+                    )
+                lines.append((_window_bit(radius, dx, dy), line))
+    return tuple(lines)
+
+
+def _padded_rows(mask: bytes | bytearray, width: int, height: int, radius: int) -> tuple[list[int], list[int]]:
+    """Blocking and off-floor cells of every row as ints, with ``radius`` off-floor cells on each side.
+
+    Bit ``x`` of ``rows[y + radius]`` is the cell ``(x - radius, y)``; the
+    ``radius`` rows above and below the floor are entirely off it.
+    """
+    full = (1 << (width + 2 * radius)) - 1
+    off_floor_row = full & ~(((1 << width) - 1) << radius)
+    open_bits = row_bits(mask, width, height)
+    blocked = [full] * radius
+    off_floor = [full] * radius
+    for y in range(height):
+        row = open_bits >> (y * (width + 1)) & ((1 << width) - 1)
+        blocked.append(full & ~(row << radius))
+        off_floor.append(off_floor_row)
+    blocked.extend([full] * radius)
+    off_floor.extend([full] * radius)
+    return blocked, off_floor
+
+
+def _window(rows: list[int], x: int, y: int, window: int) -> int:
+    """The ``window``-square of padded ``rows`` whose top-left is padded cell ``(x, y)``, row-major."""
+    row_mask = (1 << window) - 1
+    bits = 0
+    for offset in range(window):
+        bits |= (rows[y + offset] >> x & row_mask) << (offset * window)
+    return bits
+
+
+def _band(
+    mask: bytes | bytearray,
+    width: int,
+    height: int,
+    radius: int,
+    rows: range,
+) -> list[int]:
+    """Visibility windows of every walkable cell in ``rows``, row-major."""
+    blocked, off_floor = _padded_rows(mask, width, height, radius)
+    window = 2 * radius + 1
+    lines = sight_lines(radius)
+    records = []
+    for y in rows:
+        for x in range(width):
+            if not mask[y * width + x]:
+                continue
+            walls = _window(blocked, x, y, window)
+            visible = 0
+            for bit, line in lines:
+                if not walls & line:
+                    visible |= 1 << bit
+            records.append(visible & ~_window(off_floor, x, y, window))
+    return records
+
+
+class VisibilityMap:
+    def __init__(self, width: int, height: int, radius: int, mask: bytes, records: list[int]) -> None:
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.window = 2 * radius + 1
+        self.mask = mask
+        self.records = records
+        self.row_offsets = []
+        count = 0
+        for y in range(height):
+            self.row_offsets.append(count)
+            count += mask.count(1, y * width, (y + 1) * width)
+        if count != len(records):
+            raise ValueError(f"Visibility map has {len(records)} records for {count} walkable cells")
+
+    def record_index(self, cell: tuple[int, int]) -> int | None:
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height) or not self.mask[y * self.width + x]:
+            return None
+        return self.row_offsets[y] + self.mask.count(1, y * self.width, y * self.width + x)
+
+    def can_see(self, viewer: tuple[int, int], target: tuple[int, int]) -> bool:
+        """True when ``viewer`` (a walkable cell) has ``target`` in sight within the radius."""
+        index = self.record_index(viewer)
+        dx, dy = target[0] - viewer[0], target[1] - viewer[1]
+        if index is None or max(abs(dx), abs(dy)) > self.radius:
+            return False
+        return bool(self.records[index] >> _window_bit(self.radius, dx, dy) & 1)
+
+    def visible_cells(self, viewer: tuple[int, int]) -> Iterator[tuple[int, int]]:
+        """Every cell ``viewer`` sees, row-major; nothing for a wall or off-floor viewer."""
+        index = self.record_index(viewer)
+        if index is None:
+            return
+        record = self.records[index]
+        for bit in range(self.window * self.window):
+            if record >> bit & 1:
+                yield viewer[0] + bit % self.window - self.radius, viewer[1] + bit // self.window - self.radius
+
+    def encode(self) -> bytes:
+        record_bytes = (self.window * self.window + 7) // 8
+        flat = pack_flags(self.mask)
+        parts = [
+            _HEADER.pack(VISIBILITY_MAGIC, VISIBILITY_VERSION, self.radius, self.width, self.height, len(self.records)),
+            struct.pack(f"<{self.height}I", *self.row_offsets),
+            flat.to_bytes((self.width * self.height + 7) // 8, "little"),
+        ]
+        parts.extend(record.to_bytes(record_bytes, "little") for record in self.records)
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data: bytes) -> VisibilityMap:
+        magic, version, radius, width, height, count = _HEADER.unpack_from(data, 0)
+        if magic != VISIBILITY_MAGIC:
+            raise ValueError("Not a visibility file")
+        if version != VISIBILITY_VERSION:
+            raise ValueError(f"Unsupported visibility version {version}")
+        offset = _HEADER.size + 4 * height
+        bitset_bytes = (width * height + 7) // 8
+        flat = int.from_bytes(data[offset:offset + bitset_bytes], "little")
+        mask = bytes(flat >> index & 1 for index in range(width * height))
+        offset += bitset_bytes
+        window = 2 * radius + 1
+        record_bytes = (window * window + 7) // 8
+        records = [
+            int.from_bytes(data[start:start + record_bytes], "little")
+            for start in range(offset, offset + count * record_bytes, record_bytes)
+        ]
+        return cls(width, height, radius, mask, records)
+
+
+def compute_visibility(
+    mask: bytes | bytearray,
+    width: int,
+    height: int,
+    radius: int = DEFAULT_VISIBILITY_RADIUS,
+    jobs: int = 1,
+) -> VisibilityMap:
+    """Visibility of every walkable cell of ``mask``, in a process pool over row bands when ``jobs`` > 1."""
+    if not 1 <= radius <= MAX_VISIBILITY_RADIUS:
+        raise ValueError(f"Visibility radius must be 1-{MAX_VISIBILITY_RADIUS}, got {radius}")
+    mask = bytes(mask)
+    bands = [range(top, min(top + BAND_ROWS, height)) for top in range(0, height, BAND_ROWS)]
+    if jobs <= 1 or len(bands) == 1:
+        records = [record for rows in bands for record in _band(mask, width, height, radius, rows)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(bands))) as pool:
+            futures = [pool.submit(_band, mask, width, height, radius, rows) for rows in bands]
+            records = [record for future in futures for record in future.result()]
+    return VisibilityMap(width, height, radius, mask, records)
+
+
+def visibility_from_model(
+    model: dict,
+    width: int | None = None,
+    height: int | None = None,
+    radius: int = DEFAULT_VISIBILITY_RADIUS,
+    jobs: int = 1,
+) -> VisibilityMap:
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    mask = walkable_mask_from_walls(layer_cells(model["tile_layers"]["wall"]), width, height)
+    return compute_visibility(mask, width, height, radius, jobs)
+
+
+def write_visibility(visibility: VisibilityMap, output_path: Path) -> None:
+    with replace_atomically(output_path, "wb") as temp_file:
+        temp_file.write(visibility.encode())
+
+
+def read_visibility(path: Path) -> VisibilityMap:
+    return VisibilityMap.decode(Path(path).read_bytes())
@@ -0,0 +1,170 @@
+"""Reachability over puzzle-gate and enemy-gate unlock states.
+
+A gate state is a bitmask: bit ``i`` is set once gate ``i`` has been opened
+(puzzle gate) or cleared (enemy). Unlocking only ever turns walls into floor,
+so the reachable region grows monotonically with the state and every unlock
+order the player can follow converges on the same closure. Computing that
+closure therefore covers every combination of gate states the player can
+reach without enumerating them: a target the closure misses is missed by
+every order, and the order the engine followed is reported as the witness.
+
+This catches what a single "all puzzle gates closed" BFS cannot: a switch
+locked behind its own gate, or gates guarding each other's switches, leave
+everything behind them unreachable however the player plays.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+try:
+    from tools.floor_reachability import ReachabilityIndex
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_reachability import ReachabilityIndex
+
+PUZZLE_GATE = "puzzle_gate"
+ENEMY_GATE = "enemy"
+
+
+@dataclass(frozen=True)
+class Gate:
+    id: str
+    kind: str
+    position: tuple[int, int]
+    # Cells that must be reachable before the gate can be unlocked (the puzzle's
+    # switches and riddles). Enemy gates only need a reachable neighbour.
+    requires: tuple[tuple[int, int], ...] = ()
+
+
+@dataclass(frozen=True)
+class GateReport:
+    closure_state: int
+    unlock_order: tuple[str, ...]
+    blocked_targets: tuple[tuple[str, tuple[int, int]], ...] = field(default_factory=tuple)
+
+    @property
+    def soft_locked(self) -> bool:
+        return bool(self.blocked_targets)
+
+
+def _position(entity: dict) -> tuple[int, int]:
+    return entity["position"]["x"], entity["position"]["y"]
+
+
+def gates_from_model(model: dict, include_enemies: bool = True) -> list[Gate]:
+    """Closed puzzle gates followed by enemy gates, in model order."""
+    entities = model["entities"]
+    puzzle_requirements: dict[str, list[tuple[int, int]]] = {}
+    for key in ("puzzle_switches", "puzzle_riddles"):
+        for entity in entities.get(key, []):
+            puzzle_requirements.setdefault(entity.get("puzzle_id", ""), []).append(_position(entity))
+
+    gates = [
+        Gate(
+            gate["id"],
+            PUZZLE_GATE,
+            _position(gate),
+            tuple(puzzle_requirements.get(gate.get("puzzle_id", ""), ())),
+        )
+        for gate in entities.get("puzzle_gates", [])
+        if gate.get("starts_closed", True)
+    ]
+    if include_enemies:
+        gates.extend(Gate(enemy["id"], ENEMY_GATE, _position(enemy)) for enemy in entities.get("enemy_spawns", []))
+    return gates
+
+
+class GateStateEngine:
+    """Explore gate unlock states over one floor's walkable mask.
+
+    Component maps are memoized per state, so repeated queries for the same
+    combination of open gates cost one dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        mask: bytes | bytearray,
+        width: int,
+        height: int,
+        start: tuple[int, int],
+        gates: list[Gate],
+    ) -> None:
+        self.mask = bytes(mask)
+        self.width = width
+        self.height = height
+        self.start = start
+        self.gates = list(gates)
+        self.bit_by_id = {gate.id: 1 << bit for bit, gate in enumerate(self.gates)}
+        self.all_open = (1 << len(self.gates)) - 1
+        self._indices = [self._index(gate.position) for gate in self.gates]
+        self._components: dict[int, ReachabilityIndex] = {}
+
+    def _index(self, cell: tuple[int, int]) -> int | None:
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    def state_for(self, gate_ids: list[str] | set[str] | tuple[str, ...]) -> int:
+        """Bitmask with the named gates unlocked."""
+        state = 0
+        for gate_id in gate_ids:
+            state |= self.bit_by_id[gate_id]
+        return state
+
+    def gate_ids(self, state: int) -> list[str]:
+        return [gate.id for bit, gate in enumerate(self.gates) if state >> bit & 1]
+
+    def walkable_mask(self, state: int) -> bytearray:
+        """The floor mask with every still-locked gate cell turned into a wall."""
+        mask = bytearray(self.mask)
+        for bit, index in enumerate(self._indices):
+            if index is not None and not state >> bit & 1:
+                mask[index] = 0
+        return mask
+
+    def components(self, state: int) -> ReachabilityIndex:
+        index = self._components.get(state)
+        if index is None:
+            index = ReachabilityIndex(self.walkable_mask(state), self.width, self.height, self.start)
+            self._components[state] = index
+        return index
+
+    def is_reachable(self, state: int, cell: tuple[int, int]) -> bool:
+        return self.components(state).is_reachable(cell)
+
+    def unlockable(self, state: int) -> int:
+        """Bitmask of locked gates the player can unlock from ``state``."""
+        reach = self.components(state)
+        unlockable = 0
+        for bit, gate in enumerate(self.gates):
+            if state >> bit & 1:
+                continue
+            if gate.kind == ENEMY_GATE:
+                x, y = gate.position
+                if any(reach.is_reachable(cell) for cell in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))):
+                    unlockable |= 1 << bit
+            elif all(reach.is_reachable(cell) for cell in gate.requires):
+                unlockable |= 1 << bit
+        return unlockable
+
+    def closure(self, state: int = 0) -> tuple[int, tuple[str, ...]]:
+        """Unlock everything reachable from ``state``; return the final state and unlock order.
+
+        Each round unlocks every gate that is currently unlockable, so the number
+        of component maps built is bounded by the gate depth, not the gate count.
+        """
+        order: list[str] = []
+        while True:
+            newly = self.unlockable(state)
+            if not newly:
+                return state, tuple(order)
+            order.extend(self.gate_ids(newly))
+            state |= newly
+
+    def check(self, targets: list[tuple[str, tuple[int, int]]], state: int = 0) -> GateReport:
+        """Report targets that stay unreachable once nothing more can be unlocked."""
+        final_state, order = self.closure(state)
+        reach = self.components(final_state)
+        blocked = tuple((name, cell) for name, cell in targets if not reach.is_reachable(cell))
+        return GateReport(final_state, order, blocked)
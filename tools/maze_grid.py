@@ -0,0 +1,203 @@
+"""Grid-backed wall storage and carving shared by the Sirius floor generators."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, MutableSet
+from typing import NamedTuple
+
+WALL = 1
+OPEN = 0
+
+ROOM = "room"
+CORRIDOR = "corridor"
+
+
+class Carve(NamedTuple):
+    """One rectangle opened by :class:`MazeBuilder`, clamped to the grid interior."""
+
+    kind: str
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+
+class WallGrid(MutableSet):
+    """A set of ``(x, y)`` wall cells stored as one byte per cell in row-major order.
+
+    The grid behaves like the ``set[tuple[int, int]]`` the generators used to
+    carry around, but membership is an index into a ``bytearray`` and whole
+    rows or columns can be rewritten with a single slice assignment. Iteration
+    yields cells in ``(y, x)`` order, which is the order the JSON wall layer uses.
+    """
+
+    __slots__ = ("width", "height", "cells", "_count")
+
+    def __init__(self, width: int, height: int, filled: bool = True) -> None:
+        self.width = width
+        self.height = height
+        self.cells = bytearray([WALL if filled else OPEN]) * (width * height)
+        self._count = width * height if filled else 0
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[tuple[int, int]]) -> set[tuple[int, int]]:
+        # Set algebra (``grid | other``) may produce cells outside the grid, so
+        # results fall back to a plain set.
+        return set(iterable)
+
+    def copy(self) -> WallGrid:
+        clone = WallGrid.__new__(WallGrid)
+        clone.width = self.width
+        clone.height = self.height
+        clone.cells = bytearray(self.cells)
+        clone._count = self._count
+        return clone
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __contains__(self, cell: object) -> bool:
+        try:
+            x, y = cell  # type: ignore[misc]
+        except (TypeError, ValueError):
+            return False
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] == WALL
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        width = self.width
+        find = self.cells.find
+        index = find(WALL)
+        while index != -1:
+            yield index % width, index // width
+            index = find(WALL, index + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, cell: tuple[int, int]) -> None:
+        x, y = cell
+        if not self.in_bounds(x, y):
+            raise IndexError(f"Wall cell {cell} is outside the {self.width}x{self.height} grid")
+        index = y * self.width + x
+        if self.cells[index] != WALL:
+            self.cells[index] = WALL
+            self._count += 1
+
+    def discard(self, cell: tuple[int, int]) -> None:
+        x, y = cell
+        if not self.in_bounds(x, y):
+            return
+        index = y * self.width + x
+        if self.cells[index] == WALL:
+            self.cells[index] = OPEN
+            self._count -= 1
+
+    def update(self, cells: Iterable[tuple[int, int]]) -> None:
+        for cell in cells:
+            self.add(cell)
+
+    def fill_span(self, y: int, left: int, right: int, value: int) -> None:
+        """Set cells ``left..right`` (inclusive) of row ``y`` to ``value``."""
+        if right < left:
+            return
+        start = y * self.width + left
+        stop = y * self.width + right + 1
+        changed = self.cells.count(1 - value, start, stop)
+        self.cells[start:stop] = bytes([value]) * (stop - start)
+        self._count += changed if value == WALL else -changed
+
+    def fill_column(self, x: int, top: int, bottom: int, value: int) -> None:
+        """Set cells ``top..bottom`` (inclusive) of column ``x`` with one strided slice."""
+        if bottom < top:
+            return
+        start = top * self.width + x
+        stop = bottom * self.width + x + 1
+        column = self.cells[start:stop:self.width]
+        changed = column.count(1 - value)
+        self.cells[start:stop:self.width] = bytes([value]) * len(column)
+        self._count += changed if value == WALL else -changed
+
+    def fill_rect(self, left: int, top: int, right: int, bottom: int, value: int) -> None:
+        """Set every cell of the inclusive rectangle to ``value``.
+
+        Wide rectangles are written one row slice at a time and tall, narrow
+        ones (vertical corridors) one strided column slice at a time.
+        """
+        if right < left or bottom < top:
+            return
+        if right - left > bottom - top:
+            for y in range(top, bottom + 1):
+                self.fill_span(y, left, right, value)
+        else:
+            for x in range(left, right + 1):
+                self.fill_column(x, top, bottom, value)
+
+    def row(self, y: int) -> bytes:
+        return bytes(self.cells[y * self.width:(y + 1) * self.width])
+
+
+class MazeBuilder:
+    """Carve rooms and corridors out of a solid ``width`` x ``height`` wall grid.
+
+    Carving never opens the outer ring of cells, so every carve operation is
+    clamped to the interior and applied as row or column slice assignments.
+    ``carves`` keeps every rectangle in carve order, tagged as a room
+    (``carve_rect``) or a corridor segment, for region extraction.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.walls = WallGrid(width, height)
+        self.carves: list[Carve] = []
+
+    def copy(self) -> MazeBuilder:
+        clone = type(self).__new__(type(self))
+        clone.width = self.width
+        clone.height = self.height
+        clone.walls = self.walls.copy()
+        clone.carves = list(self.carves)
+        return clone
+
+    def carve_cell(self, x: int, y: int) -> None:
+        if 1 <= x < self.width - 1 and 1 <= y < self.height - 1:
+            self.walls.discard((x, y))
+
+    def _carve(self, kind: str, x1: int, y1: int, x2: int, y2: int) -> None:
+        left, right = sorted((x1, x2))
+        top, bottom = sorted((y1, y2))
+        left = max(left, 1)
+        right = min(right, self.width - 2)
+        top = max(top, 1)
+        bottom = min(bottom, self.height - 2)
+        if right < left or bottom < top:
+            return
+        self.walls.fill_rect(left, top, right, bottom, OPEN)
+        self.carves.append(Carve(kind, left, top, right, bottom))
+
+    def carve_rect(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        self._carve(ROOM, x1, y1, x2, y2)
+
+    def carve_h_corridor(self, x1: int, x2: int, y: int, half_width: int = 1) -> None:
+        self._carve(CORRIDOR, x1, y - half_width, x2, y + half_width)
+
+    def carve_v_corridor(self, y1: int, y2: int, x: int, half_width: int = 1) -> None:
+        self._carve(CORRIDOR, x - half_width, y1, x + half_width, y2)
+
+    def carve_path(self, start: tuple[int, int], end: tuple[int, int], half_width: int = 1) -> None:
+        sx, sy = start
+        ex, ey = end
+        self.carve_h_corridor(sx, ex, sy, half_width)
+        self.carve_v_corridor(sy, ey, ex, half_width)
+
+    def carve_loop(self, points: list[tuple[int, int]], half_width: int = 1) -> None:
+        for start, end in zip(points, points[1:]):
+            self.carve_path(start, end, half_width)
+
+    def reinforce_perimeter(self) -> None:
+        last_row = self.height - 1
+        last_col = self.width - 1
+        self.walls.fill_span(0, 0, last_col, WALL)
+        self.walls.fill_span(last_row, 0, last_col, WALL)
+        self.walls.fill_column(0, 0, last_row, WALL)
+        self.walls.fill_column(last_col, 0, last_row, WALL)
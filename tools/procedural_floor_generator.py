@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Generate seeded procedural tower floors for the endless tower mode.
+
+Usage:
+    python3 tools/procedural_floor_generator.py --seed 42 --floor-number 4 --count 20
+    python3 tools/procedural_floor_generator.py --seed 42 --count 5 --output-dir /tmp/tower
+
+A floor is a pure function of ``(seed, floor_number)``: the random stream is
+seeded from both, so the game can rebuild any tower floor from its seed
+instead of shipping it. Each floor is a jittered lattice of rooms joined by a
+random spanning tree plus extra loops, with:
+
+* dead-end branch corridors that each end in a treasure box,
+* puzzle-gated leaf rooms holding treasure, opened by a switch elsewhere,
+* a down stair at the start room and an up stair in the room farthest from it.
+
+Every floor is checked with the Floor 1-3 ``validate_model`` (connectivity,
+entity placement, gate-safe stairs) plus the rewarded dead-end rule. A layout
+that fails is redrawn from the next attempt's stream, which is still fixed
+by the seed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor1_maze_generator import treasure_box_entities, validate_model, vector, write_json
+    from tools.floor_json import SCHEMA_V1, SCHEMA_VERSIONS, CellLayer
+    from tools.maze_grid import MazeBuilder, WallGrid
+    from tools.synthetic_floor_generator import lattice_edges, place_rooms, room_centre
+except ModuleNotFoundError:  # Direct ``python tools/procedural_floor_generator.py`` invocation.
+    from floor1_maze_generator import treasure_box_entities, validate_model, vector, write_json
+    from floor_json import SCHEMA_V1, SCHEMA_VERSIONS, CellLayer
+    from maze_grid import MazeBuilder, WallGrid
+    from synthetic_floor_generator import lattice_edges, place_rooms, room_centre
+
+DEFAULT_TOWER_FLOOR = 4
+MAX_ATTEMPTS = 8
+
+TOWER_ENEMY_TYPES = ("goblin", "orc", "skeleton_warrior", "forest_spirit")
+TOWER_TREASURE_ITEMS = ("health_potion", "mana_potion", "swiftness_draught", "greater_health_potion")
+
+Room = tuple[int, int, int, int]
+_SIDES = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+@dataclass(frozen=True)
+class ProceduralFloorSpec:
+    seed: int
+    floor_number: int = DEFAULT_TOWER_FLOOR
+    size: int = 60
+    lattice_cell: int = 14
+    # Lattice edges left out of the spanning tree that are carved anyway.
+    loop_chance: float = 0.3
+    branch_chance: float = 0.5
+    branch_length: tuple[int, int] = (2, 4)
+    gate_count: int = 1
+    enemies_per_room: tuple[int, int] = (0, 2)
+    treasure_chance: float = 0.15
+
+    def __post_init__(self) -> None:
+        if self.floor_number < 1:
+            raise ValueError(f"Tower floors start at floor 1, got {self.floor_number}")
+        if (self.size - 2) // self.lattice_cell < 2:
+            raise ValueError(f"A {self.size}x{self.size} floor holds fewer than 2x2 rooms of {self.lattice_cell}")
+
+
+@dataclass
+class ProceduralLayout:
+    builder: MazeBuilder
+    rooms: list[Room]
+    start_room: int
+    up_room: int
+    # gate cell -> index of the leaf room it closes off
+    gates: dict[tuple[int, int], int]
+    # Tip cell of every dead-end branch corridor.
+    branch_tips: list[tuple[int, int]]
+
+
+def floor_label(floor_number: int) -> str:
+    return "GF" if floor_number == 0 else f"{floor_number}F"
+
+
+def _room_graph(count: int, rng: random.Random, loop_chance: float) -> list[list[int]]:
+    neighbours: list[list[int]] = [[] for _ in range(count * count)]
+    for (row_a, column_a), (row_b, column_b) in lattice_edges(count, rng, loop_chance):
+        a, b = row_a * count + column_a, row_b * count + column_b
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+    return neighbours
+
+
+def _hops(neighbours: list[list[int]], start: int) -> list[int]:
+    hops = [-1] * len(neighbours)
+    hops[start] = 0
+    queue = deque([start])
+    while queue:
+        room = queue.popleft()
+        for following in neighbours[room]:
+            if hops[following] < 0:
+                hops[following] = hops[room] + 1
+                queue.append(following)
+    return hops
+
+
+def _exits(walls: WallGrid, room: Room) -> list[tuple[int, int]]:
+    """Open cells orthogonally outside ``room``'s rectangle."""
+    left, top, right, bottom = room
+    ring = [(x, top - 1) for x in range(left, right + 1)] + [(x, bottom + 1) for x in range(left, right + 1)]
+    ring += [(left - 1, y) for y in range(top, bottom + 1)] + [(right + 1, y) for y in range(top, bottom + 1)]
+    return [cell for cell in ring if cell not in walls]
+
+
+def _carve_branch(builder: MazeBuilder, room: Room, rng: random.Random, length: int) -> tuple[int, int] | None:
+    """Carve a dead-end corridor straight out of one side of ``room`` and return its tip.
+
+    The corridor only goes through solid rock: every cell, its two side
+    neighbours and the cell past the tip must be walls, so the branch never
+    joins another corridor.
+    """
+    walls = builder.walls
+    left, top, right, bottom = room
+    for dx, dy in rng.sample(_SIDES, len(_SIDES)):
+        if dx:
+            x = right + 1 if dx > 0 else left - 1
+            y = rng.randint(top, bottom)
+        else:
+            x = rng.randint(left, right)
+            y = bottom + 1 if dy > 0 else top - 1
+        cells = [(x + dx * step, y + dy * step) for step in range(length)]
+        beyond = (x + dx * length, y + dy * length)
+        if not all(1 <= cx < builder.width - 1 and 1 <= cy < builder.height - 1 for cx, cy in cells):
+            continue
+        if beyond not in walls or any(
+            cell not in walls or (cell[0] + dy, cell[1] + dx) not in walls or (cell[0] - dy, cell[1] - dx) not in walls
+            for cell in cells
+        ):
+            continue
+        tip = cells[-1]
+        if dx:
+            builder.carve_h_corridor(x, tip[0], y, half_width=0)
+        else:
+            builder.carve_v_corridor(y, tip[1], x, half_width=0)
+        return tip
+    return None
+
+
+def build_procedural_layout(spec: ProceduralFloorSpec, rng: random.Random) -> ProceduralLayout:
+    grid = place_rooms(spec.size, spec.lattice_cell, rng, margin=2)
+    count = len(grid)
+    rooms = [room for row in grid for room in row]
+    neighbours = _room_graph(count, rng, spec.loop_chance)
+
+    builder = MazeBuilder(spec.size, spec.size)
+    for room in rooms:
+        builder.carve_rect(*room)
+    for a, linked in enumerate(neighbours):
+        for b in linked:
+            if a < b:
+                builder.carve_path(room_centre(rooms[a]), room_centre(rooms[b]), half_width=0)
+
+    start_room = rng.randrange(len(rooms))
+    hops = _hops(neighbours, start_room)
+    farthest = max(hops)
+    up_room = rng.choice([room for room, distance in enumerate(hops) if distance == farthest])
+
+    gates: dict[tuple[int, int], int] = {}
+    leaves = [room for room, linked in enumerate(neighbours) if len(linked) == 1 and room not in (start_room, up_room)]
+    for room in rng.sample(leaves, len(leaves)):
+        if len(gates) == spec.gate_count:
+            break
+        exits = _exits(builder.walls, rooms[room])
+        if len(exits) == 1:
+            gates[exits[0]] = room
+
+    branch_tips = []
+    for room in rooms:
+        if rng.random() < spec.branch_chance:
+            tip = _carve_branch(builder, room, rng, rng.randint(*spec.branch_length))
+            if tip is not None:
+                branch_tips.append(tip)
+    return ProceduralLayout(builder, rooms, start_room, up_room, gates, branch_tips)
+
+
+def _populate(spec: ProceduralFloorSpec, layout: ProceduralLayout, rng: random.Random) -> dict:
+    label = floor_label(spec.floor_number)
+    rooms = layout.rooms
+    start = room_centre(rooms[layout.start_room])
+    up_stair = room_centre(rooms[layout.up_room])
+    # Room centres stay free: corridors, the start and the stairs land there.
+    occupied = {room_centre(room) for room in rooms} | set(layout.branch_tips)
+
+    def free_cell(room: Room) -> tuple[int, int] | None:
+        left, top, right, bottom = room
+        cells = [
+            (x, y) for y in range(top, bottom + 1) for x in range(left, right + 1) if (x, y) not in occupied
+        ]
+        if not cells:
+            return None
+        cell = rng.choice(cells)
+        occupied.add(cell)
+        return cell
+
+    boxes: dict[str, tuple[tuple[int, int], int, dict[str, int]]] = {}
+
+    def add_box(position: tuple[int, int], richness: int) -> None:
+        gold = rng.randrange(10, 31, 5) * richness + 5 * spec.floor_number
+        boxes[f"TreasureBox_T{label}_{len(boxes) + 1:02d}"] = (position, gold, {rng.choice(TOWER_TREASURE_ITEMS): 1})
+
+    for tip in layout.branch_tips:
+        add_box(tip, 2)
+
+    gated_rooms = set(layout.gates.values())
+    puzzle_gates = []
+    puzzle_switches = []
+    open_rooms = [index for index in range(len(rooms)) if index not in gated_rooms and index != layout.start_room]
+    for number, (gate, room) in enumerate(sorted(layout.gates.items(), key=lambda item: item[1]), start=1):
+        switch = free_cell(rooms[rng.choice(open_rooms)])
+        vault = free_cell(rooms[room])
+        if switch is None or vault is None:
+            continue
+        puzzle_id = f"Puzzle_T{label}_{number:02d}"
+        puzzle_gates.append(
+            {
+                "id": f"PuzzleGate_T{label}_{number:02d}",
+                "puzzle_id": puzzle_id,
+                "position": vector(*gate),
+                "starts_closed": True,
+            }
+        )
+        puzzle_switches.append(
+            {
+                "id": f"PuzzleSwitch_T{label}_{number:02d}",
+                "puzzle_id": puzzle_id,
+                "position": vector(*switch),
+                "prompt_text": "Use",
+                "activated_text": "Somewhere a gate grinds open.",
+            }
+        )
+        add_box(vault, 4)
+
+    enemies = []
+    for index, room in enumerate(rooms):
+        if index == layout.start_room:
+            continue
+        for _ in range(rng.randint(*spec.enemies_per_room)):
+            position = free_cell(room)
+            if position is None:
+                break
+            enemies.append(
+                {
+                    "id": f"EnemySpawn_T{label}_{len(enemies) + 1:02d}",
+                    "position": vector(*position),
+                    "enemy_type": rng.choice(TOWER_ENEMY_TYPES),
+                }
+            )
+        if index not in gated_rooms and rng.random() < spec.treasure_chance:
+            position = free_cell(room)
+            if position is not None:
+                add_box(position, 1)
+
+    below, above = floor_label(spec.floor_number - 1), floor_label(spec.floor_number + 1)
+    return {
+        "schema_version": SCHEMA_V1,
+        "floor_metadata": {
+            "floor_name": f"Tower Floor {spec.floor_number}",
+            "floor_number": spec.floor_number,
+            "description": f"Procedural tower floor (seed {spec.seed}, {len(rooms)} rooms).",
+            "player_start": vector(*start),
+        },
+        "tile_layers": {
+            # A filled grid iterates every cell in row-major order.
+            "ground": CellLayer("starting_area", WallGrid(spec.size, spec.size)),
+            "wall": CellLayer("generic", layout.builder.walls),
+            "stair": [
+                {"x": start[0], "y": start[1], "tile": "down"},
+                {"x": up_stair[0], "y": up_stair[1], "tile": "up"},
+            ],
+        },
+        "entities": {
+            "enemy_spawns": enemies,
+            "npc_spawns": [],
+            "stair_connections": [
+                {
+                    "id": f"{label}_{below}",
+                    "position": vector(*start),
+                    "direction": "down",
+                    "target_floor": spec.floor_number - 1,
+                    "destination_stair_id": f"{below}_{label}",
+                },
+                {
+                    "id": f"{label}_{above}",
+                    "position": vector(*up_stair),
+                    "direction": "up",
+                    "target_floor": spec.floor_number + 1,
+                    "destination_stair_id": f"{above}_{label}",
+                },
+            ],
+            "hidden_placeholders": [],
+            "treasure_boxes": treasure_box_entities(boxes),
+            "trap_tiles": [],
+            "puzzle_switches": puzzle_switches,
+            "puzzle_gates": puzzle_gates,
+            "puzzle_riddles": [],
+        },
+    }
+
+
+def build_procedural_model(spec: ProceduralFloorSpec) -> dict:
+    """Generate and validate the floor for ``spec``; the same spec always yields the same floor."""
+    error: ValueError | None = None
+    for attempt in range(MAX_ATTEMPTS):
+        # String seeds hash with SHA-512, so the stream is stable across runs and platforms.
+        rng = random.Random(f"tower:{spec.seed}:{spec.floor_number}:{attempt}")
+        layout = build_procedural_layout(spec, rng)
+        model = _populate(spec, layout, rng)
+        try:
+            validate_model(model, spec.size, spec.size, rewarded_dead_ends=True)
+        except ValueError as failure:
+            error = failure
+            continue
+        return model
+    raise ValueError(
+        f"No valid floor for seed {spec.seed} floor {spec.floor_number} in {MAX_ATTEMPTS} attempts: {error}"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate seeded procedural tower floors.")
+    parser.add_argument("--seed", type=int, default=0, help="Tower seed; each floor is derived from it.")
+    parser.add_argument("--floor-number", type=int, default=DEFAULT_TOWER_FLOOR, help="First floor to generate.")
+    parser.add_argument("--count", type=int, default=1, help="Number of consecutive floors to generate.")
+    parser.add_argument("--output-dir", help="Write Tower<seed>_<floor>.json files here (default: only validate).")
+    parser.add_argument("--schema-version", choices=SCHEMA_VERSIONS, default=SCHEMA_V1)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    started = time.perf_counter()
+    try:
+        for floor_number in range(args.floor_number, args.floor_number + args.count):
+            model = build_procedural_model(ProceduralFloorSpec(args.seed, floor_number))
+            if output_dir is not None:
+                output = output_dir / f"Tower{args.seed}_{floor_label(floor_number)}.json"
+                write_json(model, output, args.schema_version)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Generated {args.count} tower floors for seed {args.seed} in {elapsed:.3f}s "
+        f"({args.count / elapsed if elapsed else float('inf'):.0f} floors/s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
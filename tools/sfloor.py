@@ -0,0 +1,284 @@
+"""Versioned binary ``.sfloor`` floor format with an ``mmap``-backed reader.
+
+Tools that only ask "is (x, y) a wall" open the file with :class:`SFloor` and
+index straight into the mapped tile planes; nothing else is decoded until it
+is asked for. All integers are little-endian::
+
+    header      magic b"SFLR", u16 version, u16 reserved, u32 width, u32 height,
+                u32 layer_count, u32 entity_count, u32 metadata_length
+    metadata    UTF-8 JSON: schema_version, floor_metadata and the entity kinds
+                with their counts, in table order
+    directory   per layer: u16 name_length, name, u8 plane_bits (1 or 8),
+                u16 palette_length, palette JSON ([[tile, alt], ...]),
+                u64 plane_offset, u64 plane_length
+    entities    per entity: u32 length, UTF-8 JSON object
+    planes      one row-major plane per layer
+
+A layer holding a single ``(tile, alt)`` pair is a bit plane, least
+significant bit first. Any other layer is a byte plane that stores
+``palette index + 1`` per cell, with 0 for an empty cell.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+try:
+    from tools.floor_flow_fields import model_dimensions
+    from tools.floor_json import SCHEMA_V1, CellLayer, iter_tile_layer, replace_atomically
+    from tools.floor_reachability import pack_flags
+    from tools.maze_grid import WallGrid
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_flow_fields import model_dimensions
+    from floor_json import SCHEMA_V1, CellLayer, iter_tile_layer, replace_atomically
+    from floor_reachability import pack_flags
+    from maze_grid import WallGrid
+
+SFLOOR_MAGIC = b"SFLR"
+SFLOOR_VERSION = 1
+SFLOOR_SUFFIX = ".sfloor"
+BIT_PLANE = 1
+BYTE_PLANE = 8
+
+_HEADER = struct.Struct("<4sHHIIIII")
+_LAYER_TAIL = struct.Struct("<QQ")
+_LENGTH = struct.Struct("<I")
+
+
+def sfloor_path(json_path: Path) -> Path:
+    """``Floor1F.json`` -> ``Floor1F.sfloor``."""
+    return json_path.with_suffix(SFLOOR_SUFFIX)
+
+
+def _pack_bits(flags: bytes | bytearray) -> bytes:
+    return pack_flags(flags).to_bytes((len(flags) + 7) // 8, "little")
+
+
+def _encode_layer(name: str, layer: object, width: int, height: int) -> tuple[int, list[list], bytes]:
+    """``(plane_bits, palette, plane)`` for one tile layer."""
+    if isinstance(layer, CellLayer) and isinstance(layer.cells, WallGrid):
+        grid = layer.cells
+        if (grid.width, grid.height) == (width, height):
+            return BIT_PLANE, [[layer.tile, 0]], _pack_bits(grid.cells)
+
+    palette: dict[tuple[str, int], int] = {}
+    plane = bytearray(width * height)
+    for tile in iter_tile_layer(layer):
+        x, y = tile["x"], tile["y"]
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"{name} tile at {(x, y)} is outside the {width}x{height} floor")
+        code = palette.setdefault((tile["tile"], tile.get("alt", 0)), len(palette) + 1)
+        if code > 255:
+            raise ValueError(f"{name} layer uses more than 255 distinct tiles")
+        index = y * width + x
+        if plane[index] not in (0, code):
+            raise ValueError(f"{name} layer holds two tiles at {(x, y)}")
+        plane[index] = code
+    entries = [[tile, alt] for tile, alt in palette]
+    if len(entries) <= 1:
+        return BIT_PLANE, entries, _pack_bits(plane)
+    return BYTE_PLANE, entries, bytes(plane)
+
+
+def encode_sfloor(model: Mapping, width: int | None = None, height: int | None = None) -> bytes:
+    if width is None or height is None:
+        width, height = model_dimensions(model)
+    entity_kinds = [[kind, len(entities)] for kind, entities in model["entities"].items()]
+    metadata = json.dumps(
+        {
+            "schema_version": model.get("schema_version", SCHEMA_V1),
+            "floor_metadata": model["floor_metadata"],
+            "entity_kinds": entity_kinds,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    entity_table = bytearray()
+    for entities in model["entities"].values():
+        for entity in entities:
+            record = json.dumps(entity, separators=(",", ":")).encode("utf-8")
+            entity_table += _LENGTH.pack(len(record)) + record
+
+    layers = [(name, *_encode_layer(name, layer, width, height)) for name, layer in model["tile_layers"].items()]
+    directory_size = sum(
+        2 + len(name.encode("utf-8")) + 1 + 2 + len(json.dumps(palette).encode("utf-8")) + _LAYER_TAIL.size
+        for name, _, palette, _ in layers
+    )
+    offset = _HEADER.size + len(metadata) + directory_size + len(entity_table)
+
+    parts = [
+        _HEADER.pack(
+            SFLOOR_MAGIC,
+            SFLOOR_VERSION,
+            0,
+            width,
+            height,
+            len(layers),
+            sum(count for _, count in entity_kinds),
+            len(metadata),
+        ),
+        metadata,
+    ]
+    for name, plane_bits, palette, plane in layers:
+        encoded_name = name.encode("utf-8")
+        encoded_palette = json.dumps(palette).encode("utf-8")
+        parts.append(struct.pack("<H", len(encoded_name)) + encoded_name)
+        parts.append(struct.pack("<BH", plane_bits, len(encoded_palette)) + encoded_palette)
+        parts.append(_LAYER_TAIL.pack(offset, len(plane)))
+        offset += len(plane)
+    parts.append(bytes(entity_table))
+    parts.extend(plane for _, _, _, plane in layers)
+    return b"".join(parts)
+
+
+def write_sfloor(model: Mapping, output_path: Path, width: int | None = None, height: int | None = None) -> None:
+    payload = encode_sfloor(model, width, height)
+    with replace_atomically(output_path, "wb") as temp_file:
+        temp_file.write(payload)
+
+
+class SFloorLayer:
+    """One mapped tile plane; cell queries read a single byte of it."""
+
+    def __init__(self, name: str, plane_bits: int, palette: list[list], plane: memoryview, width: int, height: int):
+        self.name = name
+        self.plane_bits = plane_bits
+        self.palette = [(tile, alt) for tile, alt in palette]
+        self.plane = plane
+        self.width = width
+        self.height = height
+
+    def _code(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        index = y * self.width + x
+        if self.plane_bits == BIT_PLANE:
+            return self.plane[index >> 3] >> (index & 7) & 1
+        return self.plane[index]
+
+    def __contains__(self, cell: object) -> bool:
+        x, y = cell  # type: ignore[misc]
+        return self._code(x, y) != 0
+
+    def tile_at(self, cell: tuple[int, int]) -> tuple[str, int] | None:
+        """``(tile, alt)`` at ``cell``, or ``None`` when the layer is empty there."""
+        code = self._code(*cell)
+        return self.palette[code - 1] if code else None
+
+    def tiles(self) -> Iterator[dict]:
+        """Every tile as a ``{"x", "y", "tile"[, "alt"]}`` dict, row-major."""
+        width = self.width
+        for y in range(self.height):
+            for x in range(width):
+                code = self._code(x, y)
+                if code:
+                    tile, alt = self.palette[code - 1]
+                    yield {"x": x, "y": y, "tile": tile, "alt": alt} if alt else {"x": x, "y": y, "tile": tile}
+
+
+class SFloor:
+    """Read-only view of a ``.sfloor`` file backed by ``mmap``.
+
+    Opening parses only the header, metadata and layer directory. Use it as a
+    context manager, or call :meth:`close`, to release the mapping.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        try:
+            self._parse()
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f"{self.path} is too short to be a .sfloor file")
+        magic, version, _, width, height, layer_count, entity_count, metadata_length = _HEADER.unpack_from(
+            self._view, 0
+        )
+        if magic != SFLOOR_MAGIC:
+            raise ValueError(f"{self.path} is not a .sfloor file")
+        if version != SFLOOR_VERSION:
+            raise ValueError(f"Unsupported .sfloor version {version} in {self.path}")
+        self.width = width
+        self.height = height
+        self.entity_count = entity_count
+        offset = _HEADER.size
+        metadata = json.loads(bytes(self._view[offset:offset + metadata_length]).decode("utf-8"))
+        offset += metadata_length
+        self.schema_version = metadata["schema_version"]
+        self.floor_metadata = metadata["floor_metadata"]
+        self.entity_kinds = [(kind, count) for kind, count in metadata["entity_kinds"]]
+
+        self.layers: dict[str, SFloorLayer] = {}
+        for _ in range(layer_count):
+            (name_length,) = struct.unpack_from("<H", self._view, offset)
+            offset += 2
+            name = bytes(self._view[offset:offset + name_length]).decode("utf-8")
+            offset += name_length
+            plane_bits, palette_length = struct.unpack_from("<BH", self._view, offset)
+            offset += 3
+            palette = json.loads(bytes(self._view[offset:offset + palette_length]).decode("utf-8"))
+            offset += palette_length
+            plane_offset, plane_length = _LAYER_TAIL.unpack_from(self._view, offset)
+            offset += _LAYER_TAIL.size
+            plane = self._view[plane_offset:plane_offset + plane_length]
+            self.layers[name] = SFloorLayer(name, plane_bits, palette, plane, width, height)
+        self._entities_offset = offset
+
+    def close(self) -> None:
+        for layer in getattr(self, "layers", {}).values():
+            layer.plane.release()
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> SFloor:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def is_wall(self, cell: tuple[int, int]) -> bool:
+        """Walls, plus every cell outside the floor."""
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return cell in self.layers["wall"]
+
+    def _records(self) -> Iterator[tuple[str, int, int]]:
+        """``(kind, offset, length)`` of every entity record, read from the length prefixes alone."""
+        offset = self._entities_offset
+        for kind, count in self.entity_kinds:
+            for _ in range(count):
+                (length,) = _LENGTH.unpack_from(self._view, offset)
+                offset += _LENGTH.size
+                yield kind, offset, length
+                offset += length
+
+    def _decode(self, offset: int, length: int) -> dict:
+        return json.loads(bytes(self._view[offset:offset + length]).decode("utf-8"))
+
+    def entities(self, kind: str | None = None) -> Iterator[dict]:
+        """Decode entities of ``kind`` (or all of them) in table order; other records are skipped unread."""
+        for entity_kind, offset, length in self._records():
+            if kind is None or kind == entity_kind:
+                yield self._decode(offset, length)
+
+    def to_model(self) -> dict:
+        """The floor as a schema 1.0 model with row-major tile layers."""
+        entities: dict[str, list[dict]] = {kind: [] for kind, _ in self.entity_kinds}
+        for kind, offset, length in self._records():
+            entities[kind].append(self._decode(offset, length))
+        return {
+            "schema_version": SCHEMA_V1,
+            "floor_metadata": self.floor_metadata,
+            "tile_layers": {name: list(layer.tiles()) for name, layer in self.layers.items()},
+            "entities": entities,
+        }
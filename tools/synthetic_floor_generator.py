@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Generate large synthetic floors for stress-testing validation, export and import.
+
+Usage:
+    python3 tools/synthetic_floor_generator.py --size 1024 --output /tmp/FloorSynthetic1024.json
+    python3 tools/synthetic_floor_generator.py --size 4096 --seed 7 --schema-version 2.0 --output big.json
+
+Floors are a jittered lattice of rooms joined by a random spanning tree of
+corridors plus a few extra loops, carved with the same ``MazeBuilder`` as the
+authored floors and checked with the Floor 1-3 ``validate_model``. Room size,
+corridor width and entity counts scale with the grid edge.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor1_maze_generator import treasure_box_entities, validate_model, vector, write_json
+    from tools.floor_json import SCHEMA_V1, SCHEMA_VERSIONS, CellLayer
+    from tools.maze_grid import MazeBuilder, WallGrid
+except ModuleNotFoundError:  # Direct ``python tools/synthetic_floor_generator.py`` invocation.
+    from floor1_maze_generator import treasure_box_entities, validate_model, vector, write_json
+    from floor_json import SCHEMA_V1, SCHEMA_VERSIONS, CellLayer
+    from maze_grid import MazeBuilder, WallGrid
+
+MIN_SYNTHETIC_SIZE = 64
+MAX_SYNTHETIC_SIZE = 4096
+DEFAULT_SYNTHETIC_SIZE = 1024
+
+SYNTHETIC_ENEMY_TYPES = ("goblin", "orc", "skeleton_warrior", "forest_spirit")
+SYNTHETIC_TREASURE_ITEMS = ("health_potion", "mana_potion", "swiftness_draught")
+
+
+@dataclass(frozen=True)
+class SyntheticFloorSpec:
+    size: int
+    seed: int = 0
+    # Edge of the lattice square that holds one room.
+    lattice_cell: int = 16
+    corridor_half_width: int = 0
+    # Chance that a lattice edge left out of the spanning tree is carved anyway.
+    loop_chance: float = 0.15
+    enemies_per_room: float = 0.5
+    treasure_per_room: float = 0.2
+    npc_count: int = 1
+
+    @classmethod
+    def for_size(cls, size: int, seed: int = 0) -> SyntheticFloorSpec:
+        """Scale room spacing, corridor width and NPC count with the grid edge.
+
+        Every doubling past 256 widens the lattice by four cells; corridors are
+        one cell wide below 512, three below 2048 and five beyond.
+        """
+        if not MIN_SYNTHETIC_SIZE <= size <= MAX_SYNTHETIC_SIZE:
+            raise ValueError(f"Synthetic floor size must be {MIN_SYNTHETIC_SIZE}-{MAX_SYNTHETIC_SIZE}, got {size}")
+        doublings = max(0, round(math.log2(size / 256)))
+        return cls(
+            size=size,
+            seed=seed,
+            lattice_cell=16 + 4 * doublings,
+            corridor_half_width=0 if size < 512 else 1 if size < 2048 else 2,
+            npc_count=max(1, size // 512),
+        )
+
+
+@dataclass(frozen=True)
+class SyntheticLayout:
+    walls: WallGrid
+    # rooms[row][column] = (left, top, right, bottom), inclusive.
+    rooms: list[list[tuple[int, int, int, int]]]
+
+
+def room_centre(room: tuple[int, int, int, int]) -> tuple[int, int]:
+    left, top, right, bottom = room
+    return (left + right) // 2, (top + bottom) // 2
+
+
+def place_rooms(
+    size: int,
+    cell: int,
+    rng: random.Random,
+    margin: int = 1,
+) -> list[list[tuple[int, int, int, int]]]:
+    """One room per ``cell``-sized lattice square, keeping ``margin`` wall cells from its edges."""
+    count = (size - 2) // cell
+    offset = 1 + (size - 2 - count * cell) // 2
+    smallest = max(4, cell // 3)
+    largest = cell - 2 * margin
+    rooms = []
+    for row in range(count):
+        rooms.append([])
+        for column in range(count):
+            width = rng.randint(smallest, largest)
+            height = rng.randint(smallest, largest)
+            left = offset + column * cell + margin + rng.randrange(cell - 2 * margin + 1 - width)
+            top = offset + row * cell + margin + rng.randrange(cell - 2 * margin + 1 - height)
+            rooms[row].append((left, top, left + width - 1, top + height - 1))
+    return rooms
+
+
+def lattice_edges(count: int, rng: random.Random, loop_chance: float) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """A random spanning tree over the room lattice plus occasional extra loops."""
+    visited = {(0, 0)}
+    stack = [(0, 0)]
+    tree = set()
+    while stack:
+        row, column = stack[-1]
+        neighbours = [
+            (row + dy, column + dx)
+            for dy, dx in ((0, 1), (1, 0), (0, -1), (-1, 0))
+            if 0 <= row + dy < count and 0 <= column + dx < count and (row + dy, column + dx) not in visited
+        ]
+        if not neighbours:
+            stack.pop()
+            continue
+        following = rng.choice(neighbours)
+        visited.add(following)
+        tree.add(tuple(sorted(((row, column), following))))
+        stack.append(following)
+
+    edges = sorted(tree)
+    for row in range(count):
+        for column in range(count):
+            for following in ((row, column + 1), (row + 1, column)):
+                edge = ((row, column), following)
+                if following[0] < count and following[1] < count and edge not in tree and rng.random() < loop_chance:
+                    edges.append(edge)
+    return edges
+
+
+def _build_layout(spec: SyntheticFloorSpec, rng: random.Random) -> SyntheticLayout:
+    rooms = place_rooms(spec.size, spec.lattice_cell, rng)
+    builder = MazeBuilder(spec.size, spec.size)
+    for row in rooms:
+        for room in row:
+            builder.carve_rect(*room)
+    for (row_a, column_a), (row_b, column_b) in lattice_edges(len(rooms), rng, spec.loop_chance):
+        builder.carve_path(
+            room_centre(rooms[row_a][column_a]),
+            room_centre(rooms[row_b][column_b]),
+            spec.corridor_half_width,
+        )
+    return SyntheticLayout(builder.walls, rooms)
+
+
+def build_synthetic_layout(spec: SyntheticFloorSpec) -> SyntheticLayout:
+    return _build_layout(spec, random.Random(spec.seed))
+
+
+def build_synthetic_model(spec: SyntheticFloorSpec) -> dict:
+    """Carve, populate and validate one synthetic floor.
+
+    Ground and wall layers are :class:`CellLayer` values, so no per-cell tile
+    dicts are built even at 4096x4096.
+    """
+    rng = random.Random(spec.seed)
+    layout = _build_layout(spec, rng)
+    rooms = [room for row in layout.rooms for room in row]
+    start = room_centre(rooms[0])
+    up_stair = room_centre(rooms[-1])
+
+    enemies = []
+    boxes: dict[str, tuple[tuple[int, int], int, dict[str, int]]] = {}
+    npcs = []
+    npc_rooms = set(rng.sample(range(1, len(rooms) - 1), min(spec.npc_count, max(len(rooms) - 2, 0))))
+    for index, room in enumerate(rooms):
+        left, top, right, bottom = room
+        # Room centres stay free: corridors, the start and the stairs land there.
+        centre = room_centre(room)
+        cells = [(x, y) for y in range(top, bottom + 1) for x in range(left, right + 1) if (x, y) != centre]
+        wanted = []
+        if rng.random() < spec.enemies_per_room:
+            wanted.append("enemy")
+        if rng.random() < spec.treasure_per_room:
+            wanted.append("treasure")
+        if index in npc_rooms:
+            wanted.append("npc")
+        for kind, position in zip(wanted, rng.sample(cells, len(wanted))):
+            if kind == "enemy":
+                enemies.append(
+                    {
+                        "id": f"EnemySpawn_Synthetic_{len(enemies) + 1:05d}",
+                        "position": vector(*position),
+                        "enemy_type": rng.choice(SYNTHETIC_ENEMY_TYPES),
+                    }
+                )
+            elif kind == "treasure":
+                boxes[f"TreasureBox_Synthetic_{len(boxes) + 1:05d}"] = (
+                    position,
+                    rng.randrange(20, 121, 5),
+                    {rng.choice(SYNTHETIC_TREASURE_ITEMS): 1},
+                )
+            else:
+                npcs.append(
+                    {
+                        "id": f"NpcSpawn_Synthetic_{len(npcs) + 1:03d}",
+                        "position": vector(*position),
+                        "npc_id": "synthetic_villager",
+                    }
+                )
+
+    model = {
+        "schema_version": "1.0",
+        "floor_metadata": {
+            "floor_name": f"Synthetic {spec.size}x{spec.size}",
+            "floor_number": 0,
+            "description": f"Synthetic stress-test floor (seed {spec.seed}, {len(rooms)} rooms).",
+            "player_start": vector(*start),
+        },
+        "tile_layers": {
+            # A filled grid iterates every cell in row-major order.
+            "ground": CellLayer("starting_area", WallGrid(spec.size, spec.size)),
+            "wall": CellLayer("generic", layout.walls),
+            "stair": [
+                {"x": start[0], "y": start[1], "tile": "down"},
+                {"x": up_stair[0], "y": up_stair[1], "tile": "up"},
+            ],
+        },
+        "entities": {
+            "enemy_spawns": enemies,
+            "npc_spawns": npcs,
+            "stair_connections": [
+                {
+                    "id": "SYN_DOWN",
+                    "position": vector(*start),
+                    "direction": "down",
+                    "target_floor": 0,
+                    "destination_stair_id": "GF_000",
+                },
+                {
+                    "id": "SYN_UP",
+                    "position": vector(*up_stair),
+                    "direction": "up",
+                    "target_floor": 1,
+                    "destination_stair_id": "1F_001",
+                },
+            ],
+            "treasure_boxes": treasure_box_entities(boxes),
+        },
+    }
+    validate_model(model, spec.size, spec.size)
+    return model
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic large floor JSON for stress testing.")
+    parser.add_argument("--size", type=int, default=DEFAULT_SYNTHETIC_SIZE, help="Grid edge length (64-4096).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help="Path for generated floor JSON.")
+    parser.add_argument("--schema-version", choices=SCHEMA_VERSIONS, default=SCHEMA_V1)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        spec = SyntheticFloorSpec.for_size(args.size, args.seed)
+        model = build_synthetic_model(spec)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+    write_json(model, Path(args.output), args.schema_version)
+    entities = model["entities"]
+    print(
+        f"Generated synthetic floor: {spec.size}x{spec.size}, "
+        f"{len(model['tile_layers']['wall'].cells)} walls, "
+        f"{len(entities['enemy_spawns'])} enemies, "
+        f"{len(entities['treasure_boxes'])} treasure boxes, "
+        f"{len(entities['npc_spawns'])} NPCs"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
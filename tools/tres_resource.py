@@ -0,0 +1,416 @@
+"""Read and edit Godot text resources (``.tres``) without disturbing their formatting.
+
+:func:`parse_tres` tokenizes the file once and records, for every property,
+its typed value and the span of its value text. Values map to Python as::
+
+    Vector2i(8, 50)                     Vector2i(x=8, y=50)
+    Array[Vector2i]([Vector2i(1, 2)])   TypedArray("Vector2i", [Vector2i(x=1, y=2)])
+    ExtResource("1_1"), Color(...)      Constructor("ExtResource", ("1_1",))
+    [1, "a"], {"k": 2}                  list, dict
+    "text", 3, 0.5, true, null          str, int, float, bool, None
+
+:meth:`TresDocument.set` only records an edit when the new value differs from
+the parsed one, and :meth:`TresDocument.dumps` splices the edited values into
+the original text, so every untouched byte (ordering, blank lines, ``\\r\\n``)
+is written back as it was read. :func:`update_tres_files` applies a batch of
+property updates to several files and only rewrites the files that changed.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    from tools.floor_json import replace_atomically
+except ModuleNotFoundError:  # Direct script invocation from tools/.
+    from floor_json import replace_atomically
+
+MAIN_SECTION = "resource"
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>[ \t\r]+)
+    | (?P<newline>\n)
+    | (?P<comment>;[^\n]*)
+    | (?P<string>&?"(?:[^"\\]|\\.)*")
+    | (?P<name>[A-Za-z_][\w/:.@]*|\d[\w.]*[/:][\w/:.@]*)
+    | (?P<number>-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)
+    | (?P<punct>[\[\](){},=:])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_KEYWORDS = {"true": True, "false": False, "null": None, "inf": float("inf"), "nan": float("nan")}
+_STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+
+class TresError(ValueError):
+    """The resource text could not be parsed, or an edit does not fit it."""
+
+
+class Vector2i(NamedTuple):
+    x: int
+    y: int
+
+
+@dataclass(frozen=True)
+class Constructor:
+    """Any other ``Name(args)`` value, such as ``ExtResource("1_1")`` or ``Color(1, 0, 0, 1)``."""
+
+    name: str
+    args: tuple = ()
+
+
+class TypedArray(list):
+    """``Array[T]([...])``: a list that remembers its element type for writing back."""
+
+    def __init__(self, element_type: str, items=()):
+        super().__init__(items)
+        self.element_type = element_type
+
+    def __repr__(self) -> str:
+        return f"TypedArray({self.element_type!r}, {list(self)!r})"
+
+
+@dataclass
+class TresProperty:
+    name: str
+    value: object
+    # Span of the value text in the source, so it can be replaced in place.
+    start: int
+    end: int
+
+
+@dataclass
+class TresSection:
+    """One ``[kind attr=value ...]`` header and the properties that follow it."""
+
+    kind: str
+    attributes: dict[str, object]
+    properties: dict[str, TresProperty] = field(default_factory=dict)
+    # Where a new property is inserted: after the last property, or after the header.
+    end: int = 0
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.properties
+
+
+@dataclass
+class _Token:
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+def _tokenize(text: str) -> list[_Token]:
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            line = text.count("\n", 0, position) + 1
+            raise TresError(f"unexpected character {text[position]!r} on line {line}")
+        if match.lastgroup not in ("space", "comment"):
+            tokens.append(_Token(match.lastgroup, match.group(), position, match.end()))
+        position = match.end()
+    return tokens
+
+
+def _unquote(text: str) -> str:
+    body = text[text.index('"') + 1:-1]
+    return re.sub(r"\\(.)", lambda match: _STRING_ESCAPES.get(match.group(1), match.group(1)), body, flags=re.DOTALL)
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+
+    def _peek(self) -> _Token | None:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _next(self) -> _Token:
+        token = self._peek()
+        if token is None:
+            raise TresError("unexpected end of file")
+        self.index += 1
+        return token
+
+    def _expect(self, text: str) -> _Token:
+        token = self._next()
+        if token.text != text:
+            raise TresError(f"expected {text!r} but found {token.text!r} on line {self._line(token)}")
+        return token
+
+    def _line(self, token: _Token) -> int:
+        return self.text.count("\n", 0, token.start) + 1
+
+    def _skip_newlines(self) -> None:
+        while (token := self._peek()) is not None and token.kind == "newline":
+            self.index += 1
+
+    def _items(self, close: str) -> list:
+        items = []
+        self._skip_newlines()
+        while self._peek() is not None and self._peek().text != close:
+            items.append(self.value())
+            self._skip_newlines()
+            if self._peek() is not None and self._peek().text == ",":
+                self.index += 1
+                self._skip_newlines()
+        self._expect(close)
+        return items
+
+    def value(self) -> object:
+        self._skip_newlines()
+        token = self._next()
+        if token.kind == "string":
+            return _unquote(token.text)
+        if token.kind == "number":
+            return float(token.text) if any(mark in token.text for mark in ".eE") else int(token.text)
+        if token.text == "[":
+            return self._items("]")
+        if token.text == "{":
+            entries = {}
+            self._skip_newlines()
+            while self._peek() is not None and self._peek().text != "}":
+                key = self.value()
+                self._expect(":")
+                entries[key] = self.value()
+                self._skip_newlines()
+                if self._peek() is not None and self._peek().text == ",":
+                    self.index += 1
+                    self._skip_newlines()
+            self._expect("}")
+            return entries
+        if token.kind != "name":
+            raise TresError(f"unexpected {token.text!r} on line {self._line(token)}")
+        if token.text in _KEYWORDS:
+            return _KEYWORDS[token.text]
+        if token.text == "Array" and self._peek() is not None and self._peek().text == "[":
+            self._expect("[")
+            # Script-typed arrays name their type as ExtResource("..."); keep the text as written.
+            type_start = self._next()
+            depth = 0
+            while depth or self._peek() is not None and self._peek().text != "]":
+                depth += {"(": 1, ")": -1}.get(self._next().text, 0)
+            element_type = self.text[type_start.start:self.tokens[self.index - 1].end]
+            self._expect("]")
+            self._expect("(")
+            items = self.value()
+            self._skip_newlines()
+            self._expect(")")
+            if not isinstance(items, list):
+                raise TresError(f"Array[{element_type}] must wrap a list on line {self._line(token)}")
+            return TypedArray(element_type, items)
+        self._expect("(")
+        args = tuple(self._items(")"))
+        if token.text == "Vector2i" and len(args) == 2:
+            return Vector2i(*args)
+        return Constructor(token.text, args)
+
+    def header(self) -> TresSection:
+        self._expect("[")
+        kind = self._next().text
+        attributes = {}
+        while self._peek() is not None and self._peek().text != "]":
+            key = self._next().text
+            self._expect("=")
+            attributes[key] = self.value()
+        self._expect("]")
+        return TresSection(kind, attributes, end=self.tokens[self.index - 1].end)
+
+    def document(self) -> list[TresSection]:
+        sections: list[TresSection] = []
+        while True:
+            self._skip_newlines()
+            token = self._peek()
+            if token is None:
+                return sections
+            if token.text == "[":
+                sections.append(self.header())
+                continue
+            if token.kind != "name":
+                raise TresError(f"expected a property name but found {token.text!r} on line {self._line(token)}")
+            if not sections:
+                raise TresError(f"property {token.text!r} on line {self._line(token)} comes before any section")
+            self.index += 1
+            self._expect("=")
+            self._skip_newlines()
+            start = self._peek().start if self._peek() is not None else len(self.text)
+            value = self.value()
+            end = self.tokens[self.index - 1].end
+            section = sections[-1]
+            if token.text in section.properties:
+                raise TresError(f"property {token.text!r} is set twice in [{section.kind}]")
+            section.properties[token.text] = TresProperty(token.text, value, start, end)
+            section.end = end
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def format_value(value: object) -> str:
+    """Godot's text form of ``value``."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, Vector2i):
+        return f"Vector2i({value.x}, {value.y})"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return _quote(value)
+    if isinstance(value, Constructor):
+        return f"{value.name}({', '.join(format_value(arg) for arg in value.args)})"
+    if isinstance(value, (list, tuple)):
+        items = f"[{', '.join(format_value(item) for item in value)}]"
+        return f"Array[{value.element_type}]({items})" if isinstance(value, TypedArray) else items
+    if isinstance(value, Mapping):
+        if not value:
+            return "{}"
+        entries = ",\n".join(f"{format_value(key)}: {format_value(item)}" for key, item in value.items())
+        return "{\n" + entries + "\n}"
+    raise TresError(f"cannot write {type(value).__name__} value {value!r}")
+
+
+class TresDocument:
+    """A parsed ``.tres`` file plus the property edits not yet written back."""
+
+    def __init__(self, text: str, path: Path | None = None):
+        self.text = text
+        self.path = path
+        try:
+            self.sections = _Parser(text).document()
+        except TresError as error:
+            raise TresError(f"{path or '<text>'}: {error}") from None
+        # Replacement text for edited property values, keyed by their span.
+        self._edits: dict[tuple[int, int], str] = {}
+        # Properties added to a section, written after its last existing property.
+        self._additions: dict[int, dict[str, object]] = {}
+
+    def section(self, kind: str = MAIN_SECTION) -> TresSection:
+        for section in self.sections:
+            if section.kind == kind:
+                return section
+        raise TresError(f"{self.path or '<text>'} has no [{kind}] section")
+
+    def get(self, name: str, default: object = None, section: str = MAIN_SECTION) -> object:
+        target = self.section(section)
+        added = self._additions.get(target.end, {})
+        if name in added:
+            return added[name]
+        prop = target.properties.get(name)
+        return default if prop is None else prop.value
+
+    def set(self, name: str, value: object, section: str = MAIN_SECTION) -> bool:
+        """Set property ``name``, appending it to the section when it is missing.
+
+        A plain list written over an ``Array[T]`` keeps the ``T``. Returns
+        whether anything changed.
+        """
+        target = self.section(section)
+        prop = target.properties.get(name)
+        if prop is None:
+            added = self._additions.setdefault(target.end, {})
+            changed = name not in added or added[name] != value
+            added[name] = value
+            return changed
+        if isinstance(prop.value, TypedArray) and not isinstance(value, TypedArray) and isinstance(value, list):
+            value = TypedArray(prop.value.element_type, value)
+        if prop.value == value and _element_type(prop.value) == _element_type(value):
+            return False
+        self._edits[(prop.start, prop.end)] = format_value(value)
+        prop.value = value
+        return True
+
+    def update(self, values: Mapping[str, object], section: str = MAIN_SECTION) -> bool:
+        changed = False
+        for name, value in values.items():
+            changed = self.set(name, value, section) or changed
+        return changed
+
+    @property
+    def changed(self) -> bool:
+        return bool(self._edits or self._additions)
+
+    def dumps(self) -> str:
+        edits = dict(self._edits)
+        for end, added in self._additions.items():
+            edits[(end, end)] = "".join(f"\n{name} = {format_value(value)}" for name, value in added.items())
+        parts = []
+        position = 0
+        for (start, end), text in sorted(edits.items()):
+            parts.append(self.text[position:start])
+            parts.append(text)
+            position = end
+        parts.append(self.text[position:])
+        return "".join(parts)
+
+    def save(self, path: Path | None = None) -> bool:
+        """Write the edited text to ``path`` (default: where it was read from) unless nothing changed."""
+        path = Path(path or self.path)
+        if not self.changed and path == self.path:
+            return False
+        with replace_atomically(path, "wb") as temp_file:
+            temp_file.write(self.dumps().encode("utf-8"))
+        return True
+
+
+def _element_type(value: object) -> str | None:
+    if isinstance(value, TypedArray):
+        return value.element_type
+    return None
+
+
+def parse_tres(text: str) -> TresDocument:
+    return TresDocument(text)
+
+
+def load_tres(path: Path) -> TresDocument:
+    path = Path(path)
+    # Bytes, so \r\n line endings survive the round trip.
+    return TresDocument(path.read_bytes().decode("utf-8"), path)
+
+
+def update_tres_files(
+    updates: Mapping[Path, Mapping[str, object] | Callable[[TresDocument], Mapping[str, object]]],
+    required: tuple[str, ...] = (),
+    omit_empty: bool = False,
+    section: str = MAIN_SECTION,
+) -> list[Path]:
+    """Apply ``{path: {property: value}}`` to each file and rewrite only the files that changed.
+
+    Every file is parsed and checked for the ``required`` properties before
+    any is written, so one bad file leaves the whole batch untouched. With
+    ``omit_empty``, an empty list is not added to a file that lacks the
+    property, matching how Godot leaves default empty arrays out. The
+    values for a file may also be a function of its parsed document, for
+    updates that depend on what the file already holds.
+    Returns the paths that were rewritten.
+    """
+    documents = []
+    for path, values in updates.items():
+        document = load_tres(path)
+        target = document.section(section)
+        missing = [name for name in required if name not in target]
+        if missing:
+            raise TresError(f"{path}: missing required properties: {', '.join(missing)}")
+        if callable(values):
+            values = values(document)
+        if omit_empty:
+            values = {
+                name: value
+                for name, value in values.items()
+                if name in target or not (isinstance(value, list) and not value)
+            }
+        document.update(values, section)
+        documents.append(document)
+    return [document.path for document in documents if document.save()]
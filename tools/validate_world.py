@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Check the stair links between every floor of the tower in one pass.
+
+Usage:
+    python3 tools/validate_world.py
+    python3 tools/validate_world.py --floors-dir scenes/game/floors --defs-dir resources/floors
+
+Each ``Floor*.json`` is paired with the ``Floor*.tres`` of the same floor
+number; generator sidecars such as ``Floor1F.regions.json`` are skipped.
+Every stair must point at a stair that exists on its
+``target_floor`` and points back at it, one going up and the other down.
+Taking a stair lands the player on the destination stair's spawn cell from
+the target floor's ``StairsUpDestinations`` / ``StairsDownDestinations``
+(the stair cell itself when none is set, as ``FloorDefinition`` does at
+runtime). That cell must be walkable and must not be another stair. The
+``StairsUp`` / ``StairsDown`` arrays must list the same cells as the JSON.
+
+Floor files are read with :class:`floor_json.FloorJsonReader`. Only
+``floor_metadata`` and the stair list are decoded. Landing cells are looked
+up directly in the ``ground`` and ``wall`` layer text, so the tile arrays
+are never built. Every problem is reported, not just the first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from tools.floor_json import FloorJsonReader
+    from tools.tres_resource import load_tres
+except ModuleNotFoundError:  # Direct ``python tools/validate_world.py`` invocation.
+    from floor_json import FloorJsonReader
+    from tres_resource import load_tres
+
+DEFAULT_FLOORS_DIR = Path("scenes/game/floors")
+DEFAULT_DEFS_DIR = Path("resources/floors")
+UP = "up"
+DOWN = "down"
+OPPOSITE = {UP: DOWN, DOWN: UP}
+# ``Floor1F.json`` but not its ``Floor1F.regions.json`` / ``Floor1F.paths.json`` ... sidecars.
+FLOOR_JSON_NAME = re.compile(r"Floor\w+\.json")
+STAIR_PROPERTIES = {UP: ("StairsUp", "StairsUpDestinations"), DOWN: ("StairsDown", "StairsDownDestinations")}
+
+
+@dataclass(frozen=True)
+class Stair:
+    id: str
+    floor: int
+    position: tuple[int, int]
+    direction: str
+    target_floor: int
+    destination_id: str
+
+
+def is_walkable(floor: FloorJsonReader, cell: tuple[int, int]) -> bool:
+    return floor.has_tile("ground", cell) and not floor.has_tile("wall", cell)
+
+
+def floor_stairs(floor: FloorJsonReader) -> list[Stair]:
+    number = floor.floor_metadata()["floor_number"]
+    return [
+        Stair(
+            entry["id"],
+            number,
+            (entry["position"]["x"], entry["position"]["y"]),
+            entry.get("direction", ""),
+            entry.get("target_floor", -1),
+            entry.get("destination_stair_id", ""),
+        )
+        for entry in floor.entities("stair_connections")["stair_connections"]
+    ]
+
+
+def _cells(value: object) -> list[tuple[int, int]]:
+    return [(cell.x, cell.y) for cell in value or ()]
+
+
+def validate_world(floor_paths: list[Path], def_paths: list[Path]) -> tuple[list[str], int, int]:
+    """Every stair link problem across ``floor_paths`` and ``def_paths``, plus the floor and stair counts."""
+    errors: list[str] = []
+    floors: dict[int, FloorJsonReader] = {}
+    for path in floor_paths:
+        try:
+            floor = FloorJsonReader(path)
+        except ValueError as error:
+            errors.append(str(error))
+            continue
+        number = floor.floor_metadata()["floor_number"]
+        if number in floors:
+            errors.append(f"{path.name}: floor_number {number} already used by {floors[number].path.name}")
+            continue
+        floors[number] = floor
+
+    definitions = {}
+    for path in def_paths:
+        document = load_tres(path)
+        number = document.get("FloorNumber", 0)
+        if number in definitions:
+            errors.append(f"{path.name}: FloorNumber {number} already used by {definitions[number].path.name}")
+            continue
+        definitions[number] = document
+
+    stairs: dict[str, Stair] = {}
+    by_floor: dict[int, list[Stair]] = {}
+    for number, floor in sorted(floors.items()):
+        by_floor[number] = floor_stairs(floor)
+        for stair in by_floor[number]:
+            if stair.id in stairs:
+                errors.append(
+                    f"Stair {stair.id} on floor {number} duplicates the one on floor {stairs[stair.id].floor}"
+                )
+                continue
+            stairs[stair.id] = stair
+            if stair.direction not in OPPOSITE:
+                errors.append(f"Stair {stair.id} has direction {stair.direction!r}, expected 'up' or 'down'")
+
+    # Landing cell of each stair: where a player arriving through it spawns.
+    landings: dict[str, tuple[int, int]] = {}
+    for number, floor_list in sorted(by_floor.items()):
+        document = definitions.get(number)
+        if document is None:
+            errors.append(f"Floor {number} ({floors[number].path.name}) has no FloorDefinition .tres")
+            continue
+        for direction, (stairs_name, destinations_name) in STAIR_PROPERTIES.items():
+            listed = _cells(document.get(stairs_name))
+            destinations = _cells(document.get(destinations_name))
+            expected = [stair.position for stair in floor_list if stair.direction == direction]
+            if sorted(listed) != sorted(expected):
+                errors.append(
+                    f"{document.path.name}: {stairs_name} {listed} does not match the {direction} stairs {expected}"
+                )
+            for stair in floor_list:
+                if stair.direction != direction:
+                    continue
+                index = listed.index(stair.position) if stair.position in listed else -1
+                landings[stair.id] = destinations[index] if 0 <= index < len(destinations) else stair.position
+
+    for stair in stairs.values():
+        target = floors.get(stair.target_floor)
+        if target is None:
+            errors.append(f"Stair {stair.id} targets missing floor {stair.target_floor}")
+            continue
+        if stair.direction == UP and stair.target_floor <= stair.floor:
+            errors.append(f"Stair {stair.id} goes up from floor {stair.floor} to floor {stair.target_floor}")
+        if stair.direction == DOWN and stair.target_floor >= stair.floor:
+            errors.append(f"Stair {stair.id} goes down from floor {stair.floor} to floor {stair.target_floor}")
+        destination = stairs.get(stair.destination_id)
+        if destination is None or destination.floor != stair.target_floor:
+            errors.append(
+                f"Stair {stair.id} points to {stair.destination_id!r}, not a stair on floor {stair.target_floor}"
+            )
+            continue
+        if destination.destination_id != stair.id or destination.target_floor != stair.floor:
+            errors.append(
+                f"Stair {stair.id} -> {destination.id} is one-way: {destination.id} points to "
+                f"{destination.destination_id!r} on floor {destination.target_floor}"
+            )
+        if destination.direction != OPPOSITE.get(stair.direction):
+            errors.append(f"Stairs {stair.id} and {destination.id} both go {stair.direction}")
+        landing = landings.get(destination.id)
+        if landing is None:
+            continue
+        if not is_walkable(target, landing):
+            errors.append(f"Stair {stair.id} lands on {landing} on floor {stair.target_floor}, which is not walkable")
+        elif landing in {other.position for other in by_floor[stair.target_floor]}:
+            errors.append(f"Stair {stair.id} lands on the stair at {landing} on floor {stair.target_floor}")
+    return errors, len(floors), len(stairs)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check the stair links between every floor JSON and FloorDefinition.")
+    parser.add_argument("--floors-dir", default=str(DEFAULT_FLOORS_DIR), help="Directory holding Floor*.json.")
+    parser.add_argument("--defs-dir", default=str(DEFAULT_DEFS_DIR), help="Directory holding Floor*.tres.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    floor_paths = sorted(
+        path for path in Path(args.floors_dir).glob("Floor*.json") if FLOOR_JSON_NAME.fullmatch(path.name)
+    )
+    def_paths = sorted(Path(args.defs_dir).glob("Floor*.tres"))
+    if not floor_paths:
+        print(f"Error: no Floor*.json in {args.floors_dir}")
+        return 1
+    errors, floor_count, stair_count = validate_world(floor_paths, def_paths)
+    for error in errors:
+        print(f"Error: {error}")
+    if errors:
+        print(f"{len(errors)} stair link error(s) across {floor_count} floors")
+        return 1
+    print(f"World OK: {floor_count} floors, {stair_count} stairs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())